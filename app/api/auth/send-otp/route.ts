@@ -1,8 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createClient } from '@supabase/supabase-js';
 import nodemailer from 'nodemailer';
-import bcrypt from 'bcryptjs';
-import { generateOTP, getOTPExpiry } from '@/lib/auth-utils';
+import { generateOTP, getOTPExpiry, hashOTP } from '@/lib/auth-utils';
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
 const serviceRole = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
@@ -46,8 +45,8 @@ export async function POST(request: NextRequest) {
     const otp = generateOTP();
     const expiresAt = getOTPExpiry();
 
-    // Hash OTP before storing
-    const otpHash = await bcrypt.hash(otp, 10);
+    // Store a keyed digest of the OTP, never the code itself
+    const otpHash = hashOTP(email, otp);
 
     // Store OTP in Supabase
     const { error: dbError } = await supabase
@@ -1,7 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { createClient } from '@supabase/supabase-js';
-import bcrypt from 'bcryptjs';
-import { generateToken } from '@/lib/auth-utils';
+import { generateToken, verifyOTPHash } from '@/lib/auth-utils';
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL || '';
 const serviceRole = process.env.SUPABASE_SERVICE_ROLE_KEY || '';
@@ -60,7 +59,7 @@ export async function POST(request: NextRequest) {
     }
 
     // Verify OTP
-    const isValid = await bcrypt.compare(otp, otpRecord.otp_hash);
+    const isValid = await verifyOTPHash(email, otp, otpRecord.otp_hash);
 
     if (!isValid) {
       return NextResponse.json(
@@ -1,188 +1,453 @@
-from flask import Flask, redirect, url_for, session, render_template, request, flash
-from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required
-from flask_mail import Mail, Message
-from google.oauth2 import id_token
-from google_auth_oauthlib.flow import Flow
-import requests
+from flask import Blueprint, Flask, Response, abort, after_this_request, current_app, g, redirect, url_for, session, render_template, request, flash, jsonify
+from flask.cli import with_appcontext
+from flask_login import LoginManager, current_user, login_user, logout_user, login_required
+from werkzeug.local import LocalProxy
+from werkzeug.middleware.proxy_fix import ProxyFix
+import click
+import hmac
 import os
 import random
 import string
-import base64
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
+import threading
+import time
+import metrics
+import session_tokens
+import tracing
+from config import load_config, resolve_data_files
+from otp_store import create_otp_store
+from rate_limit import create_limiter
+from invites import EMAIL_RE, parse_emails
+from users import User, UserCache, create_user_repository
+from mail_dispatch import create_dispatcher
+from assets import CachedAsset
+from email_templates import OTPEmailTemplate
+from google_oauth import OAUTH_SECONDS, CertCache, IDTokenVerifier, build_client_config, create_session
 
-load_dotenv()
+GOOGLE_SCOPES = ["openid", "https://www.googleapis.com/auth/userinfo.email", "https://www.googleapis.com/auth/userinfo.profile"]
 
-app = Flask(__name__, template_folder="templates")
-app.secret_key = os.getenv("SECRET_KEY", "dev_secret_key")
+# Flask-Login setup
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
 
-# Flask-Mail configuration
-app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
-app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS', 'True') == 'True'
-app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_USERNAME')
+bp = Blueprint("auth", __name__)
 
-mail = Mail(app)
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "Request latency by route", ["method", "route", "status"]
+)
+OTP_EVENTS = metrics.counter(
+    "otp_events", "OTP codes issued, verified, rejected as wrong or expired, and failed sends", ["event"]
+)
+RATE_LIMITED = metrics.counter("rate_limited_requests", "Requests refused by a rate limit", ["limit"])
+OTP_STORE_SIZE = metrics.gauge("otp_store_size", "Unexpired OTP codes held by the store")
+MAIL_QUEUE_DEPTH = metrics.gauge("mail_queue_depth", "Messages waiting for a mail worker")
+USER_CACHE_SIZE = metrics.gauge("user_cache_size", "Users held by the load_user cache")
+
+
+class AuthServices:
+    """Long-lived state behind the routes, built once per app by ``create_app``"""
+
+    def __init__(self, app):
+        config = app.config
+
+        self.config = config
+        # OTP emails are sent in the background over long-lived SMTP connections
+        self.mail_dispatcher = create_dispatcher(app)
+
+        # Users live in Postgres with USER_STORE=postgres, otherwise only in the
+        # session; the cache keeps load_user from a lookup on every request
+        self.user_cache = UserCache(config["USER_CACHE_SIZE"], config["USER_CACHE_TTL"])
+        self.user_repository = create_user_repository(config, self.user_cache)
+        # With JWT_SECRET set, logins are carried by the auth_token cookie the
+        # Next.js app also issues and accepts, instead of the Flask session.
+        # Its tokens name the user by users.id, which only the database has.
+        if config["JWT_SECRET"] and self.user_repository is None:
+            raise ValueError("JWT_SECRET needs USER_STORE=postgres so tokens carry the users.id the Next.js app uses")
+        self.tokens = session_tokens.create_codec(config["JWT_SECRET"], config["JWT_TTL"], config["JWT_MEMO_SIZE"])
+
+        self.google_client_config = build_client_config(
+            config["GOOGLE_CLIENT_ID"],
+            config["GOOGLE_CLIENT_SECRET"],
+            config["GOOGLE_REDIRECT_URI"],
+            auth_uri=config["GOOGLE_AUTH_URI"],
+            token_uri=config["GOOGLE_TOKEN_URI"],
+        )
+        self._google_lock = threading.Lock()
+
+        self.otp_store = create_otp_store(config["OTP_STORE"], config["OTP_STORE_PATH"], config["OTP_SECRET"])
+        self.limiters = {
+            name: create_limiter(name, spec, config["RATE_LIMIT_STORE"], config["RATE_LIMIT_STORE_PATH"])
+            for name, spec in config["RATE_LIMITS"].items()
+        }
+
+        # STOCKMASTER logo, read and encoded once and refreshed only when the file changes
+        self.logo_asset = CachedAsset(
+            os.path.join(app.root_path, 'static', 'images', 'stockmaster_logo.png'), 'image/png'
+        )
+        self.sender = config["MAIL_DEFAULT_SENDER"]
+        self._otp_template = None
+
+    def __getattr__(self, name):
+        # The Google session, cert cache and verifier are built on first use so
+        # OTP-only processes never import requests and google.auth
+        if name in ("google_session", "google_certs", "id_token_verifier"):
+            self._init_google()
+            return object.__getattribute__(self, name)
+        raise AttributeError(name)
+
+    def _init_google(self):
+        with self._google_lock:
+            if "id_token_verifier" in self.__dict__:
+                return
+            # Signing certs are cached for their Cache-Control max-age and fetched
+            # over one pooled session, so ID tokens are verified locally
+            self.google_session = create_session()
+            self.google_certs = CertCache(self.config["GOOGLE_CERTS_URL"], self.google_session)
+            self.id_token_verifier = IDTokenVerifier(
+                self.config["GOOGLE_CLIENT_ID"], self.google_certs, issuers=self.config["GOOGLE_ISSUERS"]
+            )
+
+    def otp_template(self):
+        """Return the compiled OTP email, recompiling only when the logo changes"""
+        logo = self.logo_asset.load()
+        if self._otp_template is None or self._otp_template.logo is not logo:
+            self._otp_template = OTPEmailTemplate.compile(self.sender, logo)
+        return self._otp_template
+
+    def open_connections(self):
+        """Open the per-process database pool before serving requests.
+
+        Call after forking; connections made in a preloading master would be
+        shared by every worker.
+        """
+        if self.user_repository is not None:
+            self.user_repository.open()
+
+    def warm(self):
+        """Build everything the first requests would otherwise pay for.
+
+        Meant to run in the master process before workers are forked (gunicorn
+        ``preload_app``) so the compiled template, encoded logo, Google client
+        libraries and signing certs are shared copy-on-write instead of loaded
+        again by each worker.
+        """
+        if self.sender:
+            self.otp_template()
+            from flask_mail import Mail  # noqa: F401  (imported by the first send)
+        if not self.config["GOOGLE_CLIENT_ID"]:
+            return
+        from google_auth_oauthlib.flow import Flow  # noqa: F401
+        if self.config["PRELOAD_GOOGLE_CERTS"]:
+            try:
+                self.google_certs.get()
+            except Exception as e:
+                current_app.logger.warning("Could not preload Google certs: %s", e)
+            # Pooled sockets must not be shared with forked workers; each one
+            # reconnects on first use
+            self.google_session.close()
 
-# Flask-Login setup
-login_manager = LoginManager(app)
-login_manager.login_view = 'login'
 
-# Mock User Model (Replace with DB in production)
-class User(UserMixin):
-    def __init__(self, id_, email, name):
-        self.id = id_
-        self.email = email
-        self.name = name
+services = LocalProxy(lambda: current_app.extensions["auth"])
 
 
-# Google OAuth Config
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:5000/callback")
+def bearer_token_matches(setting):
+    """True if the request carries ``Authorization: Bearer`` with the token in ``setting``"""
+    token = current_app.config[setting]
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
 
-# OTP storage (in production, use Redis or database)
-otp_storage = {}
+
+def require_monitoring_token():
+    """Hide an operator endpoint unless MONITORING_TOKEN is set and presented"""
+    if not current_app.config["MONITORING_TOKEN"]:
+        abort(404)
+    if not bearer_token_matches("MONITORING_TOKEN"):
+        abort(401)
+
+
+def create_app(config=None):
+    """Build the auth app. ``config`` overrides settings read from the environment."""
+    app = Flask(__name__, template_folder="templates")
+    app.config.update(load_config())
+    if config:
+        app.config.update(config)
+    resolve_data_files(app.config, app.instance_path)
+    app.secret_key = app.config["SECRET_KEY"]
+    proxies = app.config["TRUSTED_PROXIES"]
+    if proxies:
+        # request.remote_addr becomes the client's address, as the proxies saw it
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies, x_host=proxies)
+
+    metrics.REGISTRY.share(app.config["METRICS_DIR"], app.config["METRICS_FLUSH_INTERVAL"])
+    tracing.TRACER.configure(
+        tracing.create_exporter(app.config["TRACE_EXPORTER"], app.config["TRACE_FILE"]),
+        app.config["TRACE_SAMPLE_RATE"],
+    )
+    login_manager.init_app(app)
+    app.extensions["auth"] = services = AuthServices(app)
+    app.register_blueprint(bp)
+    OTP_STORE_SIZE.set_function(services.otp_store.size)
+    MAIL_QUEUE_DEPTH.set_function(services.mail_dispatcher.pending)
+    USER_CACHE_SIZE.set_function(services.user_cache.__len__)
+    app.cli.add_command(invite_command)
+    app.cli.add_command(init_user_db_command)
+    app.cli.add_command(set_user_active_command)
+    return app
+
+
+def warm_caches(app):
+    with app.app_context():
+        services.warm()
+
+
+def open_connections(app):
+    with app.app_context():
+        services.open_connections()
+
+def make_google_flow():
+    from google_auth_oauthlib.flow import Flow
+
+    config = current_app.config
+    with tracing.span("oauth.build_flow"):
+        flow = Flow.from_client_config(services.google_client_config, scopes=GOOGLE_SCOPES,
+                                       redirect_uri=config["GOOGLE_REDIRECT_URI"])
+        # Share the pooled, traced connections of the Google session
+        for prefix, adapter in services.google_session.adapters.items():
+            flow.oauth2session.mount(prefix, adapter)
+    return flow
+
+def check_rate_limits(*checks):
+    """Record a hit on each (limiter name, key) pair; return seconds to wait if one is exhausted"""
+    with tracing.span("rate_limit.check"):
+        for name, key in checks:
+            allowed, retry_after = services.limiters[name].hit(key)
+            if not allowed:
+                RATE_LIMITED.inc(name)
+                return retry_after
+    return 0
 
 def generate_otp(length=6):
     """Generate a random OTP"""
     return ''.join(random.choices(string.digits, k=length))
 
 def get_logo_base64():
-    """Load and encode the STOCKMASTER logo"""
-    try:
-        logo_path = os.path.join(app.root_path, 'static', 'images', 'stockmaster_logo.png')
-        with open(logo_path, 'rb') as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode()
-            return f"data:image/png;base64,{encoded_string}"
-    except FileNotFoundError:
-        print(f"Logo file not found at {logo_path}")
-        return None
+    """Return the STOCKMASTER logo as a data URI (None if the file is missing)"""
+    return services.logo_asset.data_uri()
+
+def get_otp_template():
+    """Return the compiled OTP email, recompiling only when the logo changes"""
+    return services.otp_template()
 
 def send_otp_email(email, otp):
-    """Send OTP to user's email"""
+    """Queue the OTP email for delivery and return its job id (None on failure)"""
     try:
-        html_body = f'''
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
-                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                    <div style="text-align: center; margin-bottom: 30px;">
-                        <h1 style="color: #0066cc; font-size: 36px; margin: 0;">STOCKMASTER</h1>
-                    </div>
-                    <h2 style="color: #2c3e50; margin-bottom: 20px;">Dear User,</h2>
-                    <p style="font-size: 16px;">Your One-Time Password (OTP) for accessing your <strong>STOCKMASTER</strong> account is:</p>
-                    <div style="text-align: center; margin: 30px 0;">
-                        <span style="display: inline-block; background-color: #e8f5e9; padding: 15px 30px; border-radius: 8px; font-size: 32px; font-weight: bold; color: #34A853; letter-spacing: 5px;">{otp}</span>
-                    </div>
-                    <p style="font-size: 16px;">This OTP is valid for the next <strong>5 minutes</strong> and can be used only once.</p>
-                    <div style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0;">
-                        <p style="margin: 0; font-size: 14px;"><strong>⚠️ Security Notice:</strong> For your security, please do not share this code with anyone under any circumstances — including individuals claiming to be from customer support or the <strong>STOCKMASTER</strong> team.</p>
-                    </div>
-                    <p style="font-size: 14px; color: #666;">If you did not request this code, please ignore this message and consider securing your account immediately.</p>
-                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
-                    <p style="font-size: 12px; color: #999; text-align: center;">This is an automated message from STOCKMASTER. Please do not reply to this email.</p>
-                </div>
-            </body>
-        </html>
-        '''
+        with tracing.span("email.render"):
+            msg = get_otp_template().render(email, otp)
+        with tracing.span("mail.enqueue"):
+            job_id = services.mail_dispatcher.submit(msg)
+    except Exception:
+        current_app.logger.exception("Could not queue the OTP email for %s", email)
+        job_id = None
+    if job_id is None:
+        OTP_EVENTS.inc("send_failed")
+    return job_id
 
-        
-        text_body = f'''Dear User,
+def send_bulk_otps(emails, wait_timeout=None):
+    """Issue OTPs for many addresses at once and queue their invitation emails.
 
-Your One-Time Password (OTP) for accessing your STOCKMASTER account is: {otp}.
+    The codes are written to the store in one operation and the messages go
+    out over the dispatcher's pooled connections. Returns one result dict per
+    address; with ``wait_timeout`` it waits for delivery and reports the outcome.
+    """
+    template = get_otp_template()
+    dispatcher = services.mail_dispatcher
+    issued = [(email, generate_otp()) for email in emails]
+    services.otp_store.put_many(issued, current_app.config["OTP_TTL"])
+    OTP_EVENTS.inc("issued", amount=len(issued))
+    results = []
+    for email, otp in issued:
+        result = {"email": email, "job_id": None, "state": "rejected", "error": None}
+        try:
+            result["job_id"] = dispatcher.submit(template.render(email, otp), block=True, timeout=30)
+            if result["job_id"]:
+                result["state"] = "queued"
+            else:
+                result["error"] = "queue full"
+        except ValueError as e:
+            result["state"], result["error"] = "invalid", str(e)
+        results.append(result)
+    if wait_timeout:
+        statuses = dispatcher.wait([r["job_id"] for r in results if r["job_id"]], wait_timeout)
+        for result in results:
+            status = statuses.get(result["job_id"])
+            if status:
+                result["state"], result["error"] = status["state"], status["error"]
+    return results
 
-This OTP is valid for the next 5 minutes and can be used only once.
+@login_manager.user_loader
+def load_user(user_id):
+    user_cache = services.user_cache
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    repository = services.user_repository
+    if repository is not None:
+        with tracing.span("users.get"):
+            user = repository.get(user_id)
+    else:
+        user_data = session.get("user")
+        if user_data and user_data.get("id") == user_id:
+            user = User(user_data["id"], user_data["email"], user_data["name"])
+    if user is not None:
+        user_cache.put(user_id, user)
+    return user
 
-For your security, please do not share this code with anyone under any circumstances — including individuals claiming to be from customer support or the STOCKMASTER team.
 
-If you did not request this code, please ignore this message and consider securing your account immediately.
-'''
-        
-        msg = Message(
-            subject='Your OTP Code - STOCKMASTER',
-            recipients=[email],
-            body=text_body,
-            html=html_body
-        )
-        mail.send(msg)
-        return True
-    except Exception as e:
-        print(f"Error sending email: {e}")
-        return False
+def log_in(email, name, auth_method):
+    """Log in the user for ``email``, recording the login when users are in the database.
+
+    Returns None if the account has been deactivated.
+    """
+    # The Next.js app and the users table key accounts on the lowercased address
+    email = email.strip().lower()
+    repository = services.user_repository
+    if repository is not None:
+        with tracing.span("users.upsert_login", method=auth_method):
+            user = repository.upsert_login(email, name, auth_method)
+        if user is None:
+            return None
+    else:
+        user = User(email, email, name)
+    if services.tokens is not None:
+        token = services.tokens.issue(user)
+        after_this_request(lambda response: set_auth_cookie(response, token))
+        return user
+    login_user(user)
+    services.user_cache.put(user.get_id(), user)
+    # Store user info as dict, not object
+    session["user"] = user.to_dict()
+    return user
+
+@login_manager.request_loader
+def load_user_from_token(request):
+    """Authenticate from the auth_token cookie.
+
+    The token names the user; ``load_user`` still looks them up (usually in
+    the cache) so a deactivated account is refused before its token expires.
+    """
+    tokens = services.tokens
+    token = request.cookies.get(session_tokens.COOKIE_NAME)
+    if tokens is None or not token:
+        return None
+    payload = tokens.verify(token)
+    if payload is None:
+        return None
+    return load_user(payload["id"])
 
-@login_manager.user_loader
-def load_user(user_id):
-    user_data = session.get("user")
-    if user_data and user_data.get("id") == user_id:
-        return User(user_data["id"], user_data["email"], user_data["name"])
-    return None
 
-@app.route("/")
+def set_auth_cookie(response, token):
+    # Same attributes as setAuthCookie in lib/auth-utils.ts
+    response.set_cookie(
+        session_tokens.COOKIE_NAME, token, max_age=services.tokens.ttl, path="/",
+        httponly=True, secure=current_app.config["AUTH_COOKIE_SECURE"], samesite="Lax",
+    )
+    return response
+
+@bp.before_app_request
+def start_timer():
+    g.request_start = time.perf_counter()
+    # Unmatched URLs share one label so 404 probes can't blow up the series count
+    g.route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    g.request_span = tracing.start_trace(
+        f"{request.method} {g.route}", request.headers.get("traceparent"), method=request.method
+    ).__enter__()
+
+def record_latency(status):
+    start = g.pop("request_start", None)
+    if start is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, request.method, g.route, status)
+        span = g.pop("request_span")
+        span.set("status_code", status)
+        span.__exit__(None, None, None)
+
+@bp.after_app_request
+def record_response(response):
+    if g.get("request_span") and g.request_span.trace_id:
+        response.headers["X-Trace-Id"] = g.request_span.trace_id
+    record_latency(response.status_code)
+    return response
+
+@bp.teardown_app_request
+def record_error(exc):
+    # Only still pending if the view raised and no response went through after_request
+    record_latency(500)
+
+@bp.route("/metrics")
+def prometheus_metrics():
+    require_monitoring_token()
+    return Response(metrics.REGISTRY.expose(), content_type=metrics.CONTENT_TYPE)
+
+@bp.route("/debug/traces/<trace_id>")
+def show_trace(trace_id):
+    """Span breakdown of a recent request (needs TRACE_EXPORTER=memory)"""
+    require_monitoring_token()
+    exporter = tracing.TRACER.exporter
+    spans = exporter.get(trace_id) if isinstance(exporter, tracing.MemoryExporter) else None
+    if not spans:
+        abort(404)
+    return Response(tracing.format_trace(spans) + "\n", content_type="text/plain; charset=utf-8")
+
+@bp.route("/")
 def home():
     return render_template("index.html")
 
-@app.route("/login")
+@bp.route("/login")
 def login():
-    flow = Flow.from_client_config(
-        client_config={
-            "web": {
-                "client_id": GOOGLE_CLIENT_ID,
-                "client_secret": GOOGLE_CLIENT_SECRET,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://accounts.google.com/o/oauth2/token",
-                "redirect_uris": [GOOGLE_REDIRECT_URI],
-            }
-        },
-        scopes=["openid", "https://www.googleapis.com/auth/userinfo.email", "https://www.googleapis.com/auth/userinfo.profile"],
-        redirect_uri=GOOGLE_REDIRECT_URI
-    )
-    authorization_url, state = flow.authorization_url()
+    flow = make_google_flow()
+    with tracing.span("oauth.authorization_url"):
+        authorization_url, state = flow.authorization_url()
     session["state"] = state
+    # The PKCE verifier has to survive until the callback builds its own flow
+    session["code_verifier"] = flow.code_verifier
     return redirect(authorization_url)
 
-@app.route("/callback")
+@bp.route("/callback")
 def callback():
-    flow = Flow.from_client_config(
-        client_config={
-            "web": {
-                "client_id": GOOGLE_CLIENT_ID,
-                "client_secret": GOOGLE_CLIENT_SECRET,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://accounts.google.com/o/oauth2/token",
-                "redirect_uris": [GOOGLE_REDIRECT_URI],
-            }
-        },
-        scopes=["openid", "https://www.googleapis.com/auth/userinfo.email", "https://www.googleapis.com/auth/userinfo.profile"],
-        redirect_uri=GOOGLE_REDIRECT_URI
-    )
+    flow = make_google_flow()
     # Restore state from session for security
     flow.state = session.get("state")
-    flow.fetch_token(authorization_response=request.url)
+    flow.code_verifier = session.pop("code_verifier", None)
+    start = time.perf_counter()
+    try:
+        with tracing.span("oauth.token_exchange"):
+            flow.fetch_token(authorization_response=request.url)
+    except Exception:
+        OAUTH_SECONDS.observe(time.perf_counter() - start, "token", "error")
+        raise
+    OAUTH_SECONDS.observe(time.perf_counter() - start, "token", "ok")
     credentials = flow.credentials
-    id_info = id_token.verify_oauth2_token(credentials.id_token, requests.Request(), GOOGLE_CLIENT_ID)
+    id_info = services.id_token_verifier.verify(credentials.id_token)
 
-    user = User(id_info["sub"], id_info["email"], id_info["name"])
-    login_user(user)
-    # Store user info as dict, not object
-    session["user"] = {"id": user.id, "email": user.email, "name": user.name}
-    return redirect(url_for("dashboard"))
+    if log_in(id_info["email"], id_info.get("name"), "google") is None:
+        flash("This account has been deactivated.", "error")
+        return redirect(url_for("auth.home"))
+    return redirect(url_for("auth.dashboard"))
 
-@app.route("/dashboard")
+@bp.route("/dashboard")
 @login_required
 def dashboard():
-    user = session.get("user")
-    name = user["name"] if user else "User"
-    return render_template("dashboard.html", name=name)
+    return render_template("dashboard.html", name=current_user.name or "User")
 
-@app.route("/logout")
+@bp.route("/logout")
 def logout():
+    if current_user.is_authenticated:
+        services.user_cache.invalidate(current_user.get_id())
     logout_user()
     session.clear()
-    return redirect(url_for("home"))
+    response = redirect(url_for("auth.home"))
+    response.delete_cookie(session_tokens.COOKIE_NAME, path="/")
+    return response
 
-@app.route("/otp-login", methods=["GET", "POST"])
+@bp.route("/otp-login", methods=["GET", "POST"])
 def otp_login():
     if request.method == "POST":
         email = request.form.get("email")
@@ -190,68 +455,168 @@ def otp_login():
             flash("Please provide an email address", "error")
             return render_template("otp_login.html")
         
-        # Generate OTP
-        otp = generate_otp()
-        expiry = datetime.now() + timedelta(minutes=5)
+        retry_after = check_rate_limits(
+            ("issue:ip", request.remote_addr),
+            ("issue:email", email.lower()),
+        )
+        if retry_after:
+            flash(f"Too many OTP requests. Please try again in {retry_after} seconds.", "error")
+            return render_template("otp_login.html"), 429, {"Retry-After": str(retry_after)}
         
-        # Store OTP with expiry
-        otp_storage[email] = {
-            'otp': otp,
-            'expiry': expiry,
-            'verified': False
-        }
+        # Generate OTP and store it with expiry
+        with tracing.span("generate_otp"):
+            otp = generate_otp()
+        with tracing.span("otp_store.put"):
+            services.otp_store.put(email, otp, current_app.config["OTP_TTL"])
+        OTP_EVENTS.inc("issued")
         
-        # Send OTP email
-        if send_otp_email(email, otp):
+        # Queue OTP email; delivery continues after this request returns
+        with tracing.span("send_otp_email"):
+            job_id = send_otp_email(email, otp)
+        if job_id:
             session['otp_email'] = email
+            session['otp_job'] = job_id
             flash("OTP sent to your email!", "success")
-            return redirect(url_for("verify_otp"))
+            return redirect(url_for("auth.verify_otp"))
         else:
             flash("Failed to send OTP. Please check your email configuration.", "error")
             return render_template("otp_login.html")
     
     return render_template("otp_login.html")
 
-@app.route("/verify-otp", methods=["GET", "POST"])
+@bp.route("/verify-otp", methods=["GET", "POST"])
 def verify_otp():
-    email = session.get('otp_email')
+    # Invited users arrive without an /otp-login session and give the address
+    # with the code (``?email=`` or the form), which must not issue a new code
+    email = (request.values.get("email") or "").strip() or session.get('otp_email')
+    if email and not EMAIL_RE.match(email):
+        flash("Please enter a valid email address", "error")
+        email = None
     if not email:
-        flash("Please request an OTP first", "error")
-        return redirect(url_for("otp_login"))
+        if request.method == "POST":
+            return render_template("verify_otp.html", email=None), 400
+        return render_template("verify_otp.html", email=None)
+    session['otp_email'] = email
     
     if request.method == "POST":
         entered_otp = request.form.get("otp")
         
-        if email not in otp_storage:
-            flash("OTP expired or not found. Please request a new one.", "error")
-            return redirect(url_for("otp_login"))
-        
-        stored_data = otp_storage[email]
+        retry_after = check_rate_limits(
+            ("verify:ip", request.remote_addr),
+            ("verify:email", email.lower()),
+        )
+        if retry_after:
+            flash(f"Too many attempts. Please try again in {retry_after} seconds.", "error")
+            return render_template("verify_otp.html", email=email), 429, {"Retry-After": str(retry_after)}
         
-        # Check if OTP is expired
-        if datetime.now() > stored_data['expiry']:
-            del otp_storage[email]
-            flash("OTP expired. Please request a new one.", "error")
-            return redirect(url_for("otp_login"))
+        otp_store = services.otp_store
+        # Expired entries are evicted by the store, so they read as missing
+        with tracing.span("otp_store.get"):
+            stored = otp_store.get(email)
+        if stored is None:
+            OTP_EVENTS.inc("expired")
+            flash("OTP expired or not found. Please request a new one.", "error")
+            return redirect(url_for("auth.otp_login"))
         
-        # Verify OTP
-        if entered_otp == stored_data['otp']:
+        # Verify and consume the OTP in one step so it can only be used once
+        with tracing.span("otp_store.consume"):
+            verified = bool(entered_otp) and otp_store.consume(email, entered_otp)
+        if verified:
             # OTP is correct, log in the user
-            user = User(email, email, email.split('@')[0])
-            login_user(user)
-            session["user"] = {"id": user.id, "email": user.email, "name": user.name}
-            
-            # Clean up OTP
-            del otp_storage[email]
+            OTP_EVENTS.inc("verified")
             session.pop('otp_email', None)
+            session.pop('otp_job', None)
+            if log_in(email, email.split('@')[0], "otp") is None:
+                flash("This account has been deactivated.", "error")
+                return redirect(url_for("auth.otp_login"))
             
             flash("Login successful!", "success")
-            return redirect(url_for("dashboard"))
+            return redirect(url_for("auth.dashboard"))
         else:
+            OTP_EVENTS.inc("failed")
             flash("Invalid OTP. Please try again.", "error")
             return render_template("verify_otp.html", email=email)
     
     return render_template("verify_otp.html", email=email)
 
+@bp.route("/otp-status")
+def otp_status():
+    """Report delivery status of the OTP email queued for this session.
+
+    Another worker can only answer with ``MAIL_STATUS_STORE=sqlite`` (the
+    default under gunicorn with several workers).
+    """
+    job_id = session.get('otp_job')
+    status = services.mail_dispatcher.status(job_id) if job_id else None
+    if status is None:
+        return jsonify({"state": "unknown"}), 404
+    return jsonify({"state": status["state"], "attempts": status["attempts"], "error": status["error"]})
+
+@bp.route("/admin/invites", methods=["POST"])
+def bulk_invites():
+    """Send OTP invitations to a JSON list of emails or a CSV body.
+
+    The JSON body is either the list itself or ``{"emails": [...]}``.
+    Requires ``Authorization: Bearer $INVITE_API_TOKEN``; pass ``?wait=<seconds>``
+    to wait for delivery before responding.
+    """
+    if not bearer_token_matches("INVITE_API_TOKEN"):
+        return jsonify({"error": "unauthorized"}), 401
+
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            body = body.get("emails", [])
+        if not isinstance(body, (list, str)):
+            return jsonify({"error": 'expected a JSON list of emails or {"emails": [...]}'}), 400
+        emails, invalid = parse_emails(body)
+    else:
+        emails, invalid = parse_emails(request.get_data(as_text=True))
+    results = send_bulk_otps(emails, wait_timeout=request.args.get("wait", type=float))
+    results += [{"email": email, "job_id": None, "state": "invalid", "error": "invalid address"} for email in invalid]
+    return jsonify({"results": results})
+
+@click.command("invite")
+@click.argument("source", type=click.File("r"), default="-")
+@click.option("--wait/--no-wait", default=True, help="Wait for delivery and report the outcome.")
+@click.option("--timeout", default=600.0, help="Seconds to wait for delivery.")
+@with_appcontext
+def invite_command(source, wait, timeout):
+    """Send OTP invitations to every address in SOURCE (CSV or one per line)."""
+    emails, invalid = parse_emails(source)
+    results = send_bulk_otps(emails, wait_timeout=timeout if wait else None)
+    for result in results:
+        click.echo(f"{result['email']}\t{result['state']}\t{result['error'] or ''}")
+    for email in invalid:
+        click.echo(f"{email}\tinvalid\tinvalid address")
+
+@click.command("init-user-db")
+@with_appcontext
+def init_user_db_command():
+    """Create the users table (and the columns added since) in DATABASE_URL."""
+    repository = services.user_repository
+    if repository is None:
+        raise click.ClickException("USER_STORE is not 'postgres'")
+    repository.ensure_schema()
+    click.echo("users table ready")
+
+@click.command("set-user-active")
+@click.argument("email")
+@click.option("--active/--inactive", default=False, help="Reactivate instead of deactivating.")
+@with_appcontext
+def set_user_active_command(email, active):
+    """Deactivate (or with --active, reactivate) the user with EMAIL.
+
+    Running workers stop loading a deactivated user within USER_CACHE_TTL.
+    """
+    repository = services.user_repository
+    if repository is None:
+        raise click.ClickException("USER_STORE is not 'postgres'")
+    if repository.set_active(email, active) is None:
+        raise click.ClickException(f"No user with email {email}")
+    click.echo(f"{email} {'activated' if active else 'deactivated'}")
+
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app = create_app()
+    open_connections(app)
+    app.run(debug=True)
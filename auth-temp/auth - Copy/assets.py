@@ -0,0 +1,66 @@
+import base64
+import hashlib
+import logging
+import os
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+AssetData = namedtuple("AssetData", "data digest b64 cid content_type")
+
+
+class CachedAsset:
+    """A static file read once and kept in memory together with its encodings.
+
+    The cache is keyed on the file's mtime and size, so ``load()`` costs a
+    single ``stat`` while the file is unchanged. When the file is touched it is
+    re-read and hashed; the base64 text is only recomputed if the content hash
+    actually changed.
+    """
+
+    def __init__(self, path, content_type):
+        self.path = path
+        self.content_type = content_type
+        self._key = None
+        self._asset = None
+        self._missing_logged = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Return the cached ``AssetData``, or None if the file does not exist"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if not self._missing_logged:
+                logger.warning("Asset not found at %s", self.path)
+                self._missing_logged = True
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        if key == self._key:
+            return self._asset
+        with self._lock:
+            if key != self._key:
+                self._refresh(key)
+            return self._asset
+
+    def _refresh(self, key):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if self._asset is None or self._asset.digest != digest:
+            self._asset = AssetData(
+                data=data,
+                digest=digest,
+                b64=base64.b64encode(data).decode("ascii"),
+                cid=f"{digest[:16]}@stockmaster",
+                content_type=self.content_type,
+            )
+        self._key = key
+        self._missing_logged = False
+
+    def data_uri(self):
+        asset = self.load()
+        if asset is None:
+            return None
+        return f"data:{asset.content_type};base64,{asset.b64}"
@@ -0,0 +1,107 @@
+"""Concurrent Google-login throughput: threaded workers vs the gevent event loop.
+
+Runs the app under gunicorn with one worker process, once with a thread pool
+(``-k gthread``) and once on gevent (``-k gevent``), against a local stub
+issuer whose token endpoint stalls for ``--delay`` seconds like a slow round
+trip to Google. Each virtual user walks /login -> stub /auth -> /callback.
+
+    python benchmarks/bench_concurrent_login.py --users 200 --logins 1000
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_google import StubGoogle  # noqa: E402
+
+
+def wait_for(url, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def login_once(base_url, index):
+    session = requests.Session()
+    start = time.perf_counter()
+    auth = session.get(f"{base_url}/login", allow_redirects=False)
+    grant = session.get(auth.headers["Location"] + f"&login_hint=user{index}@example.com",
+                        allow_redirects=False)
+    callback = session.get(f"{base_url}/callback?{urlparse(grant.headers['Location']).query}",
+                           allow_redirects=False)
+    ok = callback.status_code == 302 and callback.headers["Location"].endswith("/dashboard")
+    return ok, time.perf_counter() - start
+
+
+def run_mode(mode, args, stub):
+    port = args.port
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        GOOGLE_CLIENT_ID=stub.audience,
+        GOOGLE_CLIENT_SECRET="stub-secret",
+        GOOGLE_AUTH_URI=f"{stub.issuer}/auth",
+        GOOGLE_TOKEN_URI=f"{stub.issuer}/token",
+        GOOGLE_CERTS_URL=f"{stub.issuer}/certs",
+        GOOGLE_ISSUERS=stub.issuer,
+        GOOGLE_REDIRECT_URI=f"{base_url}/callback",
+        OAUTHLIB_INSECURE_TRANSPORT="1",
+    )
+    worker = ["-k", "gthread", "--threads", str(args.threads)] if mode == "threaded" else [
+        "-k", "gevent", "--worker-connections", "2000"]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-w", "1", *worker, "-b", f"127.0.0.1:{port}",
+         "--backlog", "2048", "--log-level", "warning", "wsgi:app"],
+        cwd=ROOT, env=env,
+    )
+    try:
+        wait_for(base_url + "/")
+        login_once(base_url, 0)  # warm up the cert cache
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.users) as pool:
+            results = list(pool.map(lambda i: login_once(base_url, i), range(args.logins)))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for ok, latency in results if ok)
+    failures = sum(1 for ok, _ in results if not ok)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else float("nan")
+    print(f"{mode:>9}: {len(latencies) / elapsed:8.1f} logins/s  "
+          f"p50 {statistics.median(latencies) * 1000 if latencies else float('nan'):7.0f} ms  "
+          f"p95 {p95 * 1000:7.0f} ms  failures {failures}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200, help="concurrent virtual users")
+    parser.add_argument("--logins", type=int, default=1000)
+    parser.add_argument("--delay", type=float, default=0.25, help="token endpoint latency in seconds")
+    parser.add_argument("--threads", type=int, default=16, help="threads for the threaded worker")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--modes", default="threaded,gevent")
+    args = parser.parse_args()
+
+    stub = StubGoogle(host="127.0.0.1", port=0, delay=args.delay).start()
+    for mode in args.modes.split(","):
+        run_mode(mode, args, stub)
+    stub.stop()
+
+
+if __name__ == "__main__":
+    main()
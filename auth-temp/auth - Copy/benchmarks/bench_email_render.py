@@ -0,0 +1,67 @@
+"""Per-message render cost of the OTP email: f-string + Flask-Mail vs compiled template.
+
+Run from the auth service directory::
+
+    python benchmarks/bench_email_render.py [--number 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask_mail import Mail, Message
+
+from assets import CachedAsset
+from email_templates import LOGO_IMG, OTP_HTML, OTP_SUBJECT, OTP_TEXT, OTPEmailTemplate
+
+SENDER = 'stockmaster@example.com'
+RECIPIENT = 'user@example.com'
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'static', 'images', 'stockmaster_logo.png')
+
+
+def render_legacy(logo, otp):
+    """The previous send_otp_email body: format both bodies and build a Message"""
+    html_body = OTP_HTML.replace('{logo_html}', LOGO_IMG.format(cid=logo.cid)).replace('{otp}', otp)
+    text_body = OTP_TEXT.replace('{otp}', otp)
+    msg = Message(subject=OTP_SUBJECT, recipients=[RECIPIENT], sender=SENDER,
+                  body=text_body, html=html_body)
+    msg.attach('stockmaster_logo.png', logo.content_type, logo.data, 'inline',
+               headers={'Content-ID': f'<{logo.cid}>'})
+    return msg.as_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['MAIL_DEFAULT_SENDER'] = SENDER
+    Mail(app)
+    logo = CachedAsset(LOGO_PATH, 'image/png').load()
+    template = OTPEmailTemplate.compile(SENDER, logo)
+
+    with app.app_context():
+        results = {
+            'legacy': timeit.repeat(lambda: render_legacy(logo, '123456'),
+                                    number=args.number, repeat=5),
+            'compiled': timeit.repeat(lambda: template.render(RECIPIENT, '123456'),
+                                      number=args.number, repeat=5),
+        }
+        sizes = {
+            'legacy': len(render_legacy(logo, '123456')),
+            'compiled': len(template.render(RECIPIENT, '123456').as_bytes()),
+        }
+
+    best = {name: min(times) / args.number * 1e6 for name, times in results.items()}
+    for name, per_msg in best.items():
+        print(f'{name:>9}: {per_msg:9.1f} us/message  {sizes[name]:>7} bytes')
+    print(f'  speedup: {best["legacy"] / best["compiled"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
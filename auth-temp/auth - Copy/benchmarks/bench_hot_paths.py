@@ -0,0 +1,220 @@
+"""Microbenchmarks for the per-request work of the auth service.
+
+Run from the auth service directory::
+
+    python benchmarks/bench_hot_paths.py --save before.json
+    # ...change something...
+    python benchmarks/bench_hot_paths.py --compare before.json
+
+``--compare`` runs the suite again (or reads a second results file with
+``--current``) and exits non-zero if any benchmark got slower than
+``--threshold`` percent. ``-k`` selects benchmarks by substring.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, generate_otp, get_logo_base64, get_otp_template, load_user  # noqa: E402
+from bench_email_render import render_legacy  # noqa: E402
+from otp_store import MemoryOTPStore, SQLiteOTPStore  # noqa: E402
+from rate_limit import SlidingWindowLimiter  # noqa: E402
+from results import compare, load, machine_info, save  # noqa: E402
+from session_tokens import TokenCodec  # noqa: E402
+from users import User  # noqa: E402
+
+SENDER = "stockmaster@example.com"
+RECIPIENT = "user@example.com"
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register ``setup(ctx)``, which returns the zero-argument callable to time"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark("generate_otp")
+def _generate_otp(ctx):
+    return generate_otp
+
+
+@benchmark("get_logo_base64")
+def _logo(ctx):
+    return get_logo_base64
+
+
+@benchmark("email.render")
+def _render(ctx):
+    template = get_otp_template()
+    return lambda: template.render(RECIPIENT, "123456").as_bytes()
+
+
+@benchmark("email.render_message")
+def _render_message(ctx):
+    # The Flask-Mail Message build that send_otp_email used before the compiled template
+    from flask_mail import Mail
+    Mail(ctx["app"])
+    logo = ctx["services"].logo_asset.load()
+    return lambda: render_legacy(logo, "123456")
+
+
+def _filled_store(store, size=10000):
+    store.put_many([(f"user{i}@example.com", f"{i % 1000000:06d}") for i in range(size)], 300)
+    return store
+
+
+def _lookup(store):
+    def verify():
+        # What verify_otp does: the expiry-aware lookup, then the one-time consume
+        store.get("user5000@example.com")
+        store.consume("user5000@example.com", "000000")
+    return verify
+
+
+@benchmark("otp_store.memory.verify")
+def _memory_lookup(ctx):
+    return _lookup(_filled_store(MemoryOTPStore()))
+
+
+@benchmark("otp_store.sqlite.verify")
+def _sqlite_lookup(ctx):
+    return _lookup(_filled_store(SQLiteOTPStore(os.path.join(ctx["tmp"], "otp.db"))))
+
+
+@benchmark("rate_limit.hit")
+def _rate_limit(ctx):
+    limiter = SlidingWindowLimiter(10 ** 9, 300)
+    return lambda: limiter.hit("127.0.0.1")
+
+
+@benchmark("load_user.cached")
+def _load_user_cached(ctx):
+    load_user("user@example.com")
+    return lambda: load_user("user@example.com")
+
+
+@benchmark("load_user.session")
+def _load_user_session(ctx):
+    cache = ctx["services"].user_cache
+
+    def load():
+        cache.invalidate("user@example.com")
+        return load_user("user@example.com")
+    return load
+
+
+@benchmark("session_cookie.encode")
+def _cookie_encode(ctx):
+    serializer = ctx["serializer"]
+    return lambda: serializer.dumps(ctx["session"])
+
+
+@benchmark("session_cookie.decode")
+def _cookie_decode(ctx):
+    serializer = ctx["serializer"]
+    cookie = serializer.dumps(ctx["session"])
+    return lambda: serializer.loads(cookie)
+
+
+@benchmark("session_token.issue")
+def _token_issue(ctx):
+    codec, user = TokenCodec("bench-secret"), User("user-id", RECIPIENT, "user")
+    return lambda: codec.issue(user)
+
+
+@benchmark("session_token.verify")
+def _token_verify(ctx):
+    codec = TokenCodec("bench-secret")
+    token = codec.issue(User("user-id", RECIPIENT, "user"))
+    return lambda: codec.verify(token)
+
+
+@benchmark("session_token.verify_cold")
+def _token_verify_cold(ctx):
+    codec = TokenCodec("bench-secret")
+    token = codec.issue(User("user-id", RECIPIENT, "user"))
+
+    def verify():
+        codec.clear()
+        return codec.verify(token)
+    return verify
+
+
+def time_it(func, repeat, min_time):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    runs = [t / number * 1e9 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"min_ns": min(runs), "median_ns": statistics.median(runs),
+            "stdev_ns": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+            "number": number, "runs_ns": runs}
+
+
+def run_suite(names, repeat, min_time):
+    app = create_app({
+        "MAIL_DEFAULT_SENDER": SENDER,
+        "PRELOAD_GOOGLE_CERTS": False,
+        "TRACE_EXPORTER": "",
+        "OTP_STORE": "memory",
+    })
+    session = {"_user_id": "user@example.com", "_fresh": True,
+               "user": {"id": "user@example.com", "email": "user@example.com", "name": "user"}}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, app.test_request_context("/dashboard"):
+        from flask import session as flask_session
+        flask_session.update(session)
+        ctx = {
+            "app": app,
+            "services": app.extensions["auth"],
+            "serializer": app.session_interface.get_signing_serializer(app),
+            "session": session,
+            "tmp": tmp,
+        }
+        for name in names:
+            results[name] = time_it(BENCHMARKS[name](ctx), repeat, min_time)
+            print(f"{name:<28}{results[name]['min_ns'] / 1000:>10.2f} us"
+                  f"  (median {results[name]['median_ns'] / 1000:.2f} us)")
+    return {"machine": machine_info(), "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="select", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved results file")
+    parser.add_argument("--current", help="with --compare, read results from this file instead of running")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    parser.add_argument("--stat", choices=("min", "median"), default="min")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.select or args.select in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    current = load(args.current) if args.current else run_suite(names, args.repeat, args.min_time)
+    if args.save:
+        save(current, args.save)
+
+    if args.compare:
+        regressions = compare(load(args.compare), current, args.threshold, args.stat)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the {args.threshold:g}% threshold")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
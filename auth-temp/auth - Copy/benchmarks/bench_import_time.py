@@ -0,0 +1,96 @@
+"""Cold-start cost of the auth service in a fresh interpreter.
+
+Each scenario is timed from the first statement to the last (interpreter
+start-up excluded) and run under ``python -X importtime`` to see which
+modules it pulled in::
+
+    python benchmarks/bench_import_time.py --save imports.json
+    python benchmarks/bench_import_time.py --compare imports.json
+
+The results use the same JSON layout as ``bench_hot_paths.py``, so saved
+files can be compared with either script. ``--top`` lists the heaviest
+imports of the ``import app`` scenario, and the report names the optional
+stacks (Google OAuth, requests, Flask-Mail) that a scenario loaded.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from results import compare, load, machine_info, save  # noqa: E402
+
+SCENARIOS = {
+    "import.app": "import app",
+    "import.create_app": "import app; app.create_app()",
+    # What a preloading gunicorn master does before forking
+    "import.wsgi": "import wsgi",
+}
+HEAVY = ("google_auth_oauthlib", "google.auth", "requests", "flask_mail")
+# Keep the scenarios offline and deterministic
+ENV = dict(os.environ, PRELOAD_GOOGLE_CERTS="False", TRACE_EXPORTER="")
+
+
+def run_once(code):
+    """Return (seconds spent in ``code``, ``{module: cumulative import us}``)"""
+    timed = f"import time as _t; _s = _t.perf_counter()\n{code}\nprint(_t.perf_counter() - _s)"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", timed],
+                            cwd=ROOT, env=ENV, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{code!r} failed:\n{result.stderr[-2000:]}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return float(result.stdout.strip().splitlines()[-1]), modules
+
+
+def measure(code, repeat):
+    runs, modules = [], {}
+    for _ in range(repeat):
+        seconds, modules = run_once(code)
+        runs.append(seconds * 1e9)
+    return runs, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    results, loaded = {}, {}
+    for name, code in SCENARIOS.items():
+        runs, modules = measure(code, args.repeat)
+        results[name] = {"min_ns": min(runs), "median_ns": statistics.median(runs),
+                         "stdev_ns": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+                         "number": 1, "runs_ns": runs}
+        loaded[name] = [heavy for heavy in HEAVY if heavy in modules]
+        print(f"{name:<20}{results[name]['min_ns'] / 1e6:>9.1f} ms"
+              f"  (median {results[name]['median_ns'] / 1e6:.1f} ms)"
+              f"  loads: {', '.join(loaded[name]) or '-'}")
+
+    _, modules = run_once(SCENARIOS["import.app"])
+    print("\nheaviest imports under 'import app' (cumulative ms):")
+    for module, cumulative in sorted(modules.items(), key=lambda m: -m[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}  {module}")
+
+    current = {"machine": machine_info(), "results": results, "loaded": loaded}
+    if args.save:
+        save(current, args.save)
+    if args.compare:
+        if compare(load(args.compare), current, args.threshold, "min"):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
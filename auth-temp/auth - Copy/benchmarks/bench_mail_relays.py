@@ -0,0 +1,127 @@
+"""Failover test for multi-relay OTP delivery against local SMTP sinks.
+
+Starts one sink per relay, each with its own injected delay and failure
+rate, points ``MAIL_RELAYS`` at them and pushes OTP emails through the mail
+dispatcher. Halfway through, the failing relay recovers (or ``--outage``
+takes a healthy one down) so the health checks can be watched taking
+relays out of rotation and probing them back in::
+
+    python benchmarks/bench_mail_relays.py --messages 400
+    python benchmarks/bench_mail_relays.py --relays fast:3:0:0 slow:1:0.4:0 flaky:2:0:0.6
+
+Each relay is ``name:weight:delay seconds:failure rate``. Reports messages
+and latency per relay, the relay health as ``/metrics`` shows it, and the
+p50/p95 delivery time of the jobs.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import metrics  # noqa: E402
+from app import create_app, get_otp_template  # noqa: E402
+from smtp_sink import SMTPSink  # noqa: E402
+
+
+def parse_relay(spec):
+    name, weight, delay, fail_rate = spec.split(":")
+    return name, int(weight), float(delay), float(fail_rate)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--relays", nargs="+", type=parse_relay,
+                        default=[parse_relay(s) for s in ("fast:3:0:0", "slow:1:0.4:0", "flaky:2:0:0.7")])
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=4, help="mail worker threads")
+    parser.add_argument("--max-connections", type=int, default=2, help="per relay")
+    parser.add_argument("--slow", type=float, default=0.25, help="MAIL_RELAY_SLOW_SECONDS")
+    parser.add_argument("--cooldown", type=float, default=1.0, help="MAIL_RELAY_COOLDOWN")
+    parser.add_argument("--outage", help="relay that stops accepting mail for the second half")
+    args = parser.parse_args()
+
+    sinks = {name: SMTPSink(host="127.0.0.1", port=0, delay=delay, fail_rate=fail_rate).start()
+             for name, _, delay, fail_rate in args.relays}
+    relays = [{"name": name, "server": "127.0.0.1", "port": sinks[name].port, "weight": weight,
+               "max_connections": args.max_connections} for name, weight, _, _ in args.relays]
+    app = create_app({
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_USE_TLS": False,
+        "MAIL_USERNAME": "bench@example.com",
+        "MAIL_PASSWORD": "",
+        "MAIL_DEFAULT_SENDER": "bench@example.com",
+        "MAIL_RELAYS": json.dumps(relays),
+        "MAIL_WORKERS": args.workers,
+        "MAIL_MAX_ATTEMPTS": 4,
+        "MAIL_RETRY_BACKOFF": 0.1,
+        "MAIL_RELAY_SLOW_SECONDS": args.slow,
+        "MAIL_RELAY_COOLDOWN": args.cooldown,
+        "PRELOAD_GOOGLE_CERTS": False,
+        "TRACE_EXPORTER": "",
+    })
+    dispatcher = app.extensions["auth"].mail_dispatcher
+    recovering = [name for name, _, _, fail_rate in args.relays if fail_rate]
+
+    submitted = {}
+    start = time.perf_counter()
+    with app.app_context():
+        template = get_otp_template()
+        half = args.messages // 2
+        for phase in (range(half), range(half, args.messages)):
+            if phase.start:
+                # Second half: the failing relays recover, the outage starts
+                for name in recovering:
+                    sinks[name].fail_rate = 0.0
+                if args.outage:
+                    sinks[args.outage].fail_rate = 1.0
+            for i in phase:
+                job_id = dispatcher.submit(template.render(f"user{i}@example.com", f"{i:06d}"),
+                                           block=True, timeout=60)
+                submitted[job_id] = time.time()
+            statuses = dispatcher.wait(list(submitted), timeout=120)
+            print(f"after {phase.stop} messages:")
+            for status in dispatcher.relay_status():
+                print(f"  {status['name']:<8} healthy={status['healthy']} probation={status['probation']} "
+                      f"sent={status['sent']} failed={status['failed']} {status['reason'] or ''}")
+    elapsed = time.perf_counter() - start
+    # Give the monitor a chance to probe relays that are still cooling down
+    time.sleep(args.cooldown * 2)
+
+    delivery = [status["updated"] - submitted[job_id]
+                for job_id, status in statuses.items() if status and status["state"] == "sent"]
+    states = {}
+    for status in statuses.values():
+        states[status["state"]] = states.get(status["state"], 0) + 1
+
+    print(f"\n{'relay':<10}{'weight':>7}{'delivered':>11}{'connections':>13}{'healthy':>9}{'avg ms':>9}  reason")
+    for status in dispatcher.relay_status():
+        name = status["name"]
+        weight = next(w for n, w, _, _ in args.relays if n == name)
+        latency = (status["latency"] or 0) * 1000
+        print(f"{name:<10}{weight:>7}{len(sinks[name].messages):>11}{sinks[name].connections:>13}"
+              f"{str(status['healthy']):>9}{latency:>9.1f}  {status['reason'] or ''}")
+    print(f"\n{args.messages} messages in {elapsed:.2f}s = {args.messages / elapsed:.1f}/s, "
+          f"states: {states}")
+    print(f"delivery p50 {percentile(delivery, 50) * 1000:.0f} ms, p95 {percentile(delivery, 95) * 1000:.0f} ms")
+    print("\n" + "\n".join(line for line in metrics.REGISTRY.expose().splitlines()
+                           if line.startswith(("smtp_relay_healthy", "smtp_relay_latency", "smtp_relay_trips"))))
+
+    dispatcher.shutdown()
+    for sink in sinks.values():
+        sink.stop()
+    return 0 if states.get("sent") == args.messages else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Cost of issuing and checking one OTP: HMAC-SHA256 digest vs bcrypt.
+
+bcrypt (cost 10) is what the Next.js send-otp/verify-otp routes used; the
+``bcrypt`` package is only needed for that row::
+
+    python benchmarks/bench_otp_hash.py [--rounds 10]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from otp_store import OTPHasher  # noqa: E402
+
+EMAIL = "user@example.com"
+OTP = "123456"
+
+
+def report(name, issue, verify, number):
+    issue_us = min(timeit.repeat(issue, number=number, repeat=5)) / number * 1e6
+    verify_us = min(timeit.repeat(verify, number=number, repeat=5)) / number * 1e6
+    print(f"{name:<22}{issue_us:>14.1f}{verify_us:>14.1f}")
+    return issue_us, verify_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost factor")
+    args = parser.parse_args()
+
+    print(f"{'scheme':<22}{'issue us':>14}{'verify us':>14}")
+    report("plain ==", lambda: OTP, lambda: OTP == "123456", 200000)
+
+    hasher = OTPHasher(os.urandom(32))
+    digest = hasher.digest(EMAIL, OTP)
+    fast = report("hmac-sha256", lambda: hasher.digest(EMAIL, OTP),
+                  lambda: hasher.matches(digest, EMAIL, OTP), 50000)
+
+    try:
+        import bcrypt
+    except ImportError:
+        print(f"{'bcrypt':<22}  skipped: pip install bcrypt")
+        return
+    hashed = bcrypt.hashpw(OTP.encode(), bcrypt.gensalt(args.rounds))
+    slow = report(f"bcrypt (cost {args.rounds})",
+                  lambda: bcrypt.hashpw(OTP.encode(), bcrypt.gensalt(args.rounds)),
+                  lambda: bcrypt.checkpw(OTP.encode(), hashed), 3)
+    print(f"\nhmac is {slow[0] / fast[0]:,.0f}x cheaper to issue and "
+          f"{slow[1] / fast[1]:,.0f}x cheaper to verify")
+
+
+if __name__ == "__main__":
+    main()
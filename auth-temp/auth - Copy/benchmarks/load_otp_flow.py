@@ -0,0 +1,283 @@
+"""Load test for the OTP login flow: /otp-login -> email -> /verify-otp -> /dashboard.
+
+Each virtual user loops over fresh addresses. The OTP emails go to an
+embedded SMTP sink, which parses the code out of every message and hands it
+to the user waiting for it, so flows complete without a real mailbox.
+
+By default the app is started under gunicorn (``wsgi:app``) with settings
+suitable for load: the sink as mail relay, a shared SQLite OTP store when
+there is more than one worker, and rate limits lifted. To test a server you
+started yourself, point its mail settings at ``--smtp-port`` and pass
+``--url``::
+
+    python benchmarks/load_otp_flow.py --users 50 --duration 30 --workers 4
+    python benchmarks/load_otp_flow.py --url http://127.0.0.1:5000 --smtp-port 1025
+
+Reports throughput, error rate and p50/p95/p99 latency for each step, where
+``otp_delivery`` is the time from the /otp-login response to the message
+arriving at the sink.
+"""
+import argparse
+import email
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from smtp_sink import SMTPSink  # noqa: E402
+
+STEPS = ("otp_login", "otp_delivery", "verify_otp", "dashboard", "flow")
+_OTP_RE = re.compile(r"\b(\d{6})\b")
+
+
+class OTPMailbox:
+    """Collects OTP codes from the sink, keyed by recipient"""
+
+    def __init__(self):
+        self._codes = {}
+        self._arrived = threading.Condition()
+
+    def on_message(self, sender, recipients, data):
+        otp = extract_otp(data)
+        with self._arrived:
+            for recipient in recipients:
+                self._codes[recipient.lower()] = (otp, time.perf_counter())
+            self._arrived.notify_all()
+
+    def wait(self, address, timeout):
+        """Return ``(otp, arrival time)`` for ``address``, or None on timeout"""
+        deadline = time.perf_counter() + timeout
+        with self._arrived:
+            while address not in self._codes:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                self._arrived.wait(remaining)
+            return self._codes.pop(address)
+
+
+def extract_otp(data):
+    message = email.message_from_bytes(data)
+    for part in message.walk():
+        if part.get_content_type() == "text/plain":
+            match = _OTP_RE.search(part.get_payload(decode=True).decode("utf-8", "replace"))
+            if match:
+                return match.group(1)
+    return None
+
+
+class Results:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    def record(self, step, latency, error=None):
+        if error:
+            self.errors[step][error] += 1
+        else:
+            self.samples[step].append(latency)
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+
+def run_flow(session, base_url, mailbox, address, results, otp_timeout):
+    session.cookies.clear()
+    flow_start = time.perf_counter()
+
+    def step(name, method, path, expected, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, allow_redirects=False, timeout=30, **kwargs)
+        except requests.RequestException as e:
+            results.record(name, None, type(e).__name__)
+            return None
+        latency = time.perf_counter() - start
+        if response.status_code != expected:
+            results.record(name, None, f"HTTP {response.status_code}")
+            return None
+        results.record(name, latency)
+        return response
+
+    if step("otp_login", "POST", "/otp-login", 302, data={"email": address}) is None:
+        return False
+    sent = time.perf_counter()
+    delivered = mailbox.wait(address, otp_timeout)
+    if delivered is None or delivered[0] is None:
+        results.record("otp_delivery", None, "timeout" if delivered is None else "no code in message")
+        return False
+    otp, arrived = delivered
+    results.record("otp_delivery", max(0.0, arrived - sent))
+    if step("verify_otp", "POST", "/verify-otp", 302, data={"otp": otp}) is None:
+        return False
+    if step("dashboard", "GET", "/dashboard", 200) is None:
+        return False
+    results.record("flow", time.perf_counter() - flow_start)
+    return True
+
+
+def virtual_user(index, args, base_url, mailbox, results, stop_at, counter):
+    session = requests.Session()
+    while time.perf_counter() < stop_at:
+        with counter["lock"]:
+            if args.flows and counter["started"] >= args.flows:
+                return
+            counter["started"] += 1
+            n = counter["started"]
+        address = f"load-{os.getpid()}-{index}-{n}@example.com"
+        try:
+            if not run_flow(session, base_url, mailbox, address, results, args.otp_timeout):
+                results.record("flow", None, "incomplete")
+        except Exception as e:  # keep the user alive; the error shows up in the report
+            results.record("flow", None, type(e).__name__)
+
+
+def start_server(args, smtp_port, workdir):
+    env = dict(
+        os.environ,
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=str(smtp_port),
+        MAIL_USE_TLS="False",
+        MAIL_USERNAME="loadtest@example.com",
+        MAIL_PASSWORD="",
+        MAIL_WORKERS=str(args.mail_workers),
+        SECRET_KEY="load-test",
+        OTP_STORE="sqlite" if args.workers > 1 else "memory",
+        # Every store, trace and metrics file of the run goes here, not into the sources
+        DATA_DIR=workdir,
+        OTP_ISSUE_LIMIT_EMAIL="1000000/1",
+        OTP_ISSUE_LIMIT_IP="1000000/1",
+        OTP_VERIFY_LIMIT_EMAIL="1000000/1",
+        OTP_VERIFY_LIMIT_IP="1000000/1",
+        PRELOAD_GOOGLE_CERTS="False",
+        GUNICORN_BIND=f"127.0.0.1:{args.port}",
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        GUNICORN_THREADS=str(args.threads),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning", "wsgi:app"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(base_url + "/", timeout=1)
+            return server, base_url
+        except requests.ConnectionError:
+            if server.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"{base_url} did not come up")
+
+
+def report(results, elapsed, args):
+    summary = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "config": {"users": args.users, "workers": args.workers, "worker_class": args.worker_class,
+                   "threads": args.threads, "url": args.url},
+        "elapsed": elapsed,
+        "steps": {},
+    }
+    print(f"\n{'step':<13}{'ok':>8}{'errors':>8}{'err %':>8}{'per s':>9}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for step in STEPS:
+        latencies = sorted(results.samples.get(step, ()))
+        errors = sum(results.errors.get(step, Counter()).values())
+        total = len(latencies) + errors
+        row = {
+            "ok": len(latencies),
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "throughput": len(latencies) / elapsed,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else float("nan"),
+            "error_kinds": dict(results.errors.get(step, {})),
+        }
+        summary["steps"][step] = row
+        print(f"{step:<13}{row['ok']:>8}{errors:>8}{row['error_rate'] * 100:>8.1f}{row['throughput']:>9.1f}"
+              f"{row['p50'] * 1000:>9.1f}{row['p95'] * 1000:>9.1f}{row['p99'] * 1000:>9.1f}"
+              f"{row['max'] * 1000:>9.1f}")
+    for step, kinds in results.errors.items():
+        for kind, count in kinds.most_common():
+            print(f"  {step}: {count} x {kind}")
+    flows = summary["steps"]["flow"]["ok"]
+    print(f"\n{flows} flows in {elapsed:.1f}s = {flows / elapsed:.1f} logins/s "
+          f"with {args.users} users")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--flows", type=int, default=0, help="stop after this many flows (0: no limit)")
+    parser.add_argument("--otp-timeout", type=float, default=30, help="seconds to wait for each email")
+    parser.add_argument("--url", help="target a running server instead of starting one")
+    parser.add_argument("--smtp-port", type=int, default=0, help="sink port (0 picks a free one)")
+    parser.add_argument("--port", type=int, default=5056, help="port for the started server")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--worker-class", default="gthread")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--mail-workers", type=int, default=2)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    mailbox = OTPMailbox()
+    sink = SMTPSink(host="127.0.0.1", port=args.smtp_port, on_message=mailbox.on_message).start()
+    server = None
+    workdir = tempfile.mkdtemp(prefix="otp-load-")
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            server, base_url = start_server(args, sink.port, workdir)
+        print(f"{args.users} users against {base_url}, mail sink on port {sink.port}")
+
+        results = Results()
+        counter = {"lock": threading.Lock(), "started": 0}
+        start = time.perf_counter()
+        stop_at = start + args.duration
+        users = [threading.Thread(target=virtual_user,
+                                  args=(i, args, base_url, mailbox, results, stop_at, counter),
+                                  daemon=True)
+                 for i in range(args.users)]
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        sink.stop()
+
+    summary = report(results, elapsed, args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
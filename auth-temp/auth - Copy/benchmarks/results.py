@@ -0,0 +1,62 @@
+"""Saving and comparing benchmark results.
+
+Shared by ``bench_hot_paths.py`` and ``bench_import_time.py``. It imports
+nothing from the service, so the import-time benchmark can use it without
+loading the app it measures.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def machine_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def save(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold, stat):
+    """Print the change per benchmark; return the names that regressed"""
+    key = f"{stat}_ns"
+    regressions = []
+    print(f"\n{'benchmark':<28}{'baseline us':>12}{'current us':>12}{'change':>9}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<28}{'-':>12}{result[key] / 1000:>12.2f}{'new':>9}")
+            continue
+        change = (result[key] - before[key]) / before[key] * 100
+        flag = "  REGRESSION" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<28}{before[key] / 1000:>12.2f}{result[key] / 1000:>12.2f}{change:>+8.1f}%{flag}")
+    if baseline["machine"].get("platform") != current["machine"].get("platform") \
+            or baseline["machine"].get("python") != current["machine"].get("python"):
+        print("\nwarning: baseline was recorded on a different machine or Python version")
+    return regressions
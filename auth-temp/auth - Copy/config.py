@@ -0,0 +1,138 @@
+import hashlib
+import hmac
+import os
+
+from dotenv import load_dotenv
+
+
+# Default file names, under DATA_DIR, of the settings that hold a path
+DATA_FILES = {
+    "OTP_STORE_PATH": "otp_store.db",
+    "RATE_LIMIT_STORE_PATH": "rate_limits.db",
+    "MAIL_STATUS_STORE_PATH": "mail_jobs.db",
+    "TRACE_FILE": "traces.jsonl",
+    "METRICS_DIR": "metrics",
+}
+
+
+def resolve_data_files(config, default_dir):
+    """Fill the unset ``DATA_FILES`` paths in ``config`` from ``DATA_DIR`` (or ``default_dir``)"""
+    data_dir = os.path.abspath(config.get("DATA_DIR") or default_dir)
+    os.makedirs(data_dir, exist_ok=True)
+    config["DATA_DIR"] = data_dir
+    for setting, name in DATA_FILES.items():
+        if not config.get(setting):
+            config[setting] = os.path.join(data_dir, name)
+
+
+def load_config():
+    """Read the auth service settings from the environment (and ``.env``).
+
+    Called once by ``create_app``; everything else reads ``app.config``.
+    """
+    load_dotenv()
+    env = os.environ
+    return {
+        "SECRET_KEY": env.get("SECRET_KEY", "dev_secret_key"),
+        # Where the SQLite stores, the trace file and the metrics go unless
+        # their own setting is; defaults to the app's instance folder, never the
+        # working directory (see DATA_FILES)
+        "DATA_DIR": env.get("DATA_DIR"),
+
+        # Flask-Mail and the background dispatcher
+        "MAIL_SERVER": env.get("MAIL_SERVER", "smtp.gmail.com"),
+        "MAIL_PORT": int(env.get("MAIL_PORT", 587)),
+        "MAIL_USE_TLS": env.get("MAIL_USE_TLS", "True") == "True",
+        "MAIL_USERNAME": env.get("MAIL_USERNAME"),
+        "MAIL_PASSWORD": env.get("MAIL_PASSWORD"),
+        "MAIL_DEFAULT_SENDER": env.get("MAIL_USERNAME"),
+        "MAIL_WORKERS": int(env.get("MAIL_WORKERS", 2)),
+        "MAIL_QUEUE_SIZE": int(env.get("MAIL_QUEUE_SIZE", 1000)),
+        "MAIL_MAX_ATTEMPTS": int(env.get("MAIL_MAX_ATTEMPTS", 3)),
+        "MAIL_RETRY_BACKOFF": float(env.get("MAIL_RETRY_BACKOFF", 1.0)),
+        # Where /otp-status finds delivery progress: "memory" only answers in
+        # the worker that queued the email, "sqlite" in every worker (the
+        # default follows OTP_STORE)
+        "MAIL_STATUS_STORE": env.get("MAIL_STATUS_STORE") or env.get("OTP_STORE", "memory"),
+        "MAIL_STATUS_STORE_PATH": env.get("MAIL_STATUS_STORE_PATH"),
+        # Optional JSON list of relays sharing the load (see smtp_relays.py);
+        # unset means MAIL_SERVER alone
+        "MAIL_RELAYS": env.get("MAIL_RELAYS"),
+        "MAIL_RELAY_FAILURES": int(env.get("MAIL_RELAY_FAILURES", 3)),
+        "MAIL_RELAY_SLOW_SECONDS": float(env.get("MAIL_RELAY_SLOW_SECONDS", 5.0)),
+        "MAIL_RELAY_COOLDOWN": float(env.get("MAIL_RELAY_COOLDOWN", 10.0)),
+        # Good sends a probed relay must make before it is fully back
+        "MAIL_RELAY_PROBATION": int(env.get("MAIL_RELAY_PROBATION", 5)),
+
+        # Google OAuth; the endpoints can point at a local stub issuer for testing
+        "GOOGLE_CLIENT_ID": env.get("GOOGLE_CLIENT_ID"),
+        "GOOGLE_CLIENT_SECRET": env.get("GOOGLE_CLIENT_SECRET"),
+        "GOOGLE_REDIRECT_URI": env.get("GOOGLE_REDIRECT_URI", "http://localhost:5000/callback"),
+        "GOOGLE_AUTH_URI": env.get("GOOGLE_AUTH_URI", "https://accounts.google.com/o/oauth2/auth"),
+        "GOOGLE_TOKEN_URI": env.get("GOOGLE_TOKEN_URI", "https://accounts.google.com/o/oauth2/token"),
+        "GOOGLE_CERTS_URL": env.get("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs"),
+        "GOOGLE_ISSUERS": env.get("GOOGLE_ISSUERS", "accounts.google.com,https://accounts.google.com").split(","),
+        "PRELOAD_GOOGLE_CERTS": env.get("PRELOAD_GOOGLE_CERTS", "True") == "True",
+
+        # OTP storage: "memory" for a single process, "sqlite" to share codes
+        # between workers (the path must point at the same file for all of them)
+        "OTP_TTL": int(env.get("OTP_TTL", 5 * 60)),
+        "OTP_STORE": env.get("OTP_STORE", "memory"),
+        "OTP_STORE_PATH": env.get("OTP_STORE_PATH"),
+        # Key for the HMAC digests the store keeps instead of codes; falls back
+        # to one derived from JWT_SECRET exactly as lib/auth-utils.ts derives
+        # it, so both sides check each other's codes (or from SECRET_KEY when
+        # the Next.js app is not sharing logins). Every worker agrees on it.
+        "OTP_SECRET": env.get("OTP_SECRET") or hmac.new(
+            (env.get("JWT_SECRET") or env.get("SECRET_KEY", "dev_secret_key")).encode(),
+            b"otp-digest", hashlib.sha256,
+        ).hexdigest(),
+
+        # Number of reverse proxies in front of the app whose X-Forwarded-For,
+        # -Proto and -Host headers are trusted. The per-IP rate limits key on
+        # the client address; behind a proxy without this every client shares
+        # the proxy's address. Leave at 0 when clients connect directly, or
+        # they could spoof their address.
+        "TRUSTED_PROXIES": int(env.get("TRUSTED_PROXIES", 0)),
+
+        # Sliding-window limits ("<count>/<seconds>") per email and per client IP
+        "RATE_LIMIT_STORE": env.get("RATE_LIMIT_STORE", "memory"),
+        "RATE_LIMIT_STORE_PATH": env.get("RATE_LIMIT_STORE_PATH"),
+        "RATE_LIMITS": {
+            "issue:email": env.get("OTP_ISSUE_LIMIT_EMAIL", "3/300"),
+            "issue:ip": env.get("OTP_ISSUE_LIMIT_IP", "20/300"),
+            "verify:email": env.get("OTP_VERIFY_LIMIT_EMAIL", "5/300"),
+            "verify:ip": env.get("OTP_VERIFY_LIMIT_IP", "30/300"),
+        },
+
+        # Each process writes its metrics to METRICS_DIR, and /metrics merges
+        # them so a scrape covers every gunicorn worker (see metrics.py)
+        "METRICS_DIR": env.get("METRICS_DIR"),
+        "METRICS_FLUSH_INTERVAL": float(env.get("METRICS_FLUSH_INTERVAL", 5.0)),
+        # Bearer token for /metrics and /debug/traces/<id>; unset hides both
+        "MONITORING_TOKEN": env.get("MONITORING_TOKEN"),
+
+        # Span tracing: TRACE_EXPORTER=jsonl appends spans to TRACE_FILE,
+        # "memory" keeps recent traces for /debug/traces/<id>; empty disables it
+        "TRACE_EXPORTER": env.get("TRACE_EXPORTER", ""),
+        "TRACE_FILE": env.get("TRACE_FILE"),
+        "TRACE_SAMPLE_RATE": float(env.get("TRACE_SAMPLE_RATE", 1.0)),
+
+        # USER_STORE=postgres keeps users in the DATABASE_URL users table
+        # (supabase/schema.sql); "session" keeps them in the session cookie only
+        "USER_STORE": env.get("USER_STORE", "session"),
+        "DATABASE_URL": env.get("DATABASE_URL"),
+        "USER_DB_POOL_MIN": int(env.get("USER_DB_POOL_MIN", 2)),
+        "USER_DB_POOL_MAX": int(env.get("USER_DB_POOL_MAX", 10)),
+        "USER_CACHE_SIZE": int(env.get("USER_CACHE_SIZE", 10000)),
+        "USER_CACHE_TTL": int(env.get("USER_CACHE_TTL", 300)),
+        "INVITE_API_TOKEN": env.get("INVITE_API_TOKEN"),
+
+        # Shared with the Next.js app (lib/auth-utils.ts); when set, logins are
+        # JWTs in the auth_token cookie instead of Flask session state. Needs
+        # USER_STORE=postgres, as the tokens carry the users.id
+        "JWT_SECRET": env.get("JWT_SECRET"),
+        "JWT_TTL": int(env.get("JWT_TTL", 7 * 24 * 3600)),
+        "JWT_MEMO_SIZE": int(env.get("JWT_MEMO_SIZE", 4096)),
+        "AUTH_COOKIE_SECURE": env.get("AUTH_COOKIE_SECURE", "False") == "True",
+    }
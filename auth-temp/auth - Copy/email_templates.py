@@ -0,0 +1,182 @@
+import quopri
+import secrets
+import socket
+from email.header import Header
+from email.utils import formataddr, formatdate, make_msgid
+
+OTP_SUBJECT = 'Your OTP Code - STOCKMASTER'
+
+OTP_HTML = '''
+        <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; background-color: #f4f4f4; padding: 20px;">
+                <div style="max-width: 600px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
+                    <div style="text-align: center; margin-bottom: 30px;">
+                        {logo_html}
+                    </div>
+                    <h2 style="color: #2c3e50; margin-bottom: 20px;">Dear User,</h2>
+                    <p style="font-size: 16px;">Your One-Time Password (OTP) for accessing your <strong>STOCKMASTER</strong> account is:</p>
+                    <div style="text-align: center; margin: 30px 0;">
+                        <span style="display: inline-block; background-color: #e8f5e9; padding: 15px 30px; border-radius: 8px; font-size: 32px; font-weight: bold; color: #34A853; letter-spacing: 5px;">{otp}</span>
+                    </div>
+                    <p style="font-size: 16px;">This OTP is valid for the next <strong>5 minutes</strong> and can be used only once.</p>
+                    <div style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0;">
+                        <p style="margin: 0; font-size: 14px;"><strong>⚠️ Security Notice:</strong> For your security, please do not share this code with anyone under any circumstances — including individuals claiming to be from customer support or the <strong>STOCKMASTER</strong> team.</p>
+                    </div>
+                    <p style="font-size: 14px; color: #666;">If you did not request this code, please ignore this message and consider securing your account immediately.</p>
+                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
+                    <p style="font-size: 12px; color: #999; text-align: center;">This is an automated message from STOCKMASTER. Please do not reply to this email.</p>
+                </div>
+            </body>
+        </html>
+        '''
+
+OTP_TEXT = '''Dear User,
+
+Your One-Time Password (OTP) for accessing your STOCKMASTER account is: {otp}.
+
+This OTP is valid for the next 5 minutes and can be used only once.
+
+For your security, please do not share this code with anyone under any circumstances — including individuals claiming to be from customer support or the STOCKMASTER team.
+
+If you did not request this code, please ignore this message and consider securing your account immediately.
+'''
+
+LOGO_IMG = '<img src="cid:{cid}" alt="STOCKMASTER Logo" style="max-width: 400px; height: auto;">'
+LOGO_TEXT = '<h1 style="color: #0066cc; font-size: 36px; margin: 0;">STOCKMASTER</h1>'
+
+# Marks where the OTP is spliced into the compiled message
+_SLOT = object()
+
+
+def _qp_encode(text, slot):
+    """Quoted-printable encode ``text``, replacing each ``slot`` with ``_SLOT``.
+
+    Every slot is surrounded by soft line breaks, so the code spliced in later
+    sits on its own encoded line and decodes back into its original position
+    without re-encoding the rest of the body.
+    """
+    parts = []
+    for i, piece in enumerate(text.replace('\r\n', '\n').split(slot)):
+        if i:
+            parts += [b'=\r\n', _SLOT, b'=\r\n']
+        parts.append(quopri.encodestring(piece.encode('utf-8')).replace(b'\n', b'\r\n'))
+    return parts
+
+
+class RenderedMessage:
+    """Pre-serialized message that Flask-Mail's ``Connection.send`` can deliver"""
+
+    mail_options = ()
+    rcpt_options = ()
+
+    def __init__(self, sender, recipients, subject, data):
+        self.sender = sender
+        self.recipients = recipients
+        self.subject = subject
+        self.data = data
+        self.date = None
+
+    @property
+    def send_to(self):
+        return set(self.recipients)
+
+    def has_bad_headers(self):
+        # Header values are validated when the message is rendered
+        return False
+
+    def as_bytes(self):
+        return self.data
+
+    def as_string(self):
+        return self.data.decode('ascii')
+
+
+class OTPEmailTemplate:
+    """OTP email compiled once into byte segments with a slot for the code.
+
+    ``compile`` lays out the complete MIME tree (text and HTML alternatives,
+    plus the logo as a ``multipart/related`` inline part when available) and
+    encodes it up front. ``render`` only formats the per-message headers and
+    joins the pre-encoded segments around the OTP.
+    """
+
+    def __init__(self, sender, subject, head, segments, logo):
+        self.sender = sender
+        self.subject = subject
+        self.logo = logo
+        self._head = head
+        self._segments = segments
+        self._sender_header = self._header_value(sender)
+        self._subject_header = Header(subject, 'utf-8').encode() if not subject.isascii() else subject
+        self._msgid_domain = socket.getfqdn()
+
+    @staticmethod
+    def _header_value(value):
+        if isinstance(value, (tuple, list)):
+            value = formataddr(tuple(value))
+        if '\r' in value or '\n' in value:
+            raise ValueError('Header values cannot contain line breaks')
+        return value
+
+    @classmethod
+    def compile(cls, sender, logo=None, subject=OTP_SUBJECT, html=OTP_HTML, text=OTP_TEXT):
+        slot = '{otp}'
+        html = html.replace('{logo_html}', LOGO_IMG.format(cid=logo.cid) if logo else LOGO_TEXT)
+        token = secrets.token_hex(8)
+        alt = f'==alt-{token}=='
+        rel = f'==rel-{token}=='
+
+        alternative = [
+            f'--{alt}\r\nContent-Type: text/plain; charset="utf-8"\r\n'
+            f'Content-Transfer-Encoding: quoted-printable\r\n\r\n'.encode('ascii'),
+            *_qp_encode(text, slot),
+            f'\r\n--{alt}\r\nContent-Type: text/html; charset="utf-8"\r\n'
+            f'Content-Transfer-Encoding: quoted-printable\r\n\r\n'.encode('ascii'),
+            *_qp_encode(html, slot),
+            f'\r\n--{alt}--\r\n'.encode('ascii'),
+        ]
+        if logo:
+            lines = [logo.b64[i:i + 76] for i in range(0, len(logo.b64), 76)]
+            head = f'Content-Type: multipart/related; boundary="{rel}";\r\n type="multipart/alternative"'
+            parts = [
+                f'--{rel}\r\nContent-Type: multipart/alternative; boundary="{alt}"\r\n\r\n'.encode('ascii'),
+                *alternative,
+                (f'--{rel}\r\nContent-Type: {logo.content_type}\r\n'
+                 f'Content-Transfer-Encoding: base64\r\n'
+                 f'Content-ID: <{logo.cid}>\r\n'
+                 f'Content-Disposition: inline; filename="stockmaster_logo.png"\r\n\r\n'
+                 + '\r\n'.join(lines) + f'\r\n--{rel}--\r\n').encode('ascii'),
+            ]
+        else:
+            head = f'Content-Type: multipart/alternative; boundary="{alt}"'
+            parts = alternative
+
+        # Fold everything between OTP slots into single byte strings
+        segments = [b'']
+        for part in parts:
+            if part is _SLOT:
+                segments.append(b'')
+            else:
+                segments[-1] += part
+
+        head = f'MIME-Version: 1.0\r\n{head}\r\n\r\n'.encode('ascii')
+        return cls(sender, subject, head, segments, logo)
+
+    def render_bytes(self, recipient, otp):
+        """Return the complete RFC 5322 message for ``recipient`` as bytes"""
+        recipient = self._header_value(recipient)
+        if not otp.isascii() or not otp.isalnum():
+            raise ValueError('OTP must be ASCII alphanumeric')
+        headers = (
+            f'From: {self._sender_header}\r\n'
+            f'To: {recipient}\r\n'
+            f'Subject: {self._subject_header}\r\n'
+            f'Date: {formatdate(localtime=True)}\r\n'
+            f'Message-ID: {make_msgid(domain=self._msgid_domain)}\r\n'
+        ).encode('ascii')
+        return headers + self._head + otp.encode('ascii').join(self._segments)
+
+    def render(self, recipient, otp):
+        """Return a message object ready for ``Connection.send``"""
+        return RenderedMessage(self.sender, [recipient], self.subject,
+                               self.render_bytes(recipient, otp))
@@ -0,0 +1,164 @@
+import base64
+import re
+import threading
+import time
+
+import metrics
+import tracing
+
+# requests and google.auth are imported where they are first needed, so that
+# workers that never see a Google login don't pay for loading them
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+OAUTH_SECONDS = metrics.histogram(
+    "oauth_request_seconds", "Time spent on Google OAuth calls and ID token checks", ["step", "result"]
+)
+
+
+def build_client_config(client_id, client_secret, redirect_uri,
+                        auth_uri="https://accounts.google.com/o/oauth2/auth",
+                        token_uri="https://accounts.google.com/o/oauth2/token"):
+    """Return the ``Flow.from_client_config`` dict for a web client"""
+    return {
+        "web": {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "auth_uri": auth_uri,
+            "token_uri": token_uri,
+            "redirect_uris": [redirect_uri],
+        }
+    }
+
+
+def create_session(pool_size=10):
+    """A ``requests.Session`` with a connection pool for calls to Google.
+
+    The same adapter can be mounted on other sessions (such as the one inside
+    an OAuth ``Flow``) so they share its connections.
+    """
+    import requests
+    from http_tracing import TracedHTTPAdapter
+
+    session = requests.Session()
+    adapter = TracedHTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _b64_int(value):
+    return int.from_bytes(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)), "big")
+
+
+def _jwks_to_pem(jwks):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    certs = {}
+    for key in jwks.get("keys", []):
+        if key.get("kty") != "RSA":
+            continue
+        public_key = rsa.RSAPublicNumbers(_b64_int(key["e"]), _b64_int(key["n"])).public_key()
+        certs[key["kid"]] = public_key.public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.PKCS1
+        ).decode("ascii")
+    return certs
+
+
+class CertCache:
+    """ID-token signing keys fetched from ``url`` and kept for their max-age.
+
+    Accepts both Google's ``{kid: x509 PEM}`` format and a JWK Set. Only one
+    thread refetches at a time; the others keep using the current keys (or
+    wait for the first fetch), so a burst of logins costs a single request.
+    If a refresh fails the previous keys are served until the next attempt.
+    """
+
+    def __init__(self, url=GOOGLE_CERTS_URL, session=None, default_max_age=300,
+                 retry_after=30):
+        self.url = url
+        self.session = session or create_session()
+        self.default_max_age = default_max_age
+        self.retry_after = retry_after
+        self._certs = None
+        self._expires = 0.0
+        self._fetched = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, force=False):
+        """Return ``{kid: PEM}``; ``force`` refetches unless keys were fetched recently"""
+        if not force and self._certs is not None and time.time() < self._expires:
+            return self._certs
+        with self._lock:
+            now = time.time()
+            if (self._certs is None or now >= self._expires
+                    or (force and now - self._fetched >= self.retry_after)):
+                self._refresh()
+            return self._certs
+
+    def _refresh(self):
+        import requests
+        from google.auth import exceptions as google_exceptions
+
+        self._fetched = time.time()
+        start = time.perf_counter()
+        try:
+            with tracing.span("oauth.fetch_certs"):
+                response = self.session.get(self.url, timeout=10)
+            response.raise_for_status()
+            body = response.json()
+        except (requests.RequestException, ValueError) as e:
+            OAUTH_SECONDS.observe(time.perf_counter() - start, "certs", "error")
+            if self._certs is None:
+                raise google_exceptions.TransportError(f"Could not fetch certificates: {e}")
+            self._expires = time.time() + self.retry_after
+            return
+        OAUTH_SECONDS.observe(time.perf_counter() - start, "certs", "ok")
+        self._certs = _jwks_to_pem(body) if "keys" in body else body
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else self.default_max_age
+        self._expires = time.time() + max_age
+
+
+class IDTokenVerifier:
+    """Verifies Google ID tokens locally against the cached signing keys"""
+
+    def __init__(self, audience, certs, issuers=GOOGLE_ISSUERS, clock_skew=10):
+        self.audience = audience
+        self.certs = certs
+        self.issuers = tuple(issuers)
+        self.clock_skew = clock_skew
+
+    def verify(self, token):
+        start = time.perf_counter()
+        try:
+            with tracing.span("oauth.verify_id_token"):
+                id_info = self._verify(token)
+        except Exception:
+            OAUTH_SECONDS.observe(time.perf_counter() - start, "verify", "error")
+            raise
+        OAUTH_SECONDS.observe(time.perf_counter() - start, "verify", "ok")
+        return id_info
+
+    def _verify(self, token):
+        from google.auth import exceptions as google_exceptions
+        from google.auth import jwt
+
+        if isinstance(token, bytes):
+            token = token.decode("utf-8")
+        header = jwt.decode_header(token)
+        certs = self.certs.get()
+        # A kid we have not seen means Google rotated keys before max-age ran out
+        if header.get("kid") and header["kid"] not in certs:
+            certs = self.certs.get(force=True)
+        id_info = jwt.decode(token, certs=certs, audience=self.audience,
+                             clock_skew_in_seconds=self.clock_skew)
+        if id_info.get("iss") not in self.issuers:
+            raise google_exceptions.GoogleAuthError(
+                f"Wrong issuer. 'iss' should be one of {self.issuers} but is {id_info.get('iss')}"
+            )
+        return id_info
@@ -0,0 +1,69 @@
+"""Gunicorn settings for ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+The app is imported once in the master (``preload_app``) and forked into the
+workers. Each worker starts its own mail dispatcher threads, opens its
+database pool as soon as it is forked, and opens its own SMTP, SQLite and
+Google connections on first use.
+
+OTP codes, rate-limit counters and mail job statuses must be shared by the
+workers, so with more than one worker ``OTP_STORE``, ``RATE_LIMIT_STORE``
+and ``MAIL_STATUS_STORE`` default to ``sqlite``, and an explicit ``memory``
+store refuses to start. Their files live in ``DATA_DIR`` (by default the
+app's ``instance/`` folder), the same absolute path in every worker.
+
+Every worker writes its metrics to ``METRICS_DIR`` and ``/metrics`` merges
+them, so any worker can answer a scrape for all of them.
+
+Behind a reverse proxy (nginx, a load balancer) set ``TRUSTED_PROXIES`` to
+the number of proxies so the per-IP rate limits see client addresses
+instead of the proxy's.
+"""
+import gc
+import multiprocessing
+import os
+import sys
+
+from dotenv import load_dotenv
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+preload_app = True
+
+if workers > 1:
+    # Read .env now so a store chosen there is checked too
+    load_dotenv()
+    for setting in ("OTP_STORE", "RATE_LIMIT_STORE", "MAIL_STATUS_STORE"):
+        if os.environ.setdefault(setting, "sqlite") == "memory":
+            # A code issued by one worker would fail on the others, and each
+            # worker would grant the full rate limit
+            sys.exit(f"{setting}=memory is per process and cannot be shared by {workers} workers; "
+                     f"use {setting}=sqlite or GUNICORN_WORKERS=1")
+
+
+def on_starting(server):
+    # Metrics files left by the workers of an earlier run
+    import metrics
+    metrics.REGISTRY.clear_shared()
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the collector's reach so that GC
+    # passes in the workers don't touch (and copy) the shared pages
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Connect the user database before the worker accepts requests
+    from app import open_connections
+    open_connections(worker.app.wsgi())
+
+
+def worker_exit(server, worker):
+    # Record the last counts; the other workers keep reporting them
+    import metrics
+    metrics.REGISTRY.flush()
@@ -0,0 +1,24 @@
+"""requests transport adapter that traces outgoing calls.
+
+Kept out of ``google_oauth`` so that importing it does not pull in
+``requests``; sessions are only built once Google login is first used.
+"""
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+import tracing
+
+
+class TracedHTTPAdapter(HTTPAdapter):
+    """Wraps each outgoing request in a span and sends its ``traceparent``"""
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        with tracing.span(f"http {request.method}", host=url.netloc, path=url.path) as span:
+            traceparent = span.traceparent()
+            if traceparent:
+                request.headers["traceparent"] = traceparent
+            response = super().send(request, **kwargs)
+            span.set("status_code", response.status_code)
+            return response
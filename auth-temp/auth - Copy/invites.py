@@ -0,0 +1,38 @@
+import csv
+import io
+import re
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def parse_emails(source):
+    """Read addresses from a list, a newline/comma separated string or a CSV stream.
+
+    For CSV input with a header row only the ``email`` column is used,
+    otherwise every cell is taken as an address. Returns ``(emails, invalid)``
+    with duplicates removed (case-insensitively) and input order preserved.
+    """
+    if isinstance(source, (list, tuple)):
+        rows = [[value] for value in source]
+    else:
+        if isinstance(source, (bytes, str)):
+            source = io.StringIO(source.decode("utf-8-sig") if isinstance(source, bytes) else source)
+        rows = list(csv.reader(source))
+        if rows and "email" in [cell.strip().lower() for cell in rows[0]]:
+            column = [cell.strip().lower() for cell in rows[0]].index("email")
+            rows = [row[column:column + 1] for row in rows[1:]]
+        else:
+            rows = [[cell] for row in rows for cell in row]
+
+    emails, invalid, seen = [], [], set()
+    for row in rows:
+        value = str(row[0]).strip() if row else ""
+        if not value:
+            continue
+        if not EMAIL_RE.match(value):
+            invalid.append(value)
+            continue
+        if value.lower() not in seen:
+            seen.add(value.lower())
+            emails.append(value)
+    return emails, invalid
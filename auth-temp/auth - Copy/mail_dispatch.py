@@ -0,0 +1,305 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import metrics
+import tracing
+
+SMTP_SEND_SECONDS = metrics.histogram(
+    "smtp_send_seconds", "Time to hand one message to an SMTP relay", ["relay", "result"]
+)
+MAIL_JOBS = metrics.counter("mail_jobs", "Mail jobs by final state", ["state"])
+
+
+class SQLiteJobStatusStore:
+    """Job statuses in a SQLite file, so any worker can answer ``/otp-status``.
+
+    The job is only delivered by the process that queued it; this is where
+    that process publishes its progress. Rows older than ``retention``
+    seconds are purged periodically.
+    """
+
+    def __init__(self, path, retention=3600, purge_interval=60):
+        self.path = path
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS mail_jobs ("
+            "job_id TEXT PRIMARY KEY, state TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "error TEXT, relay TEXT, updated REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def put(self, job_id, status):
+        conn = self._connect()
+        now = time.time()
+        if now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            conn.execute("DELETE FROM mail_jobs WHERE updated < ?", (now - self.retention,))
+        conn.execute(
+            "INSERT OR REPLACE INTO mail_jobs (job_id, state, attempts, error, relay, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, status.get("state"), status.get("attempts", 0), status.get("error"),
+             status.get("relay"), status["updated"]),
+        )
+
+    def get(self, job_id):
+        row = self._connect().execute(
+            "SELECT state, attempts, error, relay, updated FROM mail_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"state": row[0], "attempts": row[1], "error": row[2], "relay": row[3], "updated": row[4]}
+
+
+def create_status_store(backend=None, path=None):
+    """Build the job status store selected by ``MAIL_STATUS_STORE``.
+
+    ``memory`` (None here) keeps statuses in the dispatcher only, which is
+    enough for a single process; ``sqlite`` shares them between workers.
+    """
+    backend = backend or "memory"
+    if backend == "memory":
+        return None
+    if backend == "sqlite":
+        return SQLiteJobStatusStore(path or "mail_jobs.db")
+    raise ValueError(f"Unknown mail status store: {backend}")
+
+
+class MailDispatcher:
+    """Background sender for outgoing mail.
+
+    Messages are put on a bounded queue and delivered by a small pool of
+    worker threads. Each send borrows a connection from the relay chosen by
+    the ``RelayPool`` (see ``smtp_relays``) and hands it back afterwards, so
+    connections are reused until they have been idle for the pool's
+    ``idle_timeout`` or the server drops them. A failed send is retried on
+    another relay straight away, and with exponential backoff once every
+    relay has failed it. A monitor thread closes idle connections and probes
+    relays that were taken out of rotation.
+
+    To try it locally, run ``python smtp_sink.py`` and point the app at it
+    with ``MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=False``.
+
+    Without a ``relays`` pool one is built from the app config the first time
+    a worker sends, so Flask-Mail is only imported by processes that send.
+
+    Statuses are kept in memory for ``wait``; with a ``status_store`` every
+    change is also written there, and ``status`` falls back to it for jobs
+    queued by another process.
+    """
+
+    FINAL_STATES = ("sent", "failed", "rejected")
+
+    def __init__(self, app, relays=None, workers=2, queue_size=1000, max_attempts=3,
+                 backoff=1.0, status_limit=10000, status_store=None):
+        self.app = app
+        self.relays = relays
+        self.status_store = status_store
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.status_limit = status_limit
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._statuses = OrderedDict()
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._threads = []
+        self._monitor = None
+        self._stopping = threading.Event()
+        self._pid = None
+
+    def start(self):
+        """Start the worker threads (called lazily so forked workers get their own)"""
+        with self._lock:
+            self._pid = os.getpid()
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for i in range(self.workers - len(self._threads)):
+                thread = threading.Thread(
+                    target=self._run, name=f"mail-dispatch-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            if self._monitor is None or not self._monitor.is_alive():
+                self._stopping.clear()
+                self._monitor = threading.Thread(target=self._watch, name="mail-relay-monitor", daemon=True)
+                self._monitor.start()
+
+    def submit(self, msg, block=False, timeout=None):
+        """Queue a message and return its job id, or None if the queue is full.
+
+        With ``block=True`` the caller waits up to ``timeout`` seconds for room
+        in the queue instead of being rejected straight away.
+        """
+        if self._pid != os.getpid():
+            self.start()
+        job_id = uuid.uuid4().hex
+        self._set_status(job_id, state="queued", attempts=0, error=None)
+        try:
+            # The send is traced as part of the request that queued it
+            self._queue.put((job_id, msg, tracing.current_span()), block=block, timeout=timeout)
+        except queue.Full:
+            self._set_status(job_id, state="rejected", error="queue full")
+            MAIL_JOBS.inc("rejected")
+            return None
+        return job_id
+
+    def status(self, job_id):
+        """Return the delivery status dict for a job, or None if unknown"""
+        with self._lock:
+            status = self._statuses.get(job_id)
+            if status:
+                return dict(status)
+        if self.status_store is not None:
+            return self.status_store.get(job_id)
+        return None
+
+    def wait(self, job_ids, timeout=None):
+        """Block until every job is sent or failed; return ``{job_id: status}``"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._done:
+            while True:
+                statuses = {job_id: self._statuses.get(job_id) for job_id in job_ids}
+                if all(s is None or s["state"] in self.FINAL_STATES for s in statuses.values()):
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._done.wait(remaining)
+            return {job_id: dict(s) if s else None for job_id, s in statuses.items()}
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def relay_status(self):
+        """Health, latency and load of each relay (empty until the first send)"""
+        return self.relays.status() if self.relays is not None else []
+
+    def shutdown(self, timeout=5):
+        """Stop the workers after the messages already queued are sent"""
+        threads, self._threads = self._threads, []
+        deadline = time.monotonic() + timeout
+        for _ in threads:
+            try:
+                self._queue.put((None, None, None), timeout=timeout)
+            except queue.Full:
+                break
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        self._stopping.set()
+        if self.relays is not None:
+            self.relays.close()
+
+    def _set_status(self, job_id, **fields):
+        with self._lock:
+            status = self._statuses.setdefault(job_id, {})
+            status.update(fields, updated=time.time())
+            self._statuses.move_to_end(job_id)
+            while len(self._statuses) > self.status_limit:
+                self._statuses.popitem(last=False)
+            if status.get("state") in self.FINAL_STATES:
+                self._done.notify_all()
+            status = dict(status)
+        if self.status_store is not None:
+            try:
+                self.status_store.put(job_id, status)
+            except Exception:
+                self.app.logger.exception("Could not publish status of mail job %s", job_id)
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                job_id, msg, parent = self._queue.get()
+                if job_id is None:
+                    break
+                self._deliver(job_id, msg, parent)
+
+    def _watch(self):
+        with self.app.app_context():
+            while not self._stopping.is_set():
+                try:
+                    interval = self.relays.maintain() if self.relays is not None else 1.0
+                except Exception:
+                    self.app.logger.exception("SMTP relay maintenance failed")
+                    interval = 1.0
+                self._stopping.wait(interval)
+
+    def _deliver(self, job_id, msg, parent=None):
+        relays = self._relays()
+        tried = []
+        for attempt in range(1, self.max_attempts + 1):
+            self._set_status(job_id, state="sending", attempts=attempt)
+            relay = conn = None
+            start = time.perf_counter()
+            try:
+                with tracing.span("smtp.deliver", parent=parent, attempt=attempt) as span:
+                    relay, conn = relays.acquire(exclude=tried)
+                    span.set("relay", relay.name)
+                    start = time.perf_counter()
+                    if conn is None:
+                        with tracing.span("smtp.connect"):
+                            conn = relay.connect()
+                    with tracing.span("smtp.send"):
+                        conn.send(msg)
+                elapsed = time.perf_counter() - start
+                relays.release(relay, conn, elapsed)
+                SMTP_SEND_SECONDS.observe(elapsed, relay.name, "ok")
+                self._set_status(job_id, state="sent", error=None, relay=relay.name)
+                MAIL_JOBS.inc("sent")
+                return
+            except Exception as e:
+                if relay is None:
+                    self._set_status(job_id, error=str(e))
+                    break
+                elapsed = time.perf_counter() - start
+                relays.release(relay, conn, elapsed, error=e)
+                SMTP_SEND_SECONDS.observe(elapsed, relay.name, "error")
+                self._set_status(job_id, error=str(e), relay=relay.name)
+                tried.append(relay)
+                # Fail over at once while there is a relay this message has not tried
+                if attempt < self.max_attempts and not relays.has_alternative(tried):
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+        self._set_status(job_id, state="failed")
+        MAIL_JOBS.inc("failed")
+        self.app.logger.error("Giving up on mail job %s: %s",
+                              job_id, self.status(job_id)["error"])
+
+    def _relays(self):
+        if self.relays is None:
+            with self._lock:
+                if self.relays is None:
+                    from smtp_relays import create_relay_pool
+                    self.relays = create_relay_pool(self.app)
+        return self.relays
+
+
+def create_dispatcher(app, relays=None):
+    """Build a dispatcher from the ``MAIL_*`` settings in ``app.config``"""
+    dispatcher = MailDispatcher(
+        app,
+        relays,
+        workers=app.config.get("MAIL_WORKERS", 2),
+        queue_size=app.config.get("MAIL_QUEUE_SIZE", 1000),
+        max_attempts=app.config.get("MAIL_MAX_ATTEMPTS", 3),
+        backoff=app.config.get("MAIL_RETRY_BACKOFF", 1.0),
+        status_store=create_status_store(app.config.get("MAIL_STATUS_STORE"),
+                                         app.config.get("MAIL_STATUS_STORE_PATH")),
+    )
+    atexit.register(dispatcher.shutdown)
+    return dispatcher
@@ -0,0 +1,340 @@
+"""In-process metrics with Prometheus text exposition.
+
+Counters and histograms are aggregated per OS thread: every thread writes to
+its own shard without taking a lock and ``expose()`` sums the shards when
+``/metrics`` is scraped. Shards are keyed on the OS thread, so gevent
+greenlets (which share one thread) share a shard instead of creating one each.
+
+Under gunicorn the workers share one socket, so a scrape reaches whichever
+worker accepts it. ``REGISTRY.share(directory)`` makes every process write
+its values to ``<directory>/<pid>.json`` (every few seconds, and before it
+answers a scrape) and makes ``expose()`` merge all the files: counters and
+histograms are summed, including those of workers that have exited, so
+they stay monotonic; gauges are reported per live worker with a ``pid``
+label. Clear the directory when the server starts (``gunicorn.conf.py``
+does).
+"""
+import _thread
+import bisect
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# gevent replaces get_ident with a per-greenlet id; keep the real thread id
+_monkey = sys.modules.get("gevent.monkey")
+_thread_id = _monkey.get_original("_thread", "get_ident") if _monkey else _thread.get_ident
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._shards = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        thread_id = _thread_id()
+        shard = self._shards.get(thread_id)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.setdefault(thread_id, {})
+        return shard
+
+    def reset(self):
+        """Forget every value, e.g. in a process forked from one that recorded some"""
+        self._shards = {}
+        self._lock = threading.Lock()
+
+    def _check(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return labels
+
+    def _snapshots(self):
+        with self._lock:
+            shards = list(self._shards.values())
+        return [dict(shard) for shard in shards]
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. ``OTP_EVENTS.inc("issued")``"""
+
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        shard = self._shard()
+        value = shard.get(labels)
+        if value is None:
+            self._check(labels)
+            value = 0
+        shard[labels] = value + amount
+
+    def value(self, *labels):
+        key = self._check(labels)
+        return sum(shard.get(key, 0) for shard in self._snapshots())
+
+    def collect(self):
+        totals = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                self.merge(totals, key, value)
+        return totals
+
+    @staticmethod
+    def merge(totals, key, value):
+        totals[key] = totals.get(key, 0) + value
+
+    def samples(self, totals):
+        for key in sorted(totals):
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(totals[key])}"
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (seconds by default) in fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # [count per bucket (last one is +Inf), sum]
+            entry = shard[self._check(labels)] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels):
+        key = self._check(labels)
+        return sum(sum(shard[key][0]) for shard in self._snapshots() if key in shard)
+
+    def collect(self):
+        totals = {}
+        for shard in self._snapshots():
+            for key, entry in shard.items():
+                self.merge(totals, key, entry)
+        return totals
+
+    @staticmethod
+    def merge(totals, key, entry):
+        counts, total = entry
+        merged = totals.setdefault(key, [[0] * len(counts), 0.0])
+        merged[0] = [a + b for a, b in zip(merged[0], counts)]
+        merged[1] += total
+
+    def samples(self, totals):
+        for key in sorted(totals):
+            counts, total = totals[key]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Gauge(_Metric):
+    """Current value read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._functions = {}
+
+    def set_function(self, function, *labels):
+        self._functions[self._check(labels)] = function
+
+    def collect(self):
+        values = {}
+        for key, function in self._functions.items():
+            try:
+                values[key] = function()
+            except Exception:
+                continue
+        return values
+
+    def samples(self, values):
+        for key in sorted(values):
+            # Merged from several processes the key ends with the worker's pid
+            names = self.labelnames + ("pid",) if len(key) > len(self.labelnames) else self.labelnames
+            yield f"{self.name}{_format_labels(names, key)} {_format_value(values[key])}"
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self.directory = None
+        self.interval = 5.0
+        self._writer_pid = None
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered differently")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def share(self, directory, interval=5.0):
+        """Aggregate with the other processes writing to ``directory``"""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.interval = interval
+        if self._writer_pid != os.getpid():
+            self._start_writer()
+
+    def _start_writer(self):
+        self._writer_pid = pid = os.getpid()
+        threading.Thread(target=self._write_loop, args=(pid,), name="metrics-writer", daemon=True).start()
+
+    def _write_loop(self, pid):
+        while self._writer_pid == pid:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def _after_fork(self):
+        # The parent's values are in its own file; a worker starts from zero
+        for metric in self._metrics.values():
+            metric.reset()
+        if self.directory is not None:
+            self._start_writer()
+
+    def collect(self):
+        """This process's values, ``{metric name: {labels: value}}``"""
+        return {name: metric.collect() for name, metric in self._metrics.items()}
+
+    def flush(self, collected=None):
+        """Write this process's values to the shared directory, if there is one"""
+        if self.directory is None:
+            return
+        collected = self.collect() if collected is None else collected
+        snapshot = {"pid": os.getpid(),
+                    "metrics": {name: [[list(key), value] for key, value in values.items()]
+                                for name, values in collected.items()}}
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(snapshot, f)
+        os.replace(path + ".tmp", path)
+
+    def _merge_shared(self):
+        merged = {name: {} for name in self._metrics}
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pid = snapshot["pid"]
+            live = None
+            for name, rows in snapshot["metrics"].items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in rows:
+                    key = tuple(key)
+                    if isinstance(metric, Gauge):
+                        if live is None:
+                            live = pid == os.getpid() or _alive(pid)
+                        if live:
+                            merged[name][key + (pid,)] = value
+                    else:
+                        metric.merge(merged[name], key, value)
+        return merged
+
+    def expose(self):
+        """Render every metric in the Prometheus text format (version 0.0.4)"""
+        collected = self.collect()
+        if self.directory is not None:
+            # Flush first: the next scrape may be served by another worker,
+            # and it must not see this one's counters lower than this scrape
+            self.flush(collected)
+            collected = self._merge_shared()
+        lines = []
+        for metric in self._metrics.values():
+            lines += metric.header()
+            lines += metric.samples(collected[metric.name])
+        return "\n".join(lines) + "\n"
+
+    def clear_shared(self):
+        """Remove every process's file, e.g. when the server (re)starts"""
+        if self.directory is None:
+            return
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = Registry()
+os.register_at_fork(after_in_child=REGISTRY._after_fork)
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+gauge = REGISTRY.gauge
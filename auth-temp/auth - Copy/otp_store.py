@@ -0,0 +1,283 @@
+import hashlib
+import heapq
+import hmac
+import os
+import sqlite3
+import threading
+import time
+
+
+class OTPHasher:
+    """Keyed digests of OTP codes, so a leaked store does not reveal live codes.
+
+    A digest is ``h1$`` + hex HMAC-SHA256 of ``email\\0otp`` under the server
+    secret; binding the email means a digest cannot be replayed for another
+    address. Without the secret a stolen digest cannot be checked against
+    guesses at all, and codes only live for minutes, so a single HMAC
+    (microseconds) replaces bcrypt (~100 ms per code). ``lib/auth-utils.ts``
+    produces the same format.
+    """
+
+    PREFIX = "h1$"
+
+    def __init__(self, secret):
+        if isinstance(secret, str):
+            secret = secret.encode()
+        self._key = secret
+
+    def digest(self, email, otp):
+        message = f"{email.lower()}\0{otp}".encode()
+        return self.PREFIX + hmac.new(self._key, message, hashlib.sha256).hexdigest()
+
+    def matches(self, stored, email, otp):
+        """Constant-time check of ``otp`` against a stored digest.
+
+        Rows written before digests were introduced hold the plain code; they
+        are still accepted until they expire (at most one OTP TTL after the
+        upgrade).
+        """
+        if stored.startswith(self.PREFIX):
+            return hmac.compare_digest(stored, self.digest(email, otp))
+        return hmac.compare_digest(stored.encode(), otp.encode())
+
+
+class OTPStore:
+    """Interface for OTP storage backends.
+
+    Entries are keyed by email, stripped and lowercased so every spelling of
+    an address shares one code, and hold a digest of the code (see
+    ``OTPHasher``) plus an absolute expiry timestamp (``time.time()``
+    seconds). Expired entries are never returned.
+    """
+
+    def __init__(self, hasher=None):
+        # Without a configured secret the digests only have to agree within
+        # this process, so a random key will do
+        self.hasher = hasher or OTPHasher(os.urandom(32))
+
+    @staticmethod
+    def key(email):
+        return email.strip().lower()
+
+    def put(self, email, otp, ttl):
+        raise NotImplementedError
+
+    def put_many(self, entries, ttl):
+        """Store ``(email, otp)`` pairs in one operation"""
+        for email, otp in entries:
+            self.put(email, otp, ttl)
+
+    def get(self, email):
+        """Return ``(digest, expiry)`` for a live entry, or None"""
+        raise NotImplementedError
+
+    def consume(self, email, otp):
+        """Atomically delete the entry if ``otp`` matches and it is still live"""
+        raise NotImplementedError
+
+    def delete(self, email):
+        raise NotImplementedError
+
+    def evict_expired(self):
+        """Drop expired entries and return how many were removed"""
+        raise NotImplementedError
+
+    def size(self):
+        """Number of live (unexpired) entries"""
+        raise NotImplementedError
+
+
+class MemoryOTPStore(OTPStore):
+    """Single-process store backed by a dict and a min-heap of expiries.
+
+    The heap may hold stale items for codes that were re-issued or consumed;
+    they are skipped when popped, so eviction costs O(expired log n) and never
+    scans live entries.
+    """
+
+    def __init__(self, hasher=None):
+        super().__init__(hasher)
+        self._entries = {}
+        self._expiries = []
+        self._lock = threading.Lock()
+
+    def put(self, email, otp, ttl):
+        now = time.time()
+        expiry = now + ttl
+        email = self.key(email)
+        digest = self.hasher.digest(email, otp)
+        with self._lock:
+            self._evict(now)
+            self._entries[email] = (digest, expiry)
+            heapq.heappush(self._expiries, (expiry, email))
+
+    def put_many(self, entries, ttl):
+        now = time.time()
+        expiry = now + ttl
+        digests = [(self.key(email), self.hasher.digest(self.key(email), otp)) for email, otp in entries]
+        with self._lock:
+            self._evict(now)
+            for email, digest in digests:
+                self._entries[email] = (digest, expiry)
+                self._expiries.append((expiry, email))
+            heapq.heapify(self._expiries)
+
+    def get(self, email):
+        email = self.key(email)
+        with self._lock:
+            self._evict(time.time())
+            return self._entries.get(email)
+
+    def consume(self, email, otp):
+        email = self.key(email)
+        with self._lock:
+            self._evict(time.time())
+            entry = self._entries.get(email)
+            if entry is None or not self.hasher.matches(entry[0], email, otp):
+                return False
+            del self._entries[email]
+            return True
+
+    def delete(self, email):
+        with self._lock:
+            self._entries.pop(self.key(email), None)
+
+    def evict_expired(self):
+        with self._lock:
+            return self._evict(time.time())
+
+    def size(self):
+        with self._lock:
+            self._evict(time.time())
+            return len(self._entries)
+
+    def _evict(self, now):
+        removed = 0
+        while self._expiries and self._expiries[0][0] <= now:
+            expiry, email = heapq.heappop(self._expiries)
+            entry = self._entries.get(email)
+            if entry is not None and entry[1] == expiry:
+                del self._entries[email]
+                removed += 1
+        # Re-issued codes leave stale heap items behind; compact once they
+        # outnumber the live entries so the heap stays proportional to them.
+        if len(self._expiries) > 2 * len(self._entries) + 64:
+            self._expiries = [(e[1], k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiries)
+        return removed
+
+
+class SQLiteOTPStore(OTPStore):
+    """Store shared by every worker process on the host via a WAL-mode SQLite file.
+
+    Each thread gets its own connection. Consumption runs inside a
+    ``BEGIN IMMEDIATE`` transaction so a code can only be redeemed once even
+    when two workers race on it.
+    """
+
+    def __init__(self, path, evict_interval=30, hasher=None):
+        super().__init__(hasher)
+        self.path = path
+        self.evict_interval = evict_interval
+        self._local = threading.local()
+        self._last_evict = 0.0
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS otps ("
+            "email TEXT PRIMARY KEY, otp TEXT NOT NULL, expiry REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS otps_expiry ON otps (expiry)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        # Connections must not cross a fork, so they are tied to the pid
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _maybe_evict(self, now):
+        if now - self._last_evict >= self.evict_interval:
+            self._last_evict = now
+            self.evict_expired()
+
+    def put(self, email, otp, ttl):
+        now = time.time()
+        self._maybe_evict(now)
+        email = self.key(email)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO otps (email, otp, expiry) VALUES (?, ?, ?)",
+            (email, self.hasher.digest(email, otp), now + ttl),
+        )
+
+    def put_many(self, entries, ttl):
+        now = time.time()
+        self._maybe_evict(now)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO otps (email, otp, expiry) VALUES (?, ?, ?)",
+                [(self.key(email), self.hasher.digest(self.key(email), otp), now + ttl)
+                 for email, otp in entries],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, email):
+        row = self._connect().execute(
+            "SELECT otp, expiry FROM otps WHERE email = ? AND expiry > ?",
+            (self.key(email), time.time()),
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def consume(self, email, otp):
+        email = self.key(email)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT otp FROM otps WHERE email = ? AND expiry > ?", (email, time.time())
+            ).fetchone()
+            matched = row is not None and self.hasher.matches(row[0], email, otp)
+            if matched:
+                conn.execute("DELETE FROM otps WHERE email = ?", (email,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return matched
+
+    def delete(self, email):
+        self._connect().execute("DELETE FROM otps WHERE email = ?", (self.key(email),))
+
+    def evict_expired(self):
+        cursor = self._connect().execute(
+            "DELETE FROM otps WHERE expiry <= ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    def size(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM otps WHERE expiry > ?", (time.time(),)
+        ).fetchone()[0]
+
+
+def create_otp_store(backend=None, path=None, secret=None):
+    """Build the OTP store selected by ``OTP_STORE`` (``memory`` or ``sqlite``).
+
+    ``secret`` keys the code digests; every worker sharing a SQLite store
+    must use the same one.
+    """
+    backend = backend or os.getenv("OTP_STORE", "memory")
+    hasher = OTPHasher(secret) if secret else None
+    if backend == "memory":
+        return MemoryOTPStore(hasher)
+    if backend == "sqlite":
+        return SQLiteOTPStore(path or os.getenv("OTP_STORE_PATH", "otp_store.db"), hasher=hasher)
+    raise ValueError(f"Unknown OTP store backend: {backend}")
@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def parse_limit(spec):
+    """Parse ``"<count>/<seconds>"`` into ``(count, seconds)``.
+
+    Raises ``ValueError`` unless both are positive; to turn a limit off, set
+    a large count rather than 0.
+    """
+    count, _, window = spec.partition("/")
+    count, window = int(count), float(window or 60)
+    if count < 1 or window <= 0:
+        raise ValueError(f"Rate limit {spec!r} must allow at least 1 request per positive window")
+    return count, window
+
+
+class SlidingWindowLimiter:
+    """In-process sliding-window counter.
+
+    Each key keeps only the current and previous fixed-window counts; the
+    previous count is weighted by how much of it still overlaps the sliding
+    window. Memory per key is constant, keys are kept in LRU order so idle
+    ones are dropped from the front, and at most ``max_keys`` are tracked.
+    """
+
+    def __init__(self, limit, window, max_keys=100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key):
+        """Record an attempt; return ``(allowed, retry_after_seconds)``"""
+        now = time.time()
+        index = int(now // self.window)
+        with self._lock:
+            self._evict_idle(index)
+            window, previous, current = self._counters.pop(key, (index, 0, 0))
+            if window != index:
+                previous = current if window == index - 1 else 0
+                current = 0
+            allowed, retry_after = _estimate(self.limit, self.window, now, index, previous, current)
+            if allowed:
+                current += 1
+            self._counters[key] = (index, previous, current)
+            return allowed, retry_after
+
+    def reset(self, key):
+        with self._lock:
+            self._counters.pop(key, None)
+
+    def size(self):
+        return len(self._counters)
+
+    def _evict_idle(self, index):
+        # Keys untouched for two windows contribute nothing to the estimate
+        while self._counters:
+            key, (window, _, _) = next(iter(self._counters.items()))
+            if window > index - 2 and len(self._counters) < self.max_keys:
+                break
+            del self._counters[key]
+
+
+class SQLiteRateLimiter:
+    """Sliding-window counter kept in a SQLite file shared by every worker.
+
+    Uses the same two-window estimate as ``SlidingWindowLimiter``; each hit is
+    one ``BEGIN IMMEDIATE`` transaction, and idle rows are purged periodically.
+    """
+
+    def __init__(self, path, name, limit, window, purge_interval=60):
+        self.path = path
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "name TEXT NOT NULL, key TEXT NOT NULL, window INTEGER NOT NULL, "
+            "previous INTEGER NOT NULL, current INTEGER NOT NULL, "
+            "PRIMARY KEY (name, key))"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, key):
+        now = time.time()
+        index = int(now // self.window)
+        conn = self._connect()
+        if now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            conn.execute(
+                "DELETE FROM rate_limits WHERE name = ? AND window <= ?",
+                (self.name, index - 2),
+            )
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window, previous, current FROM rate_limits WHERE name = ? AND key = ?",
+                (self.name, key),
+            ).fetchone()
+            window, previous, current = row or (index, 0, 0)
+            if window != index:
+                previous = current if window == index - 1 else 0
+                current = 0
+            allowed, retry_after = _estimate(self.limit, self.window, now, index, previous, current)
+            if allowed:
+                current += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (name, key, window, previous, current) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.name, key, index, previous, current),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, retry_after
+
+    def reset(self, key):
+        self._connect().execute(
+            "DELETE FROM rate_limits WHERE name = ? AND key = ?", (self.name, key)
+        )
+
+    def size(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM rate_limits WHERE name = ?", (self.name,)
+        ).fetchone()[0]
+
+
+def _estimate(limit, window, now, index, previous, current):
+    start = index * window
+    overlap = 1 - (now - start) / window
+    if previous * overlap + current < limit:
+        return True, 0
+    remaining = start + window - now
+    if current < limit:
+        # Wait until enough of the previous window has slid out
+        needed = (previous * overlap + current - limit + 1) / previous * window
+        wait = min(needed, remaining)
+    else:
+        # The current window becomes the previous one and must slide out in turn
+        wait = remaining + (current - limit + 1) / current * window
+    return False, max(1, int(wait + 0.999))
+
+
+def create_limiter(name, spec, backend=None, path=None):
+    """Build a limiter for ``spec`` on the backend selected by ``RATE_LIMIT_STORE``"""
+    limit, window = parse_limit(spec)
+    backend = backend or os.getenv("RATE_LIMIT_STORE", "memory")
+    if backend == "memory":
+        return SlidingWindowLimiter(limit, window)
+    if backend == "sqlite":
+        path = path or os.getenv("RATE_LIMIT_STORE_PATH", "rate_limits.db")
+        return SQLiteRateLimiter(path, name, limit, window)
+    raise ValueError(f"Unknown rate limit backend: {backend}")
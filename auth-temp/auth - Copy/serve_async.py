@@ -0,0 +1,44 @@
+"""Serve the auth service on a gevent event loop.
+
+Every request runs as a greenlet on a single event loop. The libraries the
+handlers block on (requests for the OAuth token exchange and certificate
+fetch, smtplib under Flask-Mail) are made cooperative by monkey-patching, so
+a request waiting on Google or the mail relay yields to the others instead of
+pinning an OS thread. One process can then keep hundreds of logins in flight.
+
+    python serve_async.py --port 5000
+
+or under gunicorn, one event loop per worker::
+
+    gunicorn -k gevent --worker-connections 1000 serve_async:app
+"""
+from gevent import monkey
+
+# Must run before anything imports socket, ssl or threading
+monkey.patch_all()
+
+import argparse  # noqa: E402
+
+from gevent.pool import Pool  # noqa: E402
+from gevent.pywsgi import WSGIServer  # noqa: E402
+
+from app import open_connections  # noqa: E402
+from wsgi import app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--quiet", action="store_true", help="disable the access log")
+    args = parser.parse_args()
+    open_connections(app)
+    server = WSGIServer((args.host, args.port), app, spawn=Pool(args.max_connections),
+                        log=None if args.quiet else "default")
+    print(f"Serving on http://{args.host}:{args.port} (gevent)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
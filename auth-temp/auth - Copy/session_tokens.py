@@ -0,0 +1,109 @@
+"""HS256 JWTs compatible with ``generateToken``/``verifyToken`` in lib/auth-utils.ts.
+
+Both services sign with the same ``JWT_SECRET`` and carry the user in an
+``auth_token`` cookie holding ``{"id", "email", "name", "iat", "exp"}``, where
+``id`` is the ``users.id`` UUID and ``email`` is lowercased, so a login on
+either side is accepted by the other. The app still loads the user named by
+a token (through its cache) to refuse deactivated accounts.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+
+COOKIE_NAME = "auth_token"
+DEFAULT_TTL = 7 * 24 * 3600  # JWT_EXPIRES_IN = '7d'
+
+_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class TokenCodec:
+    """Signs and verifies session tokens.
+
+    The HMAC key schedule is computed once and copied per token, and recently
+    verified tokens are memoised (until they expire) so a user's repeated
+    requests skip the signature check and JSON decoding.
+    """
+
+    def __init__(self, secret, ttl=DEFAULT_TTL, memo_size=4096):
+        self.ttl = ttl
+        self.memo_size = memo_size
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sign(self, signing_input):
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def issue(self, user):
+        """Return a token for ``user`` valid for ``ttl`` seconds"""
+        now = int(time.time())
+        payload = {"id": user.get_id(), "email": user.email, "name": user.name, "iat": now, "exp": now + self.ttl}
+        signing_input = _HEADER + b"." + _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def verify(self, token):
+        """Return the token's payload, or None if it is malformed, forged or expired"""
+        now = time.time()
+        with self._lock:
+            payload = self._memo.get(token)
+            if payload is not None:
+                if now < payload["exp"]:
+                    self._memo.move_to_end(token)
+                    return payload
+                del self._memo[token]
+        payload = self._decode(token, now)
+        if payload is not None:
+            with self._lock:
+                self._memo[token] = payload
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return payload
+
+    def _decode(self, token, now):
+        try:
+            raw = token.encode("ascii")
+            signing_input, _, signature = raw.rpartition(b".")
+            header, _, body = signing_input.partition(b".")
+            if not hmac.compare_digest(self._sign(signing_input), _b64decode(signature)):
+                return None
+            if json.loads(_b64decode(header)).get("alg") != "HS256":
+                return None
+            payload = json.loads(_b64decode(body))
+        except (ValueError, TypeError, AttributeError):
+            return None
+        # jsonwebtoken rejects tokens at or past exp and before nbf
+        if not isinstance(payload, dict) or not payload.get("id") or not payload.get("email"):
+            return None
+        if not isinstance(payload.get("exp"), (int, float)) or now >= payload["exp"]:
+            return None
+        if isinstance(payload.get("nbf"), (int, float)) and now < payload["nbf"]:
+            return None
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+    def __len__(self):
+        return len(self._memo)
+
+
+def create_codec(secret, ttl=DEFAULT_TTL, memo_size=4096):
+    """Return a codec, or None when ``JWT_SECRET`` is unset (signed-session logins only)"""
+    if not secret:
+        return None
+    return TokenCodec(secret, ttl, memo_size)
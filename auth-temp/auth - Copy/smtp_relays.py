@@ -0,0 +1,341 @@
+"""Weighted pool of SMTP relays with connection limits and health checks.
+
+Relays come from ``MAIL_RELAYS``, a JSON list such as::
+
+    [{"name": "gmail", "server": "smtp.gmail.com", "port": 587, "weight": 3, "max_connections": 4},
+     {"name": "backup", "server": "mail.example.com", "port": 2525, "username": "...", "password": "..."}]
+
+Any ``MAIL_*`` setting a relay leaves out (TLS, credentials, ...) is taken
+from the app config; without ``MAIL_RELAYS`` the single ``MAIL_SERVER`` is
+the only relay.
+
+Sends are spread over the healthy relays by smooth weighted round-robin,
+never holding more than ``max_connections`` connections to one relay. A
+relay is taken out of rotation after ``failure_threshold`` consecutive
+failures, or when its average send latency passes ``slow_threshold``. It is
+probed (connect and ``NOOP``) after a cooldown that doubles each time it
+trips again. A relay that answers the probe rejoins on probation: it gets
+the lowest weight, its old latency average stands, and the first failed or
+slow send trips it again at once. After ``probation_sends`` good sends it
+is fully back, with the latency of those sends. If no relay is healthy the
+unhealthy ones are still tried rather than failing every login outright.
+"""
+import json
+import threading
+import time
+
+import metrics
+
+RELAY_HEALTHY = metrics.gauge("smtp_relay_healthy", "1 if the relay is in rotation, 0 if it is cooling down", ["relay"])
+RELAY_LATENCY = metrics.gauge("smtp_relay_latency_seconds", "Moving average of send latency per relay", ["relay"])
+RELAY_CONNECTIONS = metrics.gauge("smtp_relay_connections", "Connections to the relay in use by mail workers", ["relay"])
+RELAY_TRIPS = metrics.counter("smtp_relay_trips", "Times a relay was taken out of rotation", ["relay", "reason"])
+
+
+class Relay:
+    """One SMTP relay: its Flask-Mail state, idle connections and health"""
+
+    def __init__(self, name, mail, weight=1, max_connections=2):
+        self.name = name
+        self.mail = mail
+        self.weight = weight
+        self.max_connections = max_connections
+        self.in_use = 0
+        self.idle = []  # [(connection, returned at)]
+        self.healthy = True
+        self.reason = None
+        self.latency = None
+        self.samples = 0
+        self.failures = 0
+        self.streak = 0
+        self.trips = 0
+        self.retry_at = 0.0
+        self.probing = False
+        self.probation = 0  # good sends still needed after a probe
+        self.trial = []  # latencies of the sends made on probation
+        self.sent = 0
+        self.failed = 0
+        self._current = 0  # smooth weighted round-robin state
+
+    def connect(self):
+        """Open a new connection to this relay (Flask-Mail's ``mail.connect()`` uses the app's server)"""
+        from flask_mail import Connection
+        return Connection(self.mail).__enter__()
+
+    def status(self):
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "probation": self.probation,
+            "reason": self.reason,
+            "latency": self.latency,
+            "weight": self.weight,
+            "connections": self.in_use,
+            "max_connections": self.max_connections,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retry_in": max(0.0, self.retry_at - time.monotonic()) if not self.healthy else None,
+        }
+
+
+class RelayPool:
+    """Hands out relay connections to the mail workers and tracks relay health"""
+
+    def __init__(self, relays, failure_threshold=3, slow_threshold=5.0, cooldown=10.0,
+                 max_cooldown=300.0, idle_timeout=30, latency_alpha=0.2, min_samples=3,
+                 probation_sends=5, logger=None):
+        if not relays:
+            raise ValueError("At least one SMTP relay is required")
+        self.relays = list(relays)
+        self.failure_threshold = failure_threshold
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.idle_timeout = idle_timeout
+        self.latency_alpha = latency_alpha
+        self.min_samples = min_samples
+        self.probation_sends = probation_sends
+        self.logger = logger
+        self._cond = threading.Condition()
+
+    def acquire(self, exclude=(), timeout=None):
+        """Return ``(relay, connection or None)``, waiting for a free connection slot.
+
+        Relays in ``exclude`` (the ones a message already failed on) are only
+        used when no other healthy relay exists.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                relay = self._pick(exclude)
+                if relay is not None:
+                    relay.in_use += 1
+                    conn = relay.idle.pop()[0] if relay.idle else None
+                    return relay, conn
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No SMTP relay connection available")
+                self._cond.wait(remaining)
+
+    def has_alternative(self, exclude):
+        """Whether a healthy relay outside ``exclude`` is available to fail over to"""
+        with self._cond:
+            return any(r.healthy and r not in exclude for r in self.relays)
+
+    def _pick(self, exclude):
+        tiers = (
+            [r for r in self.relays if r.healthy and r not in exclude],
+            [r for r in self.relays if r.healthy],
+            self.relays,
+        )
+        for tier in tiers:
+            if not tier:
+                continue
+            # Wait for a slot in the best tier instead of spilling into a worse one
+            candidates = [r for r in tier if r.in_use < r.max_connections]
+            if not candidates:
+                return None
+            total = 0
+            best = None
+            for relay in candidates:
+                # Relays on probation only get a trickle of traffic
+                weight = 1 if relay.probation else relay.weight
+                relay._current += weight
+                total += weight
+                if best is None or relay._current > best._current:
+                    best = relay
+            best._current -= total
+            return best
+        return None
+
+    def release(self, relay, conn, elapsed, error=None):
+        """Return a connection after a send; ``error`` is the exception if it failed"""
+        close = []
+        with self._cond:
+            relay.in_use -= 1
+            if error is None:
+                relay.sent += 1
+                relay.failures = 0
+                relay.streak += 1
+                if relay.streak >= 10:
+                    relay.trips = 0
+                relay.idle.append((conn, time.monotonic()))
+                if relay.probation:
+                    close = self._on_probation(relay, elapsed)
+                else:
+                    relay.samples += 1
+                    relay.latency = elapsed if relay.latency is None else \
+                        relay.latency + self.latency_alpha * (elapsed - relay.latency)
+                    if relay.healthy and relay.samples >= self.min_samples and relay.latency > self.slow_threshold:
+                        close = self._trip(relay, f"slow ({relay.latency:.1f}s average)")
+            else:
+                relay.failed += 1
+                relay.failures += 1
+                relay.streak = 0
+                close = [conn]
+                if relay.healthy and relay.probation:
+                    close += self._trip(relay, f"failing on probation ({error})")
+                elif relay.healthy and relay.failures >= self.failure_threshold:
+                    close += self._trip(relay, f"failing ({error})")
+            self._cond.notify_all()
+        for conn in close:
+            _close(conn)
+
+    def _on_probation(self, relay, elapsed):
+        """Count a good send made on probation; returns connections to close"""
+        if elapsed > self.slow_threshold:
+            return self._trip(relay, f"slow on probation ({elapsed:.1f}s)")
+        relay.trial.append(elapsed)
+        relay.probation -= 1
+        if not relay.probation:
+            # Fully back; the average starts from what the relay does now
+            relay.latency = sum(relay.trial) / len(relay.trial)
+            relay.samples = len(relay.trial)
+            relay.trial = []
+            if self.logger:
+                self.logger.info("SMTP relay %s passed probation", relay.name)
+        return []
+
+    def _trip(self, relay, reason):
+        """Take ``relay`` out of rotation; returns its idle connections for closing"""
+        relay.healthy = False
+        relay.probation = 0
+        relay.trial = []
+        relay.reason = reason
+        relay.trips += 1
+        relay.retry_at = time.monotonic() + min(self.max_cooldown, self.cooldown * 2 ** (relay.trips - 1))
+        idle, relay.idle = relay.idle, []
+        RELAY_TRIPS.inc(relay.name, reason.split(" ", 1)[0])
+        if self.logger:
+            self.logger.warning("SMTP relay %s out of rotation: %s", relay.name, reason)
+        return [conn for conn, _ in idle]
+
+    def probe(self, relay):
+        """Connect to an unhealthy relay and put it back in rotation, on probation, if it answers"""
+        conn = None
+        try:
+            conn = relay.connect()
+            # No host when MAIL_SUPPRESS_SEND is on
+            code = conn.host.noop()[0] if conn.host is not None else 250
+            if code != 250:
+                raise RuntimeError(f"NOOP returned {code}")
+        except Exception as e:
+            with self._cond:
+                relay.probing = False
+                # Stays out of rotation with a longer cooldown
+                self._trip(relay, f"probe ({e})")
+            _close(conn)
+            return False
+        with self._cond:
+            relay.probing = False
+            relay.healthy = True
+            relay.reason = None
+            relay.failures = relay.streak = 0
+            # A NOOP says nothing about sends; they decide (see _on_probation)
+            relay.probation = max(1, self.probation_sends)
+            relay.trial = []
+            relay.idle.append((conn, time.monotonic()))
+            self._cond.notify_all()
+        if self.logger:
+            self.logger.info("SMTP relay %s back in rotation on probation", relay.name)
+        return True
+
+    def maintain(self):
+        """Probe relays whose cooldown is over and close idle connections.
+
+        Returns the seconds until the next probe is due (at most ``idle_timeout``).
+        """
+        now = time.monotonic()
+        stale, due = [], []
+        wait = self.idle_timeout
+        with self._cond:
+            for relay in self.relays:
+                fresh = []
+                for conn, returned in relay.idle:
+                    if now - returned >= self.idle_timeout:
+                        stale.append(conn)
+                    else:
+                        fresh.append((conn, returned))
+                relay.idle = fresh
+                if not relay.healthy and not relay.probing:
+                    if relay.retry_at <= now:
+                        relay.probing = True
+                        due.append(relay)
+                    else:
+                        wait = min(wait, relay.retry_at - now)
+        for conn in stale:
+            _close(conn)
+        for relay in due:
+            self.probe(relay)
+        return max(0.05, wait)
+
+    def close(self):
+        with self._cond:
+            idle = [conn for relay in self.relays for conn, _ in relay.idle]
+            for relay in self.relays:
+                relay.idle = []
+        for conn in idle:
+            _close(conn)
+
+    def status(self):
+        with self._cond:
+            return [relay.status() for relay in self.relays]
+
+    def register_metrics(self):
+        for relay in self.relays:
+            RELAY_HEALTHY.set_function(lambda r=relay: int(r.healthy), relay.name)
+            RELAY_LATENCY.set_function(lambda r=relay: r.latency or 0.0, relay.name)
+            RELAY_CONNECTIONS.set_function(lambda r=relay: r.in_use, relay.name)
+
+
+def _close(conn):
+    if conn is not None:
+        try:
+            conn.__exit__(None, None, None)
+        except Exception:
+            pass
+
+
+def relay_configs(config):
+    """Return one ``MAIL_*`` config dict per relay in ``MAIL_RELAYS``"""
+    specs = config.get("MAIL_RELAYS")
+    if isinstance(specs, str):
+        specs = json.loads(specs) if specs.strip() else None
+    if not specs:
+        specs = [{}]
+    keys = {"server": "MAIL_SERVER", "port": "MAIL_PORT", "use_tls": "MAIL_USE_TLS",
+            "use_ssl": "MAIL_USE_SSL", "username": "MAIL_USERNAME", "password": "MAIL_PASSWORD"}
+    relays = []
+    for spec in specs:
+        relay = dict(config)
+        relay.update({keys[k]: v for k, v in spec.items() if k in keys})
+        relay["name"] = spec.get("name") or f"{relay['MAIL_SERVER']}:{relay.get('MAIL_PORT', 25)}"
+        relay["weight"] = int(spec.get("weight", 1))
+        relay["max_connections"] = int(spec.get("max_connections", config.get("MAIL_WORKERS", 2)))
+        relays.append(relay)
+    return relays
+
+
+def create_relay_pool(app):
+    """Build the relay pool from ``app.config`` (imports Flask-Mail)"""
+    from flask_mail import Mail
+
+    config = app.config
+    if "mail" not in app.extensions:
+        # Messages read the default sender and encoding options from the extension
+        Mail(app)
+    relays = [
+        Relay(relay["name"], Mail().init_mail(relay, app.debug, app.testing),
+              relay["weight"], relay["max_connections"])
+        for relay in relay_configs(config)
+    ]
+    pool = RelayPool(
+        relays,
+        failure_threshold=config.get("MAIL_RELAY_FAILURES", 3),
+        slow_threshold=config.get("MAIL_RELAY_SLOW_SECONDS", 5.0),
+        cooldown=config.get("MAIL_RELAY_COOLDOWN", 10.0),
+        probation_sends=config.get("MAIL_RELAY_PROBATION", 5),
+        logger=app.logger,
+    )
+    pool.register_metrics()
+    return pool
@@ -0,0 +1,128 @@
+"""Minimal local SMTP server that accepts and keeps every message.
+
+Used to exercise the mail path without a real relay::
+
+    python smtp_sink.py --port 1025
+
+Then start the app with ``MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=False``.
+It can also be embedded (``SMTPSink(port=0).start()``) by benchmarks and load
+tests, optionally with an artificial ``delay`` per message or a ``fail_rate``.
+"""
+import argparse
+import random
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        sink = self.server.sink
+        sink.connections += 1
+        self.reply("220 smtp-sink ready")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("latin-1").strip()
+            verb = command[:4].upper()
+            if verb == "HELO":
+                self.reply("250 smtp-sink")
+            elif verb == "EHLO":
+                self.reply("250-smtp-sink")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif verb == "AUTH":
+                # Any credentials are accepted; prompt for whatever the client did not send
+                args = command.split()
+                prompts = {"PLAIN": 1, "LOGIN": 2}.get(args[1].upper() if len(args) > 1 else "", 0)
+                for _ in range(prompts - (len(args) - 2)):
+                    self.reply("334 ")
+                    self.rfile.readline()
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                sender, recipients = command[10:].strip(" <>"), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command[8:].strip(" <>"))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line == b".\r\n":
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                if sink.delay:
+                    time.sleep(sink.delay)
+                if sink.fail_rate and random.random() < sink.fail_rate:
+                    self.reply("451 Temporary failure")
+                    continue
+                sink.deliver(sender, recipients, b"".join(lines))
+                self.reply("250 Queued")
+            elif verb in ("RSET", "NOOP"):
+                if verb == "RSET":
+                    sender, recipients = None, []
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class SMTPSink:
+    """Threaded SMTP sink; ``messages`` holds ``(sender, recipients, data)`` tuples"""
+
+    def __init__(self, host="localhost", port=1025, delay=0.0, fail_rate=0.0,
+                 on_message=None):
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.on_message = on_message
+        self.messages = []
+        self.connections = 0
+        self._server = _Server((host, port), _Handler)
+        self._server.sink = self
+        self.host, self.port = self._server.server_address[:2]
+
+    def deliver(self, sender, recipients, data):
+        self.messages.append((sender, recipients, data))
+        if self.on_message:
+            self.on_message(sender, recipients, data)
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    def show(sender, recipients, data):
+        print(f"{sender} -> {', '.join(recipients)} ({len(data)} bytes)")
+
+    sink = SMTPSink(args.host, args.port, args.delay, args.fail_rate, on_message=show)
+    print(f"SMTP sink listening on {sink.host}:{sink.port}")
+    try:
+        sink._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
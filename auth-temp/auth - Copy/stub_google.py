@@ -0,0 +1,160 @@
+"""Local stand-in for Google's OAuth endpoints, for tests and benchmarks.
+
+Serves an authorization endpoint that immediately redirects back with a code,
+a token endpoint that returns an RS256-signed ID token, and a JWKS endpoint
+with a ``Cache-Control: max-age`` header::
+
+    python stub_google.py --port 8085
+
+Point the app at it with::
+
+    GOOGLE_CLIENT_ID=stub-client GOOGLE_CLIENT_SECRET=stub-secret
+    GOOGLE_AUTH_URI=http://localhost:8085/auth
+    GOOGLE_TOKEN_URI=http://localhost:8085/token
+    GOOGLE_CERTS_URL=http://localhost:8085/certs
+    GOOGLE_ISSUERS=http://localhost:8085
+    OAUTHLIB_INSECURE_TRANSPORT=1
+"""
+import argparse
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt, jwt
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64_uint(value):
+    return _b64(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        stub = self.server.stub
+        url = urlparse(self.path)
+        if url.path == "/certs":
+            stub.cert_requests += 1
+            self.send_json(stub.jwks(), {"Cache-Control": f"public, max-age={stub.max_age}"})
+        elif url.path == "/auth":
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            code = _b64(json.dumps({
+                "email": query.get("login_hint") or "stub.user@example.com",
+                "scope": query.get("scope", "openid"),
+            }).encode())
+            location = query["redirect_uri"] + "?" + urlencode({"code": code, "state": query.get("state", "")})
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        stub = self.server.stub
+        if urlparse(self.path).path != "/token":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+        if stub.delay:
+            time.sleep(stub.delay)
+        grant = json.loads(base64.urlsafe_b64decode(form["code"] + "=" * (-len(form["code"]) % 4)))
+        self.send_json({
+            "access_token": "stub-access-token",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "scope": grant["scope"],
+            "id_token": stub.id_token(grant["email"], form.get("client_id")),
+        })
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class StubGoogle:
+    """Threaded stub issuer; ``cert_requests`` counts hits on the JWKS endpoint"""
+
+    def __init__(self, host="localhost", port=8085, max_age=3600, delay=0.0,
+                 audience="stub-client"):
+        self.max_age = max_age
+        self.delay = delay
+        self.audience = audience
+        self.cert_requests = 0
+        self.key_id = "stub-key-1"
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = self._key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self._signer = crypt.RSASigner.from_string(pem, key_id=self.key_id)
+        self._server = _Server((host, port), _Handler)
+        self._server.stub = self
+        self.host, self.port = self._server.server_address[:2]
+        self.issuer = f"http://{self.host}:{self.port}"
+
+    def jwks(self):
+        numbers = self._key.public_key().public_numbers()
+        return {"keys": [{
+            "kty": "RSA", "alg": "RS256", "use": "sig", "kid": self.key_id,
+            "n": _b64_uint(numbers.n), "e": _b64_uint(numbers.e),
+        }]}
+
+    def id_token(self, email, audience=None):
+        now = int(time.time())
+        return jwt.encode(self._signer, {
+            "iss": self.issuer,
+            "aud": audience or self.audience,
+            "sub": "stub-" + email,
+            "email": email,
+            "email_verified": True,
+            "name": email.split("@")[0],
+            "iat": now,
+            "exp": now + 3600,
+        }).decode("ascii")
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--max-age", type=int, default=3600)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to stall each token exchange")
+    args = parser.parse_args()
+    stub = StubGoogle(args.host, args.port, args.max_age, args.delay)
+    print(f"Stub Google issuer at {stub.issuer}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
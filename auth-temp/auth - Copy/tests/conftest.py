@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import create_app  # noqa: E402
+from smtp_sink import SMTPSink  # noqa: E402
+
+INVITE_TOKEN = "test-invite-token"
+
+
+@pytest.fixture
+def sink():
+    sink = SMTPSink(host="127.0.0.1", port=0).start()
+    yield sink
+    sink.stop()
+
+
+@pytest.fixture
+def make_app(sink, tmp_path):
+    """Build an app that mails to the local sink; keyword arguments override the config"""
+    apps = []
+
+    def make_app(**overrides):
+        config = {
+            "TESTING": True,
+            "SECRET_KEY": "test",
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": sink.port,
+            "MAIL_USE_TLS": False,
+            # TESTING would otherwise make Flask-Mail drop every message
+            "MAIL_SUPPRESS_SEND": False,
+            "MAIL_USERNAME": "auth@example.com",
+            "MAIL_PASSWORD": "",
+            "MAIL_DEFAULT_SENDER": "auth@example.com",
+            "MAIL_RETRY_BACKOFF": 0.01,
+            "PRELOAD_GOOGLE_CERTS": False,
+            "TRACE_EXPORTER": "",
+            "INVITE_API_TOKEN": INVITE_TOKEN,
+            "DATA_DIR": str(tmp_path),
+        }
+        config.update(overrides)
+        app = create_app(config)
+        apps.append(app)
+        return app
+
+    yield make_app
+    for app in apps:
+        app.extensions["auth"].mail_dispatcher.shutdown()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
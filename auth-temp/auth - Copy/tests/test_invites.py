@@ -0,0 +1,61 @@
+import email
+import re
+
+from conftest import INVITE_TOKEN
+
+AUTH = {"Authorization": f"Bearer {INVITE_TOKEN}"}
+
+
+def sent_code(sink, address):
+    for _, recipients, data in reversed(sink.messages):
+        if address in recipients:
+            for part in email.message_from_bytes(data).walk():
+                if part.get_content_type() == "text/plain":
+                    text = part.get_payload(decode=True).decode()
+                    return re.search(r"account is: (\d{6})", text).group(1)
+    raise AssertionError(f"no mail to {address}")
+
+
+def test_invited_user_logs_in_with_the_invited_code(app, sink):
+    client = app.test_client()
+    response = client.post("/admin/invites?wait=10", json={"emails": ["invitee@example.com"]}, headers=AUTH)
+    assert response.status_code == 200
+    assert response.get_json()["results"][0]["state"] == "sent"
+    code = sent_code(sink, "invitee@example.com")
+
+    # A fresh browser: no /otp-login session, so the email comes with the code
+    invitee = app.test_client()
+    assert invitee.get("/verify-otp?email=invitee@example.com").status_code == 200
+    response = invitee.post("/verify-otp", data={"email": "invitee@example.com", "otp": code})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/dashboard")
+    assert invitee.get("/dashboard").status_code == 200
+    # Redeeming did not issue a new code
+    assert len(sink.messages) == 1
+
+
+def test_verify_otp_without_email_asks_for_it(app):
+    response = app.test_client().get("/verify-otp")
+    assert response.status_code == 200
+    assert b'name="email"' in response.data
+
+
+def test_invites_reject_unauthorized(app):
+    response = app.test_client().post("/admin/invites", json={"emails": ["a@example.com"]})
+    assert response.status_code == 401
+
+
+def test_invites_accept_a_bare_json_list(app):
+    response = app.test_client().post("/admin/invites", json=["a@example.com", "not-an-address"], headers=AUTH)
+    assert response.status_code == 200
+    states = {result["email"]: result["state"] for result in response.get_json()["results"]}
+    assert states["not-an-address"] == "invalid"
+    assert states["a@example.com"] != "invalid"
+
+
+def test_invites_reject_other_json_bodies(app):
+    client = app.test_client()
+    for body in ("42", "null", '{"emails": {"a": 1}}', "{not json"):
+        response = client.post("/admin/invites", data=body, content_type="application/json", headers=AUTH)
+        assert response.status_code == 400, body
+        assert "error" in response.get_json()
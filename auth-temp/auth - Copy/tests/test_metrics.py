@@ -0,0 +1,85 @@
+import os
+
+import metrics
+
+MONITORING = {"Authorization": "Bearer monitor"}
+
+
+def fork(work):
+    """Run ``work`` in a child process and wait for it to exit"""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            work()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    return pid
+
+
+def test_shared_registry_sums_counters_of_every_process(tmp_path):
+    registry = metrics.Registry()
+    jobs = registry.counter("jobs", "Jobs done", ["kind"])
+    seconds = registry.histogram("job_seconds", "Job time", buckets=(1.0,))
+    registry.share(str(tmp_path), interval=60)
+
+    def child():
+        jobs.inc("mail", amount=2)
+        seconds.observe(0.5)
+        registry.flush()
+
+    fork(child)
+    jobs.inc("mail")
+    seconds.observe(2.0)
+
+    text = registry.expose()
+    # The child inherited nothing here (no values before the fork), so 2 + 1
+    assert 'jobs_total{kind="mail"} 3' in text
+    assert 'job_seconds_bucket{le="1.0"} 1' in text
+    assert "job_seconds_count 2" in text
+
+
+def test_gauges_are_per_live_worker(tmp_path):
+    registry = metrics.Registry()
+    depth = registry.gauge("queue_depth", "Queued")
+    registry.share(str(tmp_path), interval=60)
+    depth.set_function(lambda: 7)
+    child = fork(registry.flush)
+
+    text = registry.expose()
+    assert f'queue_depth{{pid="{os.getpid()}"}} 7' in text
+    # The child has exited, so its gauge is gone
+    assert f'pid="{child}"' not in text
+
+
+def test_counters_never_drop_between_scrapes_by_different_workers(tmp_path):
+    shared, scraped = tmp_path / "metrics", tmp_path / "scrape.txt"
+    registry = metrics.Registry()
+    hits = registry.counter("hits", "Hits")
+    registry.share(str(shared), interval=60)
+    hits.inc(amount=5)
+    assert "hits_total 5" in registry.expose()
+
+    def other_worker():
+        other = metrics.Registry()
+        other.counter("hits", "Hits")
+        other.share(str(shared), interval=60)
+        scraped.write_text(other.expose())
+
+    # This worker's last scrape flushed its count, so the next one sees it too
+    fork(other_worker)
+    assert "hits_total 5" in scraped.read_text()
+
+
+def test_monitoring_endpoints_need_the_token(make_app):
+    client = make_app().test_client()
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/debug/traces/abc").status_code == 404
+
+    client = make_app(MONITORING_TOKEN="monitor").test_client()
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers=MONITORING)
+    assert response.status_code == 200
+    assert b"http_request_duration_seconds" in response.data
+    assert client.get("/debug/traces/abc", headers=MONITORING).status_code == 404
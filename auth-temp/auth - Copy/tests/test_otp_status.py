@@ -0,0 +1,56 @@
+import time
+
+
+def request_code(app, address):
+    """Ask ``app`` for an OTP and return the mail job id it put in the session"""
+    client = app.test_client()
+    assert client.post("/otp-login", data={"email": address}).status_code == 302
+    with client.session_transaction() as session:
+        return session["otp_job"]
+
+
+def poll(app, job_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["otp_job"] = job_id
+    deadline = time.monotonic() + 5
+    while True:
+        response = client.get("/otp-status")
+        if response.status_code != 200 or response.get_json()["state"] == "sent":
+            return response
+        if time.monotonic() > deadline:
+            return response
+        time.sleep(0.02)
+
+
+def test_status_is_shared_between_workers(make_app):
+    queued_by = make_app(MAIL_STATUS_STORE="sqlite")
+    polled_by = make_app(MAIL_STATUS_STORE="sqlite")
+    job_id = request_code(queued_by, "shared@example.com")
+
+    response = poll(polled_by, job_id)
+
+    assert response.status_code == 200
+    assert response.get_json()["state"] == "sent"
+
+
+def test_memory_status_is_only_known_to_its_worker(make_app):
+    queued_by = make_app(MAIL_STATUS_STORE="memory")
+    polled_by = make_app(MAIL_STATUS_STORE="memory")
+    job_id = request_code(queued_by, "local@example.com")
+
+    assert poll(queued_by, job_id).status_code == 200
+    assert poll(polled_by, job_id).status_code == 404
+
+
+def test_queueing_failures_are_logged(app, monkeypatch, caplog):
+    def broken(message, **kwargs):
+        raise RuntimeError("dispatcher is down")
+
+    monkeypatch.setattr(app.extensions["auth"].mail_dispatcher, "submit", broken)
+    response = app.test_client().post("/otp-login", data={"email": "down@example.com"})
+
+    assert b"Failed to send OTP" in response.data
+    record = next(r for r in caplog.records if "down@example.com" in r.getMessage())
+    assert record.levelname == "ERROR"
+    assert "dispatcher is down" in str(record.exc_info[1])
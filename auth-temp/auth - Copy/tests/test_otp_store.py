@@ -0,0 +1,151 @@
+import threading
+
+import pytest
+
+import otp_store
+from otp_store import MemoryOTPStore, OTPHasher, SQLiteOTPStore
+
+SECRET = "test-otp-secret"
+
+
+class Clock:
+    """Stands in for the ``time`` module inside otp_store"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(otp_store, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    """Stores of one backend; SQLite stores made by one test share a file"""
+    def make_store():
+        if request.param == "memory":
+            return MemoryOTPStore(OTPHasher(SECRET))
+        return SQLiteOTPStore(str(tmp_path / "otp.db"), evict_interval=0, hasher=OTPHasher(SECRET))
+    return make_store
+
+
+@pytest.fixture
+def store(make_store):
+    return make_store()
+
+
+def test_put_then_overwrite(store, clock):
+    store.put("a@example.com", "111111", 60)
+    store.put("a@example.com", "222222", 60)
+    assert store.size() == 1
+    assert not store.consume("a@example.com", "111111")
+    assert store.consume("a@example.com", "222222")
+
+
+def test_put_many(store, clock):
+    store.put_many([("a@example.com", "111111"), ("b@example.com", "222222")], 60)
+    assert store.size() == 2
+    assert store.consume("b@example.com", "222222")
+
+
+def test_keys_ignore_case_and_whitespace(store, clock):
+    store.put("Jo@Example.com ", "123456", 60)
+    store.put("jo@example.com", "654321", 60)
+    assert store.size() == 1
+    assert store.get("JO@EXAMPLE.COM") is not None
+    assert store.consume(" Jo@example.COM", "654321")
+
+
+def test_expired_codes_are_gone(store, clock):
+    store.put("a@example.com", "111111", 60)
+    store.put("b@example.com", "222222", 120)
+    clock.now += 60
+    assert store.get("a@example.com") is None
+    assert not store.consume("a@example.com", "111111")
+    # Expired but not yet evicted entries are not counted
+    assert store.size() == 1
+    assert store.get("b@example.com") is not None
+
+
+def test_evict_expired_removes_only_expired(store, clock):
+    store.put("a@example.com", "111111", 60)
+    store.put("b@example.com", "222222", 120)
+    clock.now += 90
+    store.evict_expired()
+    assert store.get("a@example.com") is None
+    assert store.get("b@example.com") is not None
+
+
+def test_consume_is_single_use(store, clock):
+    store.put("a@example.com", "111111", 60)
+    assert not store.consume("a@example.com", "999999")
+    assert store.consume("a@example.com", "111111")
+    assert not store.consume("a@example.com", "111111")
+    assert store.get("a@example.com") is None
+
+
+def test_concurrent_double_consume_succeeds_once(make_store):
+    # For SQLite each thread gets its own store, like workers sharing the file
+    first = make_store()
+    stores = [first] * 8 if isinstance(first, MemoryOTPStore) else [first] + [make_store() for _ in range(7)]
+    stores[0].put("race@example.com", "424242", 60)
+    barrier = threading.Barrier(len(stores))
+    results = []
+
+    def redeem(store):
+        barrier.wait()
+        results.append(store.consume("race@example.com", "424242"))
+
+    threads = [threading.Thread(target=redeem, args=(store,)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == [False] * 7 + [True]
+
+
+def test_sqlite_stores_on_one_file_share_codes(tmp_path, clock):
+    path = str(tmp_path / "otp.db")
+    issuer = SQLiteOTPStore(path, hasher=OTPHasher(SECRET))
+    verifier = SQLiteOTPStore(path, hasher=OTPHasher(SECRET))
+    issuer.put("a@example.com", "111111", 60)
+    assert verifier.size() == 1
+    assert verifier.consume("a@example.com", "111111")
+    assert issuer.get("a@example.com") is None
+    # A different secret cannot check the digests the other store wrote
+    issuer.put("a@example.com", "111111", 60)
+    assert not SQLiteOTPStore(path, hasher=OTPHasher("other")).consume("a@example.com", "111111")
+
+
+# Same vectors as tests/unit/auth-utils.test.ts in the Next.js app
+PARITY_SECRET = "parity-test-secret"
+PARITY_DIGEST = "h1$3208fcbc2426a1febd34269ee2e4a4f717ee1ae1768f873f9cca7f5ef51e148f"
+JWT_DERIVED_DIGEST = "h1$cf73a40f121b87e1c527df98e309bf1371dc7acea402fb6223b2b0599b977606"
+
+
+def test_digest_matches_the_typescript_vector():
+    hasher = OTPHasher(PARITY_SECRET)
+    assert hasher.digest("Jo@Example.com", "123456") == PARITY_DIGEST
+    assert hasher.matches(PARITY_DIGEST, "jo@example.com", "123456")
+    assert not hasher.matches(PARITY_DIGEST, "jo@example.com", "123457")
+
+
+def test_default_secret_is_derived_from_jwt_secret_like_typescript(monkeypatch):
+    from config import load_config
+
+    monkeypatch.delenv("OTP_SECRET", raising=False)
+    monkeypatch.setenv("JWT_SECRET", "shared-jwt-secret")
+    hasher = OTPHasher(load_config()["OTP_SECRET"])
+    assert hasher.digest("Jo@Example.com", "123456") == JWT_DERIVED_DIGEST
+
+
+def test_legacy_plain_rows_are_still_accepted():
+    hasher = OTPHasher(PARITY_SECRET)
+    assert hasher.matches("123456", "jo@example.com", "123456")
+    assert not hasher.matches("123456", "jo@example.com", "654321")
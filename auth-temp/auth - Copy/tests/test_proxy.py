@@ -0,0 +1,18 @@
+LIMITS = {"issue:email": "10/300", "issue:ip": "1/300", "verify:email": "10/300", "verify:ip": "10/300"}
+
+
+def issue(client, email, client_ip):
+    return client.post("/otp-login", data={"email": email}, headers={"X-Forwarded-For": client_ip})
+
+
+def test_clients_behind_a_trusted_proxy_get_their_own_ip_limit(make_app):
+    client = make_app(TRUSTED_PROXIES=1, RATE_LIMITS=LIMITS).test_client()
+    assert issue(client, "a@example.com", "203.0.113.1").status_code == 302
+    assert issue(client, "b@example.com", "203.0.113.2").status_code == 302
+    assert issue(client, "c@example.com", "203.0.113.1").status_code == 429
+
+
+def test_forwarded_header_is_ignored_without_trusted_proxies(make_app):
+    client = make_app(RATE_LIMITS=LIMITS).test_client()
+    assert issue(client, "a@example.com", "203.0.113.1").status_code == 302
+    assert issue(client, "b@example.com", "203.0.113.2").status_code == 429
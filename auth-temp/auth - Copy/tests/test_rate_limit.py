@@ -0,0 +1,26 @@
+import pytest
+
+from rate_limit import SlidingWindowLimiter, create_limiter, parse_limit
+
+
+@pytest.mark.parametrize("spec", ["0/300", "-1/60", "5/0"])
+def test_parse_limit_rejects_limits_that_allow_nothing(spec):
+    with pytest.raises(ValueError):
+        parse_limit(spec)
+
+
+def test_create_app_refuses_a_zero_limit(make_app):
+    with pytest.raises(ValueError):
+        make_app(RATE_LIMITS={"issue:email": "0/300"})
+
+
+def test_limiter_denies_after_limit():
+    limiter = SlidingWindowLimiter(1, 300)
+    assert limiter.hit("k") == (True, 0)
+    allowed, retry_after = limiter.hit("k")
+    assert not allowed and retry_after >= 1
+
+
+def test_create_limiter_parses_spec():
+    limiter = create_limiter("issue:ip", "20/300", "memory")
+    assert (limiter.limit, limiter.window) == (20, 300.0)
@@ -0,0 +1,58 @@
+import os
+import time
+import uuid
+
+import pytest
+
+import session_tokens
+from test_invites import sent_code
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+needs_database = pytest.mark.skipif(not DATABASE_URL, reason="set TEST_DATABASE_URL to a scratch Postgres database")
+
+EMAIL = "Jo.Token@Example.com"
+
+
+def test_jwt_logins_need_the_user_database(make_app):
+    with pytest.raises(ValueError, match="USER_STORE=postgres"):
+        make_app(JWT_SECRET="secret", USER_STORE="session")
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(USER_STORE="postgres", DATABASE_URL=DATABASE_URL, JWT_SECRET="secret")
+    repository = app.extensions["auth"].user_repository
+    repository.ensure_schema()
+    repository.set_active(EMAIL, True)
+    yield app
+    repository.close()
+
+
+def log_in(app, sink):
+    client = app.test_client()
+    client.post("/otp-login", data={"email": EMAIL})
+    deadline = time.monotonic() + 10
+    while not any(EMAIL in recipients for _, recipients, _ in sink.messages) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    response = client.post("/verify-otp", data={"otp": sent_code(sink, EMAIL)})
+    assert response.headers["Location"].endswith("/dashboard")
+    return client
+
+
+@needs_database
+def test_token_carries_the_user_id_and_lowercased_email(app, sink):
+    client = log_in(app, sink)
+    token = client.get_cookie(session_tokens.COOKIE_NAME).value
+    payload = app.extensions["auth"].tokens.verify(token)
+    assert payload["email"] == EMAIL.lower()
+    assert str(uuid.UUID(payload["id"])) == payload["id"]
+    assert client.get("/dashboard").status_code == 200
+
+
+@needs_database
+def test_token_of_a_deactivated_user_is_refused(app, sink):
+    client = log_in(app, sink)
+    assert client.get("/dashboard").status_code == 200  # now cached
+
+    app.extensions["auth"].user_repository.set_active(EMAIL, False)
+    assert client.get("/dashboard").status_code == 302
@@ -0,0 +1,81 @@
+import pytest
+
+from smtp_relays import Relay, RelayPool
+
+
+class FakeHost:
+    def noop(self):
+        return (250, b"OK")
+
+
+class FakeConnection:
+    host = FakeHost()
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeRelay(Relay):
+    def connect(self):
+        return FakeConnection()
+
+
+@pytest.fixture
+def pool():
+    return RelayPool([FakeRelay("a", None, weight=3), FakeRelay("b", None)], failure_threshold=3,
+                     slow_threshold=0.5, cooldown=0, min_samples=3, probation_sends=3)
+
+
+def send(pool, relay, elapsed, error=None):
+    with pool._cond:
+        relay.in_use += 1
+    pool.release(relay, FakeConnection(), elapsed, error)
+
+
+def trip_slow(pool, relay):
+    for _ in range(3):
+        send(pool, relay, 2.0)
+    assert not relay.healthy
+    assert pool.probe(relay)
+
+
+def test_probe_readmits_on_probation_with_old_latency(pool):
+    relay = pool.relays[0]
+    trip_slow(pool, relay)
+    assert relay.healthy and relay.probation == 3
+    assert relay.latency > pool.slow_threshold  # the NOOP round-trip does not replace it
+
+
+def test_slow_send_on_probation_trips_at_once(pool):
+    relay = pool.relays[0]
+    trip_slow(pool, relay)
+    send(pool, relay, 1.0)
+    assert not relay.healthy
+    assert relay.reason.startswith("slow on probation")
+
+
+def test_failed_send_on_probation_trips_at_once(pool):
+    relay = pool.relays[0]
+    trip_slow(pool, relay)
+    send(pool, relay, 0.1, error=RuntimeError("451"))
+    assert not relay.healthy
+    assert relay.reason.startswith("failing on probation")
+
+
+def test_good_sends_end_probation(pool):
+    relay = pool.relays[0]
+    trip_slow(pool, relay)
+    for elapsed in (0.1, 0.2, 0.3):
+        send(pool, relay, elapsed)
+    assert relay.healthy and relay.probation == 0
+    assert relay.latency == pytest.approx(0.2)
+    # Back to the usual rules: one failure is not enough to trip it
+    send(pool, relay, 0.1, error=RuntimeError("451"))
+    assert relay.healthy
+
+
+def test_relay_on_probation_gets_the_lowest_weight(pool):
+    a, b = pool.relays
+    trip_slow(pool, a)
+    picks = [pool._pick(()) for _ in range(20)]
+    assert picks.count(a) == picks.count(b) == 10
@@ -0,0 +1,41 @@
+import json
+import os
+
+import tracing
+
+
+def test_workers_sharing_a_trace_file_write_whole_traces(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    exporter = tracing.JSONLinesExporter(path)
+    tracer = tracing.Tracer(exporter)
+    padding = "x" * 3000
+
+    def worker():
+        for n in range(200):
+            with tracer.start_trace("request", n=n, pid=os.getpid()):
+                for _ in range(5):
+                    with tracer.span("step", padding=padding):
+                        pass
+
+    pids = []
+    for _ in range(8):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                worker()
+                exporter.close()
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    traces = tracing.load_traces(path)
+    assert len(traces) == 8 * 200
+    for spans in traces.values():
+        assert [span["name"] for span in spans] == ["step"] * 5 + ["request"]
+    # Each trace is one contiguous block of lines
+    with open(path, encoding="utf-8") as f:
+        trace_ids = [json.loads(line)["trace_id"] for line in f]
+    blocks = [t for i, t in enumerate(trace_ids) if i == 0 or trace_ids[i - 1] != t]
+    assert len(blocks) == len(traces)
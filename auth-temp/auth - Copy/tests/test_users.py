@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from test_invites import sent_code
+from users import PostgresUserRepository
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="set TEST_DATABASE_URL to a scratch Postgres database")
+
+EMAIL = "deactivated@example.com"
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(USER_STORE="postgres", DATABASE_URL=DATABASE_URL)
+    repository = app.extensions["auth"].user_repository
+    repository.ensure_schema()
+    repository.set_active(EMAIL, True)
+    yield app
+    repository.close()
+
+
+def log_in(app, sink):
+    client = app.test_client()
+    client.post("/otp-login", data={"email": EMAIL})
+    deadline = time.monotonic() + 10
+    while not any(EMAIL in recipients for _, recipients, _ in sink.messages) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    response = client.post("/verify-otp", data={"otp": sent_code(sink, EMAIL)})
+    assert response.headers["Location"].endswith("/dashboard")
+    return client
+
+
+def wait_for_logout(client, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get("/dashboard")
+        if response.status_code != 200:
+            return response
+        time.sleep(0.02)
+    return response
+
+
+def test_deactivated_user_is_logged_out_on_next_request(app, sink):
+    client = log_in(app, sink)
+    assert client.get("/dashboard").status_code == 200  # now cached
+
+    app.extensions["auth"].user_repository.set_active(EMAIL, False)
+    response = client.get("/dashboard")
+    assert response.status_code == 302
+
+
+def test_deactivation_from_another_process_reaches_the_cache(app, sink):
+    client = log_in(app, sink)
+    assert client.get("/dashboard").status_code == 200
+
+    # What `flask set-user-active --inactive` does: its own pool, no shared cache
+    other = PostgresUserRepository(DATABASE_URL, min_size=1, max_size=1)
+    try:
+        assert other.set_active(EMAIL, False) is not None
+    finally:
+        other.close()
+    assert wait_for_logout(client).status_code == 302
@@ -0,0 +1,280 @@
+"""Lightweight span tracing for the login flows.
+
+Each request gets a root span (continuing an incoming W3C ``traceparent``
+header if there is one) and the handlers open child spans around the steps
+worth timing::
+
+    with tracing.span("otp_store.put"):
+        ...
+
+Finished spans go to an exporter: ``JSONLinesExporter`` appends one JSON
+object per span to a file, ``MemoryExporter`` keeps the most recent traces
+in process. With no exporter configured every call is a no-op.
+
+To see where the time went in the slowest requests of a run::
+
+    python tracing.py traces.jsonl --slowest 5
+"""
+import contextvars
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "start",
+                 "duration", "attributes", "status", "is_root", "_started", "_token")
+
+    def __init__(self, tracer, name, trace_id, parent_id=None, attributes=None, is_root=False):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.status = "ok"
+        self.is_root = is_root
+        self.start = time.time()
+        self.duration = None
+        self._started = time.perf_counter()
+        self._token = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        if exc is not None:
+            self.status = "error"
+            self.attributes["error"] = repr(exc)
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        self.tracer.exporter.export(self)
+        return False
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration": self.duration,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off or the trace is not sampled"""
+
+    trace_id = span_id = None
+
+    def set(self, key, value):
+        pass
+
+    def traceparent(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self, exporter=None, sample_rate=1.0):
+        self.configure(exporter, sample_rate)
+
+    def configure(self, exporter=None, sample_rate=1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def start_trace(self, name, traceparent=None, **attributes):
+        """Return a root span, continuing ``traceparent`` if it is valid"""
+        if self.exporter is None:
+            return NOOP_SPAN
+        match = _TRACEPARENT_RE.match(traceparent or "")
+        if match:
+            trace_id, parent_id, flags = match.groups()
+            if not int(flags, 16) & 1:
+                return NOOP_SPAN
+        elif random.random() < self.sample_rate:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        else:
+            return NOOP_SPAN
+        return Span(self, name, trace_id, parent_id, attributes, is_root=True)
+
+    def span(self, name, parent=None, **attributes):
+        """Return a child of ``parent`` (default: the current span), or a no-op span"""
+        parent = parent or _current.get()
+        if parent is None or parent.trace_id is None or self.exporter is None:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+
+class JSONLinesExporter:
+    """Appends finished spans to ``path``, a whole trace at a time.
+
+    Every gunicorn worker appends to the same file, so lines are collected
+    until a root span ends and then written with one unbuffered ``write`` on
+    an ``O_APPEND`` handle: the file only ever receives whole lines, and
+    lines from different processes cannot interleave.
+    """
+
+    def __init__(self, path, max_pending=1000):
+        self.path = path
+        self.max_pending = max_pending
+        self._file = None
+        self._pid = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._pid != os.getpid():
+                # Lines a parent had not written yet are its own to write
+                self._file = open(self.path, "ab", buffering=0)
+                self._pid = os.getpid()
+                self._pending = []
+            self._pending.append(line)
+            if span.is_root or len(self._pending) >= self.max_pending:
+                data = "".join(self._pending).encode("utf-8")
+                self._pending = []
+                self._file.write(data)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None and self._pid == os.getpid():
+                if self._pending:
+                    self._file.write("".join(self._pending).encode("utf-8"))
+                self._file.close()
+            self._file = None
+            self._pending = []
+
+
+class MemoryExporter:
+    """Keeps the spans of the ``max_traces`` most recent traces in memory"""
+
+    def __init__(self, max_traces=1000):
+        self.max_traces = max_traces
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            spans = self._traces.setdefault(span.trace_id, [])
+            spans.append(span.to_dict())
+            self._traces.move_to_end(span.trace_id)
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+    def get(self, trace_id):
+        with self._lock:
+            return list(self._traces.get(trace_id, ()))
+
+    def traces(self):
+        with self._lock:
+            return {trace_id: list(spans) for trace_id, spans in self._traces.items()}
+
+
+def format_trace(spans):
+    """Render one trace as an indented tree with start offsets and durations (ms)"""
+    if not spans:
+        return ""
+    children = {}
+    for span in spans:
+        children.setdefault(span["parent_id"], []).append(span)
+    ids = {span["span_id"] for span in spans}
+    roots = [span for span in spans if span["parent_id"] not in ids]
+    origin = min(span["start"] for span in spans)
+    lines = []
+
+    def walk(span, depth):
+        offset = (span["start"] - origin) * 1000
+        duration = (span["duration"] or 0) * 1000
+        attributes = " ".join(f"{k}={v}" for k, v in span["attributes"].items())
+        flag = " !" if span["status"] == "error" else ""
+        lines.append(f"{offset:9.1f} {duration:9.1f}  {'  ' * depth}{span['name']}{flag}  {attributes}".rstrip())
+        for child in sorted(children.get(span["span_id"], ()), key=lambda s: s["start"]):
+            walk(child, depth + 1)
+
+    for root in sorted(roots, key=lambda s: s["start"]):
+        walk(root, 0)
+    return "   start ms   took ms\n" + "\n".join(lines)
+
+
+def load_traces(path):
+    """Group the spans of a JSON-lines file by trace id"""
+    traces = OrderedDict()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+
+def _root_duration(spans):
+    ids = {span["span_id"] for span in spans}
+    return max((span["duration"] or 0 for span in spans if span["parent_id"] not in ids), default=0)
+
+
+def create_exporter(kind, path=None):
+    """Build the exporter for ``TRACE_EXPORTER`` ("jsonl", "memory" or empty for none)"""
+    if not kind:
+        return None
+    if kind == "jsonl":
+        return JSONLinesExporter(path or "traces.jsonl")
+    if kind == "memory":
+        return MemoryExporter()
+    raise ValueError(f"Unknown trace exporter: {kind!r}")
+
+
+TRACER = Tracer()
+span = TRACER.span
+start_trace = TRACER.start_trace
+
+
+def current_span():
+    return _current.get()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show span breakdowns from a JSON-lines trace file")
+    parser.add_argument("path")
+    parser.add_argument("--slowest", type=int, default=5, help="show the N slowest traces")
+    parser.add_argument("--trace", help="show a single trace id")
+    args = parser.parse_args()
+    traces = load_traces(args.path)
+    if args.trace:
+        selected = [traces.get(args.trace, [])]
+    else:
+        selected = sorted(traces.values(), key=_root_duration, reverse=True)[:args.slowest]
+    for spans in selected:
+        print(f"trace {spans[0]['trace_id'] if spans else args.trace}")
+        print(format_trace(spans))
+        print()
@@ -0,0 +1,252 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class User:
+    """Authenticated user as seen by Flask-Login.
+
+    Implements the Flask-Login user interface directly instead of inheriting
+    ``UserMixin`` so that instances can use ``__slots__`` and carry no
+    per-instance ``__dict__``.
+    """
+
+    __slots__ = ("id", "email", "name")
+
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
+    def __init__(self, id_, email, name):
+        self.id = id_
+        self.email = email
+        self.name = name
+
+    def get_id(self):
+        return str(self.id)
+
+    def to_dict(self):
+        return {"id": self.id, "email": self.email, "name": self.name}
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return self.get_id() == other.get_id()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.get_id())
+
+    def __repr__(self):
+        return f"<User {self.id} {self.email}>"
+
+
+class UserCache:
+    """Bounded LRU cache of ``User`` objects with a per-entry TTL"""
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if time.monotonic() >= expires:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user_id, user):
+        with self._lock:
+            self._entries[user_id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Columns follow supabase/schema.sql; is_active and last_login_at come from
+# supabase/migrations/add_users_is_active.sql
+_USER_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS users (
+      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+      email VARCHAR(255) NOT NULL UNIQUE,
+      name VARCHAR(255),
+      auth_method VARCHAR(50) DEFAULT 'otp',
+      created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+      updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS is_active BOOLEAN NOT NULL DEFAULT TRUE",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS last_login_at TIMESTAMPTZ",
+)
+
+_GET_BY_ID = "SELECT id, email, name FROM users WHERE id = %s AND is_active"
+_UPSERT_LOGIN = """
+    INSERT INTO users (email, name, auth_method, last_login_at)
+    VALUES (%s, %s, %s, NOW())
+    ON CONFLICT (email) DO UPDATE
+      SET last_login_at = NOW(), updated_at = NOW(), name = COALESCE(users.name, EXCLUDED.name)
+    RETURNING id, email, name, is_active
+"""
+# Every process listening on the channel drops the user from its cache
+_CHANGES_CHANNEL = "auth_user_changes"
+_SET_ACTIVE = f"""
+    WITH changed AS (
+      UPDATE users SET is_active = %s, updated_at = NOW() WHERE email = %s RETURNING id
+    )
+    SELECT id, pg_notify('{_CHANGES_CHANNEL}', id::text) FROM changed
+"""
+
+
+class PostgresUserRepository:
+    """Users in the Postgres ``users`` table behind a bounded connection pool.
+
+    The pool is created closed; call ``open()`` once per process after any
+    fork (gunicorn's ``post_worker_init`` does it) so connections are
+    established before the first request instead of during it. Lookups and
+    the login upsert are sent as prepared statements.
+
+    ``cache`` is the ``UserCache`` in front of ``get``. ``set_active``
+    announces the change over ``NOTIFY``, and a listener thread in every
+    process that opened the pool drops the user from its cache, so a
+    deactivation made anywhere (for example ``flask set-user-active``)
+    takes effect on the next request. If the listener is disconnected
+    cached users expire after the cache TTL as before.
+    """
+
+    def __init__(self, dsn, min_size=2, max_size=10, timeout=5.0, cache=None):
+        from psycopg_pool import ConnectionPool
+
+        self.dsn = dsn
+        self.timeout = timeout
+        self.cache = cache
+        self._listener = None
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=timeout,
+            open=False,
+            kwargs={"autocommit": True},
+            name="auth-users",
+        )
+        self._pid = None
+
+    def open(self, wait=True):
+        """Open the pool and, with ``wait``, block until ``min_size`` connections are up"""
+        if self._pid != os.getpid():
+            self.pool.open(wait=wait, timeout=self.timeout)
+            self._pid = os.getpid()
+            if self.cache is not None:
+                self._listener = threading.Thread(target=self._listen, name="user-changes", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        """Invalidate cached users as other processes change them"""
+        import psycopg
+
+        pid = os.getpid()
+        while self._pid == pid:
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {_CHANGES_CHANNEL}")
+                    # Changes made while disconnected were not heard
+                    self.cache.clear()
+                    while self._pid == pid:
+                        # notifies(timeout=) needs psycopg 3.2
+                        for notify in conn.notifies(timeout=self.timeout):
+                            self.cache.invalidate(notify.payload)
+            except Exception:
+                logger.exception("User change listener failed; reconnecting in %gs", self.timeout)
+                time.sleep(self.timeout)
+
+    def close(self):
+        if self._pid == os.getpid():
+            self.pool.close()
+        self._pid = None
+        self._listener = None
+
+    def _fetchone(self, query, params):
+        if self._pid != os.getpid():
+            # Not opened by a startup hook; pay for the connections now
+            self.open()
+        with self.pool.connection() as conn:
+            return conn.execute(query, params, prepare=True).fetchone()
+
+    def ensure_schema(self):
+        """Create the users table and columns this repository relies on"""
+        self.open()
+        with self.pool.connection() as conn:
+            for statement in _USER_SCHEMA:
+                conn.execute(statement)
+
+    def get(self, user_id):
+        """Return the active user with this id, or None"""
+        try:
+            user_id = uuid.UUID(str(user_id))
+        except ValueError:
+            return None
+        row = self._fetchone(_GET_BY_ID, (user_id,))
+        return _to_user(row) if row else None
+
+    def upsert_login(self, email, name, auth_method):
+        """Create the user on first login or stamp ``last_login_at``.
+
+        Returns None if the account has been deactivated.
+        """
+        row = self._fetchone(_UPSERT_LOGIN, (email.lower(), name, auth_method))
+        return _to_user(row) if row[3] else None
+
+    def set_active(self, email, active):
+        """Activate or deactivate the user with this email; returns their id, or None if unknown"""
+        row = self._fetchone(_SET_ACTIVE, (active, email.lower()))
+        if row is None:
+            return None
+        if self.cache is not None:
+            # The notification reaches this process too, but not before the next request
+            self.cache.invalidate(str(row[0]))
+        return str(row[0])
+
+
+def _to_user(row):
+    return User(str(row[0]), row[1], row[2] or row[1].split("@")[0])
+
+
+def create_user_repository(config, cache=None):
+    """Build the repository selected by ``USER_STORE``.
+
+    ``session`` (the default) keeps users in the signed session cookie only
+    and returns None; ``postgres`` uses ``DATABASE_URL``.
+    """
+    backend = config.get("USER_STORE", "session")
+    if backend == "session":
+        return None
+    if backend == "postgres":
+        return PostgresUserRepository(
+            config["DATABASE_URL"],
+            min_size=config.get("USER_DB_POOL_MIN", 2),
+            max_size=config.get("USER_DB_POOL_MAX", 10),
+            cache=cache,
+        )
+    raise ValueError(f"Unknown user store: {backend}")
@@ -0,0 +1,12 @@
+"""WSGI entry point for production servers.
+
+Builds the app once and warms its caches at import time, so with gunicorn's
+``preload_app`` (see ``gunicorn.conf.py``) the work happens in the master and
+is inherited by every forked worker::
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import create_app, warm_caches
+
+app = create_app()
+warm_caches(app)
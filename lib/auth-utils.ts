@@ -1,9 +1,18 @@
 import jwt from 'jsonwebtoken';
+import bcrypt from 'bcryptjs';
+import { createHmac, timingSafeEqual } from 'crypto';
 import { cookies } from 'next/headers';
 
 const JWT_SECRET = process.env.JWT_SECRET || 'your-secret-key-change-in-production';
 const JWT_EXPIRES_IN = '7d'; // Token valid for 7 days
 
+// Key for OTP digests; derived from JWT_SECRET when OTP_SECRET is not set, the
+// same way the Python auth service derives its default, so both check each
+// other's codes
+const OTP_SECRET =
+  process.env.OTP_SECRET || createHmac('sha256', JWT_SECRET).update('otp-digest').digest('hex');
+const OTP_HASH_PREFIX = 'h1$';
+
 export interface UserPayload {
   id: string;
   email: string;
@@ -85,3 +94,28 @@ export function getOTPExpiry(): Date {
   expiry.setMinutes(expiry.getMinutes() + 5);
   return expiry;
 }
+
+/**
+ * Keyed digest of an OTP for storage: "h1$" + hex HMAC-SHA256 of "email\0otp".
+ * Same format as the Python auth service's OTPHasher.
+ */
+export function hashOTP(email: string, otp: string): string {
+  const digest = createHmac('sha256', OTP_SECRET)
+    .update(`${email.toLowerCase()}\0${otp}`)
+    .digest('hex');
+  return OTP_HASH_PREFIX + digest;
+}
+
+/**
+ * Check an OTP against a stored digest in constant time.
+ * Rows issued before the switch hold bcrypt hashes; those are still checked
+ * with bcrypt until they expire (5 minutes after the deploy).
+ */
+export async function verifyOTPHash(email: string, otp: string, stored: string): Promise<boolean> {
+  if (!stored.startsWith(OTP_HASH_PREFIX)) {
+    return bcrypt.compare(otp, stored);
+  }
+  const expected = Buffer.from(hashOTP(email, otp));
+  const actual = Buffer.from(stored);
+  return expected.length === actual.length && timingSafeEqual(expected, actual);
+}
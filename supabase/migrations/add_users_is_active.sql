@@ -0,0 +1,6 @@
+-- Let accounts be deactivated and record each login (used by the Flask auth service)
+ALTER TABLE public.users ADD COLUMN IF NOT EXISTS is_active BOOLEAN NOT NULL DEFAULT TRUE;
+ALTER TABLE public.users ADD COLUMN IF NOT EXISTS last_login_at TIMESTAMPTZ;
+
+-- Add comment
+COMMENT ON COLUMN public.users.is_active IS 'Inactive users cannot log in and their sessions stop loading';
@@ -0,0 +1,56 @@
+/**
+ * @jest-environment node
+ *
+ * OTP digest parity with the Python auth service (OTPHasher in
+ * auth-temp/auth - Copy/otp_store.py): the same email, code and secret must
+ * give the same "h1$" digest on both sides. The Python tests use the same
+ * vectors.
+ */
+import bcrypt from 'bcryptjs'
+
+jest.mock('next/headers', () => ({ cookies: jest.fn() }))
+
+const PARITY_SECRET = 'parity-test-secret'
+const PARITY_DIGEST = 'h1$3208fcbc2426a1febd34269ee2e4a4f717ee1ae1768f873f9cca7f5ef51e148f'
+const JWT_DERIVED_DIGEST = 'h1$cf73a40f121b87e1c527df98e309bf1371dc7acea402fb6223b2b0599b977606'
+
+// OTP_SECRET is read when the module loads, so load it fresh per environment
+function loadAuthUtils(env: { OTP_SECRET?: string; JWT_SECRET?: string }) {
+  const saved = { OTP_SECRET: process.env.OTP_SECRET, JWT_SECRET: process.env.JWT_SECRET }
+  let authUtils!: typeof import('@/lib/auth-utils')
+  try {
+    delete process.env.OTP_SECRET
+    delete process.env.JWT_SECRET
+    Object.assign(process.env, env)
+    jest.isolateModules(() => {
+      authUtils = require('@/lib/auth-utils')
+    })
+  } finally {
+    for (const [key, value] of Object.entries(saved)) {
+      if (value === undefined) delete process.env[key]
+      else process.env[key] = value
+    }
+  }
+  return authUtils
+}
+
+describe('OTP digests', () => {
+  it('matches the Python digest for a fixed vector', async () => {
+    const { hashOTP, verifyOTPHash } = loadAuthUtils({ OTP_SECRET: PARITY_SECRET })
+    expect(hashOTP('Jo@Example.com', '123456')).toBe(PARITY_DIGEST)
+    await expect(verifyOTPHash('jo@example.com', '123456', PARITY_DIGEST)).resolves.toBe(true)
+    await expect(verifyOTPHash('jo@example.com', '123457', PARITY_DIGEST)).resolves.toBe(false)
+  })
+
+  it('derives the default secret from JWT_SECRET like the Python service', () => {
+    const { hashOTP } = loadAuthUtils({ JWT_SECRET: 'shared-jwt-secret' })
+    expect(hashOTP('Jo@Example.com', '123456')).toBe(JWT_DERIVED_DIGEST)
+  })
+
+  it('still checks legacy bcrypt rows', async () => {
+    const { verifyOTPHash } = loadAuthUtils({ OTP_SECRET: PARITY_SECRET })
+    const legacy = bcrypt.hashSync('123456', 4)
+    await expect(verifyOTPHash('jo@example.com', '123456', legacy)).resolves.toBe(true)
+    await expect(verifyOTPHash('jo@example.com', '654321', legacy)).resolves.toBe(false)
+  })
+})
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,44 +52,44 @@ async def run_test():
         frame = context.pages[-1]
         # Input valid username in Username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input valid password in Password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click Sign In button to submit login form
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input demo/demo123 credentials and attempt login
         frame = context.pages[-1]
         # Input demo username in Username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password in Password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to submit login form with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Dashboard').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
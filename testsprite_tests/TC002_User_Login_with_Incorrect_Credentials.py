@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,25 +52,25 @@ async def run_test():
         frame = context.pages[-1]
         # Input invalid username in username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input invalid password in password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click Sign In button to attempt login with invalid credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Invalid credentials.').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,7 +52,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Login with Email OTP' button to go to OTP login page
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -59,7 +61,7 @@ async def run_test():
             await expect(frame.locator('text=OTP Verification Successful').first).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError('Test case failed: OTP login process did not complete successfully. OTP email was not confirmed sent, OTP input or verification failed, or JWT token was not issued and user was not redirected to dashboard as expected.')
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
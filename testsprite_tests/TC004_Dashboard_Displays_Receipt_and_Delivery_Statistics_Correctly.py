@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,59 +52,59 @@ async def run_test():
         frame = context.pages[-1]
         # Input username in username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input password in password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click sign in button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input demo username and password and click sign in to log in
         frame = context.pages[-1]
         # Input demo username in username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password in password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click sign in button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to Receipt page to extract backend data for receipts to verify dashboard counts
         frame = context.pages[-1]
         # Click on Receipt link in sidebar to view receipt details for backend data verification
         elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate back to Dashboard to verify receipt counts against extracted data
         frame = context.pages[-1]
         # Click Dashboard link in sidebar to return to dashboard page
         elem = frame.locator('xpath=html/body/div/div/nav/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to Delivery page to extract backend data for deliveries to verify dashboard counts
         frame = context.pages[-1]
         # Click on Delivery link in sidebar to view delivery details for backend data verification
         elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Scroll down or interact to load more delivery orders or statuses to verify dashboard counts for late, waiting, and operational deliveries
@@ -115,7 +117,7 @@ async def run_test():
             await expect(frame.locator('text=Dashboard Data Verification Failed').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Dashboard statistics widgets do not show accurate counts for receipts, deliveries, late, waiting, and operational statuses as per backend data verification.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,52 +52,52 @@ async def run_test():
         frame = context.pages[-1]
         # Input the username in the username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input the password in the password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to login
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input demo username and password and click Sign In to login successfully.
         frame = context.pages[-1]
         # Input the demo username in the username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input the demo password in the password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to login with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the 'Products' tab to navigate to the product listing page.
         frame = context.pages[-1]
         # Click on the 'Products' tab to go to product listing page
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Locate and click the button or link to create a new product.
         frame = context.pages[-1]
         # Click the Loading... button which might be the add new product button or look for other buttons if this is not correct
         elem = frame.locator('xpath=html/body/header/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -104,7 +106,7 @@ async def run_test():
             await expect(frame.locator('text=Product Creation Failed').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The test plan execution has failed. User was unable to create a new product with all required fields and the product does not appear in the listing.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,59 +52,59 @@ async def run_test():
         frame = context.pages[-1]
         # Click username input field to focus
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
         # Click password input field to focus
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
         # Click Sign In button to login
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input demo username and password and click Sign In to login.
         frame = context.pages[-1]
         # Input demo username
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to login with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on 'Products' link to navigate to the product creation page.
         frame = context.pages[-1]
         # Click on 'Products' link in the sidebar to go to product creation page
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Locate and click the button or link to open the product creation form.
         frame = context.pages[-1]
         # Click the 'Loading...' button or any visible button that might open the product creation form
         elem = frame.locator('xpath=html/body/header/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Try to find another way to open the product creation form or report the issue and stop.
         frame = context.pages[-1]
         # Click the 'Settings' button to check if product creation form is accessible there
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -111,7 +113,7 @@ async def run_test():
             await expect(frame.locator('text=Product Created Successfully').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Form validation did not prevent product creation with missing or invalid inputs, or validation errors were not displayed as expected.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
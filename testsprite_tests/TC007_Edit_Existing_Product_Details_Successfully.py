@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,64 +52,64 @@ async def run_test():
         frame = context.pages[-1]
         # Input the username in the username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input the password in the password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to login
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Clear username and password fields, input demo/demo123 credentials, and click Sign In button to login.
         frame = context.pages[-1]
         # Clear the username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear the password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Input the username 'demo' in the username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input the password 'demo123' in the password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to login with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the 'Products' tab to navigate to the product list page.
         frame = context.pages[-1]
         # Click on the 'Products' tab to navigate to the product list page
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the first product 'Steel Rod' to open its detail page.
         frame = context.pages[-1]
         # Click on the 'Steel Rod' product row to open its detail page
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Scroll down to reveal the product details and edit form on the product detail page.
@@ -122,14 +124,14 @@ async def run_test():
         frame = context.pages[-1]
         # Click on the 'Products' tab to go back to the product list page
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Try clicking on the product row 'Steel Rod' again to see if it opens an editable detail view or reveals edit options.
         frame = context.pages[-1]
         # Click on the 'Steel Rod' product row to attempt to open editable detail view
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -138,7 +140,7 @@ async def run_test():
             await expect(frame.locator('text=Product Update Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The test plan execution failed to verify that the user can edit an existing product's details and that the changes persist and reflect correctly.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,64 +52,64 @@ async def run_test():
         frame = context.pages[-1]
         # Input username in correct username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input password in correct password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click sign in button to login
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Clear username and password fields, input demo/demo123 credentials, and click Sign In button.
         frame = context.pages[-1]
         # Clear username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Input demo username
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to login with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the 'Products' tab (index 6) in the sidebar to navigate to the product list page.
         frame = context.pages[-1]
         # Click on 'Products' tab to navigate to product list page
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the product row 'Steel Rod' (index 12) to select it and look for delete option.
         frame = context.pages[-1]
         # Select product 'Steel Rod' row to trigger delete action
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -116,7 +118,7 @@ async def run_test():
             await expect(frame.locator('text=Product deletion successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The product was not deleted successfully as per the test plan. The product still appears in the product list, indicating the deletion did not occur or was not confirmed.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
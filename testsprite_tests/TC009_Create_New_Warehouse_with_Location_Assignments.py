@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,109 +52,109 @@ async def run_test():
         frame = context.pages[-1]
         # Input username
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input password
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click Sign In button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input demo/demo123 credentials and click Sign In to log in successfully.
         frame = context.pages[-1]
         # Input demo username
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to warehouse creation page by clicking 'Warehouse' in the Settings menu.
         frame = context.pages[-1]
         # Click Warehouse link in Settings menu
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input valid warehouse details and submit the form to create a warehouse.
         frame = context.pages[-1]
         # Input warehouse name
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Warehouse')
+        await waits.before_action(page, elem); await elem.fill('Test Warehouse')
         
 
         frame = context.pages[-1]
         # Input warehouse short code
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TW01')
+        await waits.before_action(page, elem); await elem.fill('TW01')
         
 
         frame = context.pages[-1]
         # Input warehouse address
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123 Test Address, Test City')
+        await waits.before_action(page, elem); await elem.fill('123 Test Address, Test City')
         
 
         frame = context.pages[-1]
         # Click Create Warehouse button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to Locations page within the warehouse to proceed with location creation.
         frame = context.pages[-1]
         # Click Locations link in Settings menu to navigate to locations page
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input valid location details and create multiple locations.
         frame = context.pages[-1]
         # Input location name
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Location A')
+        await waits.before_action(page, elem); await elem.fill('Location A')
         
 
         frame = context.pages[-1]
         # Input location short code
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('LA01')
+        await waits.before_action(page, elem); await elem.fill('LA01')
         
 
         frame = context.pages[-1]
         # Click Create Location button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Correct the Short Code input to meet validation requirements and try creating the location again.
         frame = context.pages[-1]
         # Correct Short Code input to meet validation requirements
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('LA-01')
+        await waits.before_action(page, elem); await elem.fill('LA-01')
         
 
         frame = context.pages[-1]
         # Click Create Location button to submit corrected location data
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -161,7 +163,7 @@ async def run_test():
             await expect(frame.locator('text=Warehouse Creation Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Warehouse creation and location creation verification did not succeed as per the test plan. The expected success message 'Warehouse Creation Successful' was not found on the page.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,110 +52,110 @@ async def run_test():
         frame = context.pages[-1]
         # Input username
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input password
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click Sign In button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input correct demo credentials and click Sign In button
         frame = context.pages[-1]
         # Input correct username demo
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input correct password demo123
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button with correct credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on Warehouse link to navigate to Warehouse page
         frame = context.pages[-1]
         # Click on Warehouse link in sidebar to go to Warehouse page
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Attempt to submit the form with invalid data (empty required fields) to check validation errors
         frame = context.pages[-1]
         # Click Create Warehouse button to submit form with invalid data
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Test other invalid data cases by entering invalid characters or incomplete data in the Warehouse form fields and attempt submission
         frame = context.pages[-1]
         # Input invalid characters into Name field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('!@#InvalidName')
+        await waits.before_action(page, elem); await elem.fill('!@#InvalidName')
         
 
         frame = context.pages[-1]
         # Input invalid short code (numeric only)
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123')
+        await waits.before_action(page, elem); await elem.fill('123')
         
 
         frame = context.pages[-1]
         # Leave Address field empty
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Click Create Warehouse button to submit form with invalid data
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to Locations page to test invalid data submission on Location creation/edit form
         frame = context.pages[-1]
         # Click Locations link in sidebar to navigate to Locations page
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Attempt to submit the Location form with missing required fields to check validation errors
         frame = context.pages[-1]
         # Click Create Location button to submit form with missing required fields
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input invalid characters into Name and Short Code fields and attempt to submit Location form to check validation errors
         frame = context.pages[-1]
         # Input invalid characters into Name field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('!@#InvalidName')
+        await waits.before_action(page, elem); await elem.fill('!@#InvalidName')
         
 
         frame = context.pages[-1]
         # Input invalid short code (numeric only)
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123')
+        await waits.before_action(page, elem); await elem.fill('123')
         
 
         frame = context.pages[-1]
         # Click Create Location button to submit form with invalid data
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -162,7 +164,7 @@ async def run_test():
         await expect(frame.locator('text=Short Code').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=warehouse').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Create Location').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,155 +52,155 @@ async def run_test():
         frame = context.pages[-1]
         # Input username in username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input password in password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click Sign In button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Clear username and password fields, input demo/demo123 credentials, and click Sign In button to log in.
         frame = context.pages[-1]
         # Clear username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Input demo username
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the 'Receipt' link to navigate to the receipt creation page.
         frame = context.pages[-1]
         # Click on Receipt link to navigate to receipt creation page
         elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click the NEW button to start creating a new receipt document.
         frame = context.pages[-1]
         # Click NEW button to create a new receipt document
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Fill Supplier field, add multiple product lines with quantities, and save the receipt as Draft.
         frame = context.pages[-1]
         # Input Supplier name
         elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Supplier A')
+        await waits.before_action(page, elem); await elem.fill('Supplier A')
         
 
         frame = context.pages[-1]
         # Input Qty Expected for first product line
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await waits.before_action(page, elem); await elem.fill('10')
         
 
         frame = context.pages[-1]
         # Input Qty Done for first product line
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await waits.before_action(page, elem); await elem.fill('10')
         
 
         frame = context.pages[-1]
         # Click + Add Line to add second product line
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
         # Input Qty Expected for second product line
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        await waits.before_action(page, elem); await elem.fill('5')
         
 
         frame = context.pages[-1]
         # Input Qty Done for second product line
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        await waits.before_action(page, elem); await elem.fill('5')
         
 
         # -> Select 'To Location' for both product lines and then click 'Create Draft' button to save the receipt as Draft.
         frame = context.pages[-1]
         # Click 'Create Draft' button to save the receipt as Draft
         elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Advance the draft receipt through statuses to confirm status transitions.
         frame = context.pages[-1]
         # Click on the draft receipt row WH/IN/001 to open it for status advancement
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click the 'Validate' button to move the receipt from Draft to Ready status.
         frame = context.pages[-1]
         # Click 'Validate' button to move receipt from Draft to Ready
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input username 'demo' and password 'demo123', then click Sign In button to log in.
         frame = context.pages[-1]
         # Input username in login field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input password in password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the 'Receipt' link to navigate to the receipt list page and locate the draft receipt.
         frame = context.pages[-1]
         # Click on Receipt link to navigate to receipt list page
         elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the draft receipt REF67890 to open it and advance its status through the workflow.
         frame = context.pages[-1]
         # Click on the draft receipt REF67890 to open it
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -208,7 +210,7 @@ async def run_test():
         await expect(frame.locator('text=REF67890').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Desk').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=6').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
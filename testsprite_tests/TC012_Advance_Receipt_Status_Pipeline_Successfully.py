@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,175 +52,175 @@ async def run_test():
         frame = context.pages[-1]
         # Input the username in the username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input the password in the password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Clear username and password fields, input demo/demo123 credentials, and click Sign In button to log in.
         frame = context.pages[-1]
         # Clear the username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear the password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Input the username 'demo' in the username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input the password 'demo123' in the password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to log in with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the 'Receipt' tab (index 3) to navigate to the receipt list page and select a Draft receipt.
         frame = context.pages[-1]
         # Click on the 'Receipt' tab to view receipt list
         elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click the 'NEW' button (index 11) to create a new receipt which will be in Draft status initially.
         frame = context.pages[-1]
         # Click the 'NEW' button to create a new Draft receipt
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Fill Reference No, Supplier, select a Product, enter Qty Expected, select To Location, then click 'Create Draft' button to create a Draft receipt.
         frame = context.pages[-1]
         # Input Reference No for the new receipt
         elem = frame.locator('xpath=html/body/div/main/div/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('REF12345')
+        await waits.before_action(page, elem); await elem.fill('REF12345')
         
 
         frame = context.pages[-1]
         # Input Supplier name for the new receipt
         elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Supplier A')
+        await waits.before_action(page, elem); await elem.fill('Supplier A')
         
 
         frame = context.pages[-1]
         # Input Qty Expected as 10
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await waits.before_action(page, elem); await elem.fill('10')
         
 
         frame = context.pages[-1]
         # Click 'Create Draft' button to create the receipt in Draft status
         elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the Draft receipt REF12345 (index 15) to open it and trigger status transition to Ready.
         frame = context.pages[-1]
         # Click on the Draft receipt REF12345 to open it
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click the 'Validate' button (index 12) to transition the receipt status from Draft to Ready and verify the UI updates accordingly.
         frame = context.pages[-1]
         # Click 'Validate' button to transition status from Draft to Ready
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input username 'demo' and password 'demo123' in the login fields and click Sign In button to log in again.
         frame = context.pages[-1]
         # Input username 'demo' in the username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input password 'demo123' in the password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the 'Receipt' tab (index 3) to navigate to the receipt list and open the Draft receipt REF12345 to continue status transition testing.
         frame = context.pages[-1]
         # Click on the 'Receipt' tab to view receipt list
         elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click the 'NEW' button (index 11) to create a new Draft receipt for testing status transitions.
         frame = context.pages[-1]
         # Click the 'NEW' button to create a new Draft receipt
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input Reference No 'REF67890', Supplier 'Supplier B', select Product 'Copper Wire', input Qty Expected '5', select To Location 'Main Warehouse', then click 'Create Draft' button.
         frame = context.pages[-1]
         # Input Reference No for the new receipt
         elem = frame.locator('xpath=html/body/div/main/div/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('REF67890')
+        await waits.before_action(page, elem); await elem.fill('REF67890')
         
 
         frame = context.pages[-1]
         # Input Supplier name for the new receipt
         elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Supplier B')
+        await waits.before_action(page, elem); await elem.fill('Supplier B')
         
 
         frame = context.pages[-1]
         # Input Qty Expected as 5
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('5')
+        await waits.before_action(page, elem); await elem.fill('5')
         
 
         frame = context.pages[-1]
         # Click 'Create Draft' button to create the receipt in Draft status
         elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the Draft receipt REF67890 (index 15) to open it and trigger status transition to Ready.
         frame = context.pages[-1]
         # Click on the Draft receipt REF67890 to open it
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click the 'Validate' button (index 12) to transition the receipt status from Draft to Ready and verify the UI updates accordingly.
         frame = context.pages[-1]
         # Click 'Validate' button to transition status from Draft to Ready
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -227,7 +229,7 @@ async def run_test():
             await expect(frame.locator('text=Receipt Status Transition Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The receipt document status did not transition correctly from Draft to Ready and then Done with corresponding validations as per the test plan.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,96 +52,96 @@ async def run_test():
         frame = context.pages[-1]
         # Input username
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input password
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click Sign In button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input demo/demo123 credentials and click Sign In to login
         frame = context.pages[-1]
         # Input username demo
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input password demo123
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to delivery creation page by clicking Delivery link
         frame = context.pages[-1]
         # Click Delivery link to navigate to delivery creation page
         elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click NEW button to start creating a new delivery document
         frame = context.pages[-1]
         # Click NEW button to create new delivery document
         elem = frame.locator('xpath=html/body/div/main/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Add product line with quantity exceeding free-to-use stock
         frame = context.pages[-1]
         # Input Reference No for delivery document
         elem = frame.locator('xpath=html/body/div/main/div/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('DEL-TEST-001')
+        await waits.before_action(page, elem); await elem.fill('DEL-TEST-001')
         
 
         frame = context.pages[-1]
         # Input Customer name
         elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Customer')
+        await waits.before_action(page, elem); await elem.fill('Test Customer')
         
 
         frame = context.pages[-1]
         # Select product from dropdown
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
         # Input Qty Expected exceeding free-to-use stock
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1000')
+        await waits.before_action(page, elem); await elem.fill('1000')
         
 
         frame = context.pages[-1]
         # Select From Location for product line
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[4]/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Select a From Location for the product line and save the delivery document as Draft
         frame = context.pages[-1]
         # Select From Location option for product line
         elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[4]/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
         # Click Create Draft button to save delivery document as Draft
         elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -148,7 +150,7 @@ async def run_test():
             await expect(frame.locator('text=Delivery Completed Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: Delivery document creation with product lines exceeding free-to-use stock did not advance status past Waiting. Warning about insufficient stock should be shown and status should remain Waiting.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
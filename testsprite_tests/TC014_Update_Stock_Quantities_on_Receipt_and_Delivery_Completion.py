@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,52 +52,52 @@ async def run_test():
         frame = context.pages[-1]
         # Input username in correct username input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input password in correct password input field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click sign in button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input demo username and password and click sign in button to log in.
         frame = context.pages[-1]
         # Input demo username in username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password in password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click sign in button
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on '4 to receive' button to view receipt documents to complete one to Done status.
         frame = context.pages[-1]
         # Click '4 to receive' button to view receipt documents
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the first receipt document WH/IN/0001 to open and complete it to Done status.
         frame = context.pages[-1]
         # Click on receipt document WH/IN/0001 to open it
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -104,7 +106,7 @@ async def run_test():
             await expect(frame.locator('text=Stock quantities updated successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Stock on-hand and free-to-use quantities did not update correctly when receipt or delivery documents reached Done status as per the test plan.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,45 +52,45 @@ async def run_test():
         frame = context.pages[-1]
         # Input the username in the username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Input the password in the password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to log in
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Input username 'demo' and password 'demo123' and click Sign In to log in successfully.
         frame = context.pages[-1]
         # Input the demo username in the username field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input the demo password in the password field
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click the Sign In button to log in with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on 'Products' link to navigate to the Products list view.
         frame = context.pages[-1]
         # Click on 'Products' link to open Products list view
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Scroll down or explore the page to find any hidden or off-screen search or filter input fields for the Products list.
@@ -99,7 +101,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Warehouse' link to open Warehouse list view
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -108,7 +110,7 @@ async def run_test():
             await expect(frame.locator('text=No matching entries found for your search criteria').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test plan execution failed: The search and filter features on products, warehouses, locations, receipts, and deliveries lists did not update the list live to show only matching entries with no errors.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
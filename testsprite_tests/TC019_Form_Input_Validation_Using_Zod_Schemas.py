@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,19 +52,19 @@ async def run_test():
         frame = context.pages[-1]
         # Clear username field to test required field validation
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear password field to test required field validation
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await waits.before_action(page, elem); await elem.fill('')
         
 
         frame = context.pages[-1]
         # Click Sign In button to attempt login with empty fields and trigger validation
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -74,7 +76,7 @@ async def run_test():
         await expect(frame.locator('text=Username').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Password').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Sign In').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
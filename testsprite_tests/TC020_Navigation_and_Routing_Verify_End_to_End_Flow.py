@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -50,99 +52,99 @@ async def run_test():
         frame = context.pages[-1]
         # Click username input field to focus and clear it
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
         # Input username in username field after clearing
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('snehonpurpose')
+        await waits.before_action(page, elem); await elem.fill('snehonpurpose')
         
 
         frame = context.pages[-1]
         # Click password input field to focus and clear it
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         frame = context.pages[-1]
         # Input password in password field after clearing
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Sneh1000')
+        await waits.before_action(page, elem); await elem.fill('Sneh1000')
         
 
         frame = context.pages[-1]
         # Click Sign In button to login
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Use demo/demo123 credentials to login and then start testing navigation components for dashboard, products, warehouses, locations, documents, and settings pages.
         frame = context.pages[-1]
         # Input demo username for login
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo')
+        await waits.before_action(page, elem); await elem.fill('demo')
         
 
         frame = context.pages[-1]
         # Input demo password for login
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('demo123')
+        await waits.before_action(page, elem); await elem.fill('demo123')
         
 
         frame = context.pages[-1]
         # Click Sign In button to login with demo credentials
         elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to the Products page using the sidebar link and verify the page loads correctly.
         frame = context.pages[-1]
         # Click Products link in sidebar to navigate to Products page
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to the Warehouses page under Settings and verify the page loads correctly.
         frame = context.pages[-1]
         # Click Warehouse link under Settings in sidebar to navigate to Warehouses page
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to the Locations page under Settings and verify the page loads correctly.
         frame = context.pages[-1]
         # Click Locations link under Settings in sidebar to navigate to Locations page
         elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to the Documents page and verify the page loads correctly.
         frame = context.pages[-1]
         # Click Move History link in sidebar to navigate to Documents page
         elem = frame.locator('xpath=html/body/div/div/nav/div[4]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Test detail and edit views from the Products listing by clicking on a product link to verify correct page loads without errors.
         frame = context.pages[-1]
         # Click Products link in sidebar to navigate to Products page
         elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Click on the first product (Steel Rod) in the Products listing to open its detail or edit view and verify the page loads correctly without errors.
         frame = context.pages[-1]
         # Click on Steel Rod product row to open detail or edit view
         elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # -> Navigate to the Dashboard page using the sidebar link to verify navigation back to main page works correctly.
         frame = context.pages[-1]
         # Click Dashboard link in sidebar to navigate back to Dashboard page
         elem = frame.locator('xpath=html/body/div/div/nav/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await waits.before_action(page, elem); await elem.click(timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -171,7 +173,7 @@ async def run_test():
         await expect(frame.locator('text=schedule date > today\'s date').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Waiting:').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Waiting for the stocks').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
@@ -2,6 +2,8 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
+import waits
+
 async def run_test():
     pw = None
     browser = None
@@ -52,7 +54,7 @@ async def run_test():
             await expect(frame.locator('text=User registration completed successfully!').first).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError("Test case failed: User registration and password recovery flow did not complete successfully as per the test plan.")
-        await asyncio.sleep(5)
+        await waits.settle(page)
     
     finally:
         if context:
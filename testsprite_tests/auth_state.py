@@ -0,0 +1,103 @@
+"""Log in once per run and hand the session to every test that is not about login.
+
+``login()`` signs in through the NextAuth credentials endpoints under
+``/api/auth`` (no UI), checks ``/api/auth/session`` and saves the browser
+storage state to ``tmp/storage_state.json``. ``run_suite.py`` and the
+pytest fixtures pass that state to the context of every signed-in case.
+``strip_login()`` drops the leading login-form steps from a script and
+starts it on the dashboard instead; ``compile_plan`` applies it to every
+case except the ones that test login (``LOGIN_TESTS``).
+"""
+import json
+import os
+import re
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(HERE, "tmp", "config.json")
+STATE_PATH = os.path.join(HERE, "tmp", "storage_state.json")
+
+# Cases that exercise the login, OTP and signup forms themselves
+LOGIN_TESTS = frozenset({"TC001", "TC002", "TC003", "TC021"})
+# The scripts fall back to this account when the configured one is refused
+DEMO_CREDENTIALS = ("demo", "demo123")
+
+LOGIN_XPATHS = frozenset({
+    "html/body/div/main/div/div/div/form/div/input",
+    "html/body/div/main/div/div/div/form/div[2]/input",
+    "html/body/div/main/div/div/div/form/button",
+})
+_INTERACTION_MARKER = "# Interact with the page elements"
+_STEP_RE = re.compile(
+    r"(?:[ \t]*# -> .*\n)?"
+    r"[ \t]*frame = context\.pages\[-1\]\n"
+    r"(?:[ \t]*#.*\n)*"
+    r"[ \t]*elem = frame\.locator\('xpath=([^']+)'\)\.nth\(\d+\)\n"
+    r"[ \t]*(await .*)\n"
+    r"(?:[ \t]*\n)*"
+)
+_START_URL_RE = re.compile(r"""page\.goto\((["'])(https?://[^/"']+)/?\1""")
+
+
+def strip_login(source):
+    """Return ``source`` without its leading login steps, or unchanged if it has none"""
+    marker = source.find(_INTERACTION_MARKER)
+    if marker < 0:
+        return source
+    start = pos = source.index("\n", marker) + 1
+    submitted = False
+    while True:
+        match = _STEP_RE.match(source, pos)
+        if match is None or match.group(1) not in LOGIN_XPATHS:
+            break
+        submitted = submitted or ".click(" in match.group(2)
+        pos = match.end()
+    if not submitted:
+        return source
+    source = source[:start] + source[pos:]
+    # The home page always redirects to /login; a signed-in run starts where the login would have led
+    return _START_URL_RE.sub(lambda m: f"page.goto({m.group(1)}{m.group(2)}/dashboard{m.group(1)}", source, count=1)
+
+
+def credentials():
+    """Accounts to try, in order: TESTSPRITE_LOGIN_USER/PASSWORD or tmp/config.json, then the demo account"""
+    user = os.environ.get("TESTSPRITE_LOGIN_USER")
+    password = os.environ.get("TESTSPRITE_LOGIN_PASSWORD")
+    if not user:
+        try:
+            with open(CONFIG_PATH, encoding="utf-8") as f:
+                config = json.load(f)
+            user, password = config.get("loginUser"), config.get("loginPassword")
+        except (OSError, ValueError):
+            pass
+    accounts = [(user, password)] if user and password else []
+    if DEMO_CREDENTIALS not in accounts:
+        accounts.append(DEMO_CREDENTIALS)
+    return accounts
+
+
+async def login(browser, base_url, accounts=None, path=STATE_PATH):
+    """Sign in through ``/api/auth`` and return the storage state (also saved to ``path``).
+
+    Raises ``RuntimeError`` if none of the accounts is accepted.
+    """
+    base_url = base_url.rstrip("/")
+    accounts = accounts or credentials()
+    for user, password in accounts:
+        context = await browser.new_context()
+        try:
+            api = context.request
+            csrf = await (await api.get(f"{base_url}/api/auth/csrf")).json()
+            await api.post(f"{base_url}/api/auth/callback/credentials", form={
+                "csrfToken": csrf["csrfToken"],
+                "email": user,
+                "password": password,
+                "callbackUrl": f"{base_url}/dashboard",
+                "json": "true",
+            })
+            session = await (await api.get(f"{base_url}/api/auth/session")).json()
+            if session and session.get("user"):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                return await context.storage_state(path=path)
+        finally:
+            await context.close()
+    raise RuntimeError(f"Could not sign in to {base_url} with any of {len(accounts)} account(s)")
@@ -0,0 +1,207 @@
+"""Compile the TestSprite plan and recordings into one parametrized pytest module.
+
+Every ``TC0xx_*.py`` script repeats the same Playwright start-up, login and
+teardown around a few recorded steps. This generator keeps only the steps:
+for each case in ``testsprite_frontend_test_plan.json`` it takes the body
+of the recorded script (login-form steps removed for cases that are not
+about login, see ``auth_state``) and writes it as one ``async def`` into
+``test_plan_suite.py``. The browser, context, shared login and navigation
+to the start page are fixtures in ``conftest.py``, so the whole plan runs
+in one interpreter with one browser. ``run_suite.py`` runs the same
+functions concurrently and rebuilds the module first if it is stale::
+
+    python testsprite_tests/compile_plan.py            # rebuild changed cases
+    python testsprite_tests/compile_plan.py --check    # exit 1 if the module is stale
+    python -m pytest testsprite_tests -k TC005
+
+Each case's block carries a hash of its plan entry and recording. Blocks
+whose hash still matches are copied over unchanged, so regenerating after
+TestSprite rewrites a few scripts only rebuilds those cases. The module is
+left untouched if nothing changed.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from urllib.parse import urlsplit
+
+import auth_state
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PLAN_PATH = os.path.join(HERE, "testsprite_frontend_test_plan.json")
+SUITE_PATH = os.path.join(HERE, "test_plan_suite.py")
+# Bump when the emitted code changes shape, so every block is rebuilt
+FORMAT = "1"
+
+HEADER = '''\
+"""TestSprite frontend test plan as one parametrized suite.
+
+Generated by compile_plan.py from testsprite_frontend_test_plan.json and the
+TC0xx_*.py recordings; edit those and re-run it rather than editing this file.
+Fixtures are in conftest.py.
+"""
+import asyncio
+
+import pytest
+from playwright import async_api
+from playwright.async_api import expect
+
+import waits
+
+CASES = {}
+
+
+class Case:
+    def __init__(self, id_, title, start, signed_in, steps):
+        self.id = id_
+        self.title = title
+        self.start = start
+        self.signed_in = signed_in
+        self.steps = steps
+
+
+def case(id_, title, start="/", signed_in=False):
+    def register(steps):
+        CASES[id_] = Case(id_, title, start, signed_in, steps)
+        return steps
+    return register
+
+
+'''
+
+FOOTER = '''
+
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES.keys())
+def test_plan(case, context, page, run):
+    run(case.steps(context, page))
+'''
+
+_BLOCK_RE = re.compile(r"^# --- (TC\d+) ([0-9a-f]+) ---\n.*?^# --- end \1 ---\n", re.M | re.S)
+_GOTO_RE = re.compile(r"""page\.goto\((["'])(https?://[^"']+)\1""")
+_FINALLY = "    finally:\n"
+
+
+class CompileError(Exception):
+    pass
+
+
+def digest(entry, source):
+    data = json.dumps(entry, sort_keys=True) + "\0" + source + "\0" + FORMAT
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def recordings():
+    """Map case id to the path of its ``TC0xx_*.py`` recording"""
+    return {os.path.basename(path).split("_", 1)[0]: path
+            for path in sorted(glob.glob(os.path.join(HERE, "TC[0-9]*_*.py")))}
+
+
+def extract(source):
+    """Return ``(start path, recorded steps)`` from a generated TestSprite script"""
+    goto = _GOTO_RE.search(source)
+    marker = source.find(auth_state._INTERACTION_MARKER)
+    if goto is None or marker < 0:
+        raise CompileError("no start page or no recorded steps")
+    start = source.index("\n", marker) + 1
+    end = source.find(_FINALLY, start)
+    if end < 0:
+        raise CompileError("recorded steps are not followed by the usual finally block")
+    lines = [line[4:].rstrip() if line.startswith("        ") else line.strip()
+             for line in source[start:end].splitlines()]
+    while lines and not lines[-1]:
+        lines.pop()
+    return urlsplit(goto.group(2)).path or "/", "\n".join(lines) + "\n"
+
+
+def build(entry, source, hash_):
+    """Emit the block for one case"""
+    id_ = entry["id"]
+    signed_in = False
+    if id_ not in auth_state.LOGIN_TESTS:
+        stripped = auth_state.strip_login(source)
+        signed_in = stripped != source
+        source = stripped
+    start, steps = extract(source)
+    docstring = entry.get("description", "").replace('"""', "'''")
+    args = f"{id_!r}, {entry['title']!r}, start={start!r}" + (", signed_in=True" if signed_in else "")
+    block = (f"# --- {id_} {hash_} ---\n"
+             f"@case({args})\n"
+             f"async def {id_.lower()}(context, page):\n"
+             f'    """{docstring}"""\n'
+             f"{steps}"
+             f"# --- end {id_} ---\n")
+    compile(block, f"<{id_}>", "exec", flags=0, dont_inherit=True)
+    return block
+
+
+def compile_plan(path=SUITE_PATH, force=False):
+    """Return ``(new module text, ids rebuilt, ids reused)``"""
+    with open(PLAN_PATH, encoding="utf-8") as f:
+        plan = json.load(f)
+    try:
+        with open(path, encoding="utf-8") as f:
+            existing = {m.group(1): (m.group(2), m.group(0)) for m in _BLOCK_RE.finditer(f.read())}
+    except FileNotFoundError:
+        existing = {}
+    scripts = recordings()
+    blocks, rebuilt, reused = [], [], []
+    for entry in sorted(plan, key=lambda e: e["id"]):
+        script = scripts.get(entry["id"])
+        if script is None:
+            continue
+        with open(script, encoding="utf-8") as f:
+            source = f.read()
+        hash_ = digest(entry, source)
+        old = existing.get(entry["id"])
+        if old and old[0] == hash_ and not force:
+            blocks.append(old[1])
+            reused.append(entry["id"])
+            continue
+        try:
+            blocks.append(build(entry, source, hash_))
+        except (CompileError, SyntaxError) as e:
+            raise CompileError(f"{os.path.basename(script)}: {e}") from e
+        rebuilt.append(entry["id"])
+    return HEADER + "\n\n".join(blocks) + FOOTER, rebuilt, reused
+
+
+def update(path=SUITE_PATH, force=False, check=False):
+    """Rebuild ``path`` unless it is current (or ``check``); return ``(stale, ids rebuilt, ids reused)``"""
+    text, rebuilt, reused = compile_plan(path, force)
+    try:
+        with open(path, encoding="utf-8") as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    stale = text != current
+    if stale and not check:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return stale, rebuilt, reused
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=SUITE_PATH, help="module to write")
+    parser.add_argument("--force", action="store_true", help="rebuild every case")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the module is out of date, write nothing")
+    args = parser.parse_args()
+
+    try:
+        stale, rebuilt, reused = update(args.output, args.force, args.check)
+    except CompileError as e:
+        print(f"error: {e}")
+        return 1
+    if rebuilt:
+        print("rebuilt: " + " ".join(rebuilt))
+    verb = "out of date" if args.check and stale else "written" if stale else "up to date"
+    print(f"{len(rebuilt) + len(reused)} case(s), {len(rebuilt)} rebuilt, {len(reused)} unchanged; "
+          f"{os.path.basename(args.output)} {verb}")
+    return 1 if args.check and stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Fixtures for ``test_plan_suite.py``, the compiled TestSprite plan.
+
+``run_suite.py`` runs the same cases concurrently and sets them up with the
+same helpers; this is the way to run or debug a few of them under pytest.
+
+One event loop, one Chromium and one login serve the whole session; each
+case gets its own context (signed in unless it tests login itself) and a
+page already on its start URL. The app is ``TESTSPRITE_BASE_URL`` or the
+``localEndpoint`` TestSprite was configured with. If Chromium cannot start
+or the app is not reachable the suite is skipped rather than failed.
+"""
+import asyncio
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+import auth_state
+import run_suite
+
+CASE_TIMEOUT = float(os.environ.get("TESTSPRITE_CASE_TIMEOUT", 600))
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop):
+    """Run a coroutine on the session loop, bounded by the per-case timeout"""
+    def run(coro, timeout=CASE_TIMEOUT):
+        return loop.run_until_complete(asyncio.wait_for(coro, timeout))
+    return run
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    url = os.environ.get("TESTSPRITE_BASE_URL") or run_suite._local_endpoint()
+    try:
+        urllib.request.urlopen(url, timeout=5).close()
+    except urllib.error.HTTPError:
+        pass
+    except OSError as e:
+        pytest.skip(f"app not reachable at {url}: {e}")
+    return url.rstrip("/")
+
+
+@pytest.fixture(scope="session")
+def browser(run):
+    from playwright.async_api import async_playwright
+
+    try:
+        pw = run(async_playwright().start())
+    except Exception as e:
+        pytest.skip(f"Playwright not available: {e}")
+    try:
+        browser = run(pw.chromium.launch(headless=True, args=run_suite.BROWSER_ARGS))
+    except Exception as e:
+        run(pw.stop())
+        pytest.skip(f"Chromium not available: {e}")
+    yield browser
+    run(browser.close())
+    run(pw.stop())
+
+
+@pytest.fixture(scope="session")
+def storage_state(browser, base_url, run):
+    """Session of the one login through ``/api/auth`` shared by the signed-in cases"""
+    return run(auth_state.login(browser, base_url))
+
+
+@pytest.fixture
+def context(case, browser, run, request):
+    state = request.getfixturevalue("storage_state") if case.signed_in else None
+    context = run(run_suite.new_context(browser, state))
+    yield context
+    run(context.close())
+
+
+@pytest.fixture
+def page(case, context, base_url, run):
+    return run(run_suite.open_start_page(context, base_url, case.start))
@@ -0,0 +1,75 @@
+"""Replace the fixed sleeps in generated TestSprite scripts with ``waits`` calls.
+
+Rewrites, line by line so comments and layout survive::
+
+    await page.wait_for_timeout(3000); await elem.click(...)
+        -> await waits.before_action(page, elem); await elem.click(...)
+    await page.wait_for_timeout(3000)   -> await waits.settle(page, timeout=3000)
+    await asyncio.sleep(5)              -> await waits.settle(page)
+
+and adds ``import waits``. Safe to run again on scripts TestSprite has
+regenerated::
+
+    python testsprite_tests/rewrite_waits.py            # rewrite TC*.py in place
+    python testsprite_tests/rewrite_waits.py --check    # exit 1 if any sleeps are left
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_RULES = (
+    (re.compile(r"^(\s*)await page\.wait_for_timeout\(\d+\); await (\w+)\.(\w+)\(", re.M),
+     r"\1await waits.before_action(page, \2); await \2.\3("),
+    (re.compile(r"^(\s*)await page\.wait_for_timeout\((\d+)\)[ \t]*$", re.M),
+     r"\1await waits.settle(page, timeout=\2)"),
+    (re.compile(r"^(\s*)await asyncio\.sleep\([\d.]+\)[ \t]*$", re.M),
+     r"\1await waits.settle(page)"),
+)
+_EXPECT_IMPORT = "from playwright.async_api import expect\n"
+
+
+def rewrite(source):
+    """Return ``(new source, number of sleeps replaced)``"""
+    total = 0
+    for pattern, replacement in _RULES:
+        source, count = pattern.subn(replacement, source)
+        total += count
+    if total and not re.search(r"^import waits$", source, re.M):
+        if _EXPECT_IMPORT in source:
+            source = source.replace(_EXPECT_IMPORT, _EXPECT_IMPORT + "\nimport waits\n", 1)
+        else:
+            source = "import waits\n" + source
+    return source, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="scripts to rewrite (default: TC*.py next to this file)")
+    parser.add_argument("--check", action="store_true", help="report scripts with fixed sleeps, change nothing")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(HERE, "TC[0-9]*_*.py")))
+    changed = replaced = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        new_source, count = rewrite(source)
+        if not count:
+            continue
+        changed += 1
+        replaced += count
+        print(f"{os.path.basename(path)}: {count} sleep(s)")
+        if not args.check:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(new_source)
+    verb = "found" if args.check else "replaced"
+    print(f"{replaced} fixed sleep(s) {verb} in {changed} of {len(paths)} script(s)")
+    return 1 if args.check and replaced else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
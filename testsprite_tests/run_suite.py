@@ -0,0 +1,580 @@
+"""Run the TestSprite cases concurrently against one shared browser.
+
+The cases are the ones compiled into ``test_plan_suite.py`` (see
+``compile_plan``), the same functions ``pytest`` runs; the module is
+rebuilt first if a recording changed. Each case gets its own context in a
+shared browser (one of ``--browsers``) and a page on its start URL, and up
+to ``--concurrency`` cases run at a time on one event loop::
+
+    python testsprite_tests/run_suite.py
+    python testsprite_tests/run_suite.py -k TC00 --concurrency 8 --browsers 2
+
+Every context's fetch/XHR traffic is tracked from the start for the
+``waits`` helpers, and ``--wait-budget`` caps the total time the suite may
+spend waiting on the app.
+
+Before the cases start the runner signs in once through ``/api/auth`` (see
+``auth_state``) and every case compiled without its login-form steps
+starts from that session. With ``--no-shared-login``, or if that login
+fails, each of those cases signs in through the API on its own.
+
+``--workers N`` shards the cases over N processes, each with its own
+browsers, so the suite is not bound to one core. Shards are filled
+longest case first from the durations of earlier runs
+(``tmp/durations.json``). With ``--app-command`` every worker also starts
+its own copy of the app on ``--app-port`` + worker index; the command may
+use ``{port}`` and ``{worker}`` (both also set as ``PORT`` and
+``TESTSPRITE_WORKER``), e.g. to give each worker its own database::
+
+    python testsprite_tests/run_suite.py --workers 8 \
+        --app-command "npx next start -p {port}"
+
+Results are written to ``tmp/test_results.json`` in the shape TestSprite
+produces, keeping the ids and links of cases it already knows about, and
+summarised in ``tmp/raw_report.md``. Every action and assertion, page load
+and API call is timed (see ``timings``); the report lists the slowest of
+them against the previous run.
+Chromium is started without ``--single-process``, which cannot host several
+contexts at once.
+"""
+import argparse
+import ast
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import time
+import traceback
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import auth_state
+import compile_plan
+import timings
+import waits
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(HERE, "tmp", "test_results.json")
+REPORT_PATH = os.path.join(HERE, "tmp", "raw_report.md")
+DURATIONS_PATH = os.path.join(HERE, "tmp", "durations.json")
+PLAN_PATH = os.path.join(HERE, "testsprite_frontend_test_plan.json")
+BROWSER_ARGS = ["--window-size=1280,720", "--disable-dev-shm-usage"]
+DEFAULT_DURATION = 60.0  # seconds assumed for a case that has never run
+VISUALIZATION_URL = "https://www.testsprite.com/dashboard/mcp/tests/{projectId}/{testId}"
+
+
+class TestCase:
+    def __init__(self, id_, title, description, path):
+        self.id = id_
+        self.title = title
+        self.description = description
+        self.path = path
+
+    def source(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def compiled(self):
+        """The case's entry in ``test_plan_suite.py``, with its steps timed"""
+        return load_suite()[self.id]
+
+
+def _step_kind(stmt):
+    calls = [node for node in ast.walk(stmt) if isinstance(node, ast.Call)]
+    if any(isinstance(call.func, ast.Name) and call.func.id == "expect" for call in calls):
+        return "assertion"
+    for node in ast.walk(stmt):
+        if (isinstance(node, ast.Await) and isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Attribute) and node.value.func.attr in timings.ACTIONS):
+            return "navigation" if node.value.func.attr in ("goto", "reload", "go_back") else "action"
+    return None
+
+
+def _step_label(lines, lineno, stmt, kind):
+    """What an assertion checks, else the comment the recorder wrote for the step"""
+    if kind == "assertion":
+        expect = next(node for node in ast.walk(stmt) if isinstance(node, ast.Call)
+                      and isinstance(node.func, ast.Name) and node.func.id == "expect")
+        return ast.unparse(expect.args[0])[:80] if expect.args else "expect()"
+    # The comment sits above the ``elem = ...`` line; a blank line ends the step
+    for line in reversed(lines[:lineno - 1]):
+        line = line.strip()
+        if not line:
+            break
+        if line.startswith("#"):
+            return line.lstrip("#").strip()
+    return ast.unparse(stmt)[:80]
+
+
+def _time_steps(tree, lines):
+    """Wrap each action and assertion of every case function in ``timings.step``.
+
+    Statements sharing a line (``await waits.before_action(...); await
+    elem.click(...)``) are timed together, so a step includes waiting for
+    the app to be ready for it.
+    """
+    for func in tree.body:
+        if not isinstance(func, ast.AsyncFunctionDef):
+            continue
+        body, group = [], []
+        for stmt in func.body + [None]:
+            if group and (stmt is None or stmt.lineno != group[0].lineno):
+                kind = next(filter(None, map(_step_kind, group)), None)
+                if kind is None:
+                    body.extend(group)
+                else:
+                    label = _step_label(lines, group[0].lineno, group[-1], kind)
+                    step = ast.Call(ast.Attribute(ast.Name("__timings__", ast.Load()), "step", ast.Load()),
+                                    [ast.Constant(kind), ast.Constant(label), ast.Constant(group[0].lineno)], [])
+                    body.append(ast.copy_location(ast.AsyncWith([ast.withitem(step)], group), group[0]))
+                group = []
+            if stmt is not None:
+                group.append(stmt)
+        func.body = body
+    ast.fix_missing_locations(tree)
+
+
+@functools.lru_cache(maxsize=None)
+def load_suite(path=compile_plan.SUITE_PATH):
+    """Execute the compiled plan with its steps timed and return its ``CASES``"""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source, path)
+    _time_steps(tree, source.splitlines())
+    namespace = {"__name__": "test_plan_suite", "__file__": path, "__timings__": timings}
+    exec(compile(tree, path, "exec"), namespace)
+    return namespace["CASES"]
+
+
+def discover(select=None):
+    """Return the compiled cases in ``TC0xx_*.py`` order, titled from the test plan"""
+    with open(PLAN_PATH, encoding="utf-8") as f:
+        plan = {entry["id"]: entry for entry in json.load(f)}
+    compiled = load_suite()
+    cases = []
+    for id_, path in sorted(compile_plan.recordings().items()):
+        if id_ not in compiled:
+            continue
+        if select and not any(s in os.path.basename(path) for s in select):
+            continue
+        entry = plan.get(id_, {})
+        title = entry.get("title") or os.path.basename(path)[len(id_) + 1:-3].replace("_", " ")
+        cases.append(TestCase(id_, title, entry.get("description", ""), path))
+    return cases
+
+
+async def new_context(browser, storage_state=None):
+    """A context for one case, its requests tracked for ``waits`` and ``timings``"""
+    kwargs = {"storage_state": storage_state} if storage_state is not None else {}
+    context = await browser.new_context(**kwargs)
+    context.set_default_timeout(5000)
+    waits.track(context)
+    timings.watch(context)
+    return context
+
+
+async def open_start_page(context, base_url, start):
+    """Open a page on the case's start path and wait for its frames to load"""
+    page = await context.new_page()
+    await page.goto(base_url.rstrip("/") + start, wait_until="commit", timeout=10000)
+    for frame in page.frames:
+        try:
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
+        except Exception:
+            pass
+    return page
+
+
+async def run_case(case, browser, timeout, storage_state=None, base_url=None):
+    """Run one compiled case in its own context.
+
+    A signed-in case without a shared ``storage_state`` signs in on its own.
+    """
+    base_url = base_url or _local_endpoint()
+    result = {"id": case.id, "status": "FAILED", "error": "", "started": time.time()}
+    recorder = timings.start()
+    start = time.perf_counter()
+    contexts = []
+
+    async def run():
+        compiled = case.compiled()
+        state = None
+        if compiled.signed_in:
+            state = storage_state or await auth_state.login(
+                browser, base_url, path=auth_state.STATE_PATH.replace(".json", f".{case.id}.json"))
+        context = await new_context(browser, state)
+        contexts.append(context)
+        page = await open_start_page(context, base_url, compiled.start)
+        await compiled.steps(context, page)
+
+    try:
+        await asyncio.wait_for(run(), timeout)
+        result["status"] = "PASSED"
+    except asyncio.TimeoutError:
+        result["error"] = f"Timed out after {timeout:g}s"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=-3)}".strip()
+    finally:
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        result["duration"] = time.perf_counter() - start
+        result["finished"] = time.time()
+        result["timings"] = recorder.as_dict()
+    return result
+
+
+async def run_cases(cases, concurrency=4, browsers=1, timeout=600.0, headless=True, base_url=None,
+                    shared_login=True, state_path=auth_state.STATE_PATH, label=""):
+    """Run ``cases`` against ``base_url`` (default: TestSprite's ``localEndpoint``).
+
+    With ``shared_login`` sign in there first and share the session.
+    """
+    from playwright.async_api import async_playwright
+
+    results = []
+    async with async_playwright() as pw:
+        pool = [await pw.chromium.launch(headless=headless, args=BROWSER_ARGS) for _ in range(browsers)]
+        limit = asyncio.Semaphore(concurrency)
+        storage_state = None
+        if shared_login:
+            try:
+                storage_state = await auth_state.login(pool[0], base_url or _local_endpoint(), path=state_path)
+            except Exception as e:
+                print(f"{label}shared login failed, every signed-in case logs in itself: {e}", flush=True)
+
+        async def run(index, case):
+            async with limit:
+                result = await run_case(case, pool[index % len(pool)], timeout, storage_state, base_url)
+            mark = "ok" if result["status"] == "PASSED" else "FAIL"
+            print(f"{label}{mark:<5}{case.id}  {case.title}  ({result['duration']:.1f}s)", flush=True)
+            if result["error"]:
+                print(f"{label}      " + result["error"].splitlines()[0], flush=True)
+            results.append(result)
+
+        await asyncio.gather(*(run(i, case) for i, case in enumerate(cases)))
+        for browser in pool:
+            await browser.close()
+    order = {case.id: i for i, case in enumerate(cases)}
+    return sorted(results, key=lambda r: order[r["id"]])
+
+
+def load_durations(path=DURATIONS_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(results, path=DURATIONS_PATH):
+    """Record how long each case took, for the next run's schedule"""
+    durations = load_durations(path)
+    durations.update({result["id"]: round(result["duration"], 2) for result in results})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(durations.items())), f, indent=2)
+        f.write("\n")
+
+
+def schedule(cases, workers, durations):
+    """Split ``cases`` into ``workers`` shards, longest processing time first.
+
+    Each case goes to the shard with the least expected work so far, and
+    every shard lists its cases longest first. Cases without a recorded
+    duration are assumed to take the median of the known ones.
+    """
+    known = sorted(durations[case.id] for case in cases if case.id in durations)
+    default = known[len(known) // 2] if known else DEFAULT_DURATION
+    shards = [[] for _ in range(max(1, min(workers, len(cases))))]
+    loads = [0.0] * len(shards)
+    for case in sorted(cases, key=lambda case: -durations.get(case.id, default)):
+        i = loads.index(min(loads))
+        shards[i].append(case)
+        loads[i] += durations.get(case.id, default)
+    return shards
+
+
+def _start_app(command, port, worker, timeout=120.0):
+    """Start one app instance for a worker and wait until it answers"""
+    env = dict(os.environ, PORT=str(port), TESTSPRITE_WORKER=str(worker))
+    process = subprocess.Popen(command.format(port=port, worker=worker), shell=True, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT, start_new_session=True)
+    url = f"http://localhost:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app for worker {worker} exited with {process.returncode}")
+        try:
+            urllib.request.urlopen(url, timeout=2).close()
+            return process, url
+        except urllib.error.HTTPError:
+            return process, url
+        except OSError:
+            time.sleep(0.5)
+    _stop_app(process)
+    raise RuntimeError(f"app for worker {worker} did not answer on {url} within {timeout:g}s")
+
+
+def _stop_app(process):
+    try:
+        os.killpg(process.pid, 15)
+        process.wait(10)
+    except (OSError, subprocess.TimeoutExpired):
+        process.kill()
+
+
+def _run_shard(worker, cases, options):
+    """Worker process: run one shard with its own browsers (and app)"""
+    waits.BUDGET.start(options["wait_budget"])
+    label = f"[{worker}] "
+    app, base_url = None, options["base_url"]
+    try:
+        if options["app_command"]:
+            app, base_url = _start_app(options["app_command"], options["app_port"] + worker, worker)
+        state_path = auth_state.STATE_PATH.replace(".json", f".{worker}.json")
+        return asyncio.run(run_cases(cases, options["concurrency"], options["browsers"], options["timeout"],
+                                     options["headless"], base_url, options["shared_login"], state_path, label))
+    except Exception as e:
+        # The whole shard failed to start; report every case so nothing goes missing
+        now = time.time()
+        return [{"id": case.id, "status": "FAILED", "error": f"{label}{type(e).__name__}: {e}",
+                 "started": now, "finished": now, "duration": 0.0} for case in cases]
+    finally:
+        if app is not None:
+            _stop_app(app)
+
+
+def run_sharded(cases, workers, options):
+    """Run the shards in ``workers`` processes and merge their results in case order"""
+    shards = schedule(cases, workers, load_durations())
+    for i, shard in enumerate(shards):
+        print(f"[{i}] " + " ".join(case.id for case in shard), flush=True)
+    # Playwright's driver does not survive fork(); every worker starts clean
+    with ProcessPoolExecutor(len(shards), mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(_run_shard, i, shard, options) for i, shard in enumerate(shards)]
+        results = [result for future in futures for result in future.result()]
+    order = {case.id: i for i, case in enumerate(cases)}
+    return sorted(results, key=lambda r: order[r["id"]])
+
+
+def _local_endpoint():
+    """The app TestSprite was pointed at (``localEndpoint`` in tmp/config.json)"""
+    try:
+        with open(auth_state.CONFIG_PATH, encoding="utf-8") as f:
+            return json.load(f).get("localEndpoint") or "http://localhost:3000"
+    except (OSError, ValueError):
+        return "http://localhost:3000"
+
+
+def _timestamp(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def write_results(cases, results, path=RESULTS_PATH):
+    """Update ``path`` with one TestSprite-style entry per case that ran"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        entries = []
+    by_id = {entry["title"].split("-", 1)[0]: entry for entry in entries}
+    template = entries[0] if entries else {}
+    by_case = {case.id: case for case in cases}
+    for result in results:
+        case = by_case[result["id"]]
+        entry = by_id.get(case.id)
+        if entry is None:
+            entry = {
+                "projectId": template.get("projectId"),
+                "testId": str(uuid.uuid4()),
+                "userId": template.get("userId"),
+                "title": f"{case.id}-{case.title}",
+                "description": case.description,
+                "code": "",
+                "testStatus": "",
+                "testError": "",
+                "testType": "FRONTEND",
+                "createFrom": "local",
+                "testVisualization": None,
+                "created": _timestamp(result["started"]),
+                "modified": "",
+            }
+            entries.append(entry)
+            by_id[case.id] = entry
+        entry["code"] = case.source()
+        entry["testStatus"] = result["status"]
+        entry["testError"] = result["error"]
+        entry["modified"] = _timestamp(result["finished"])
+    entries.sort(key=lambda entry: entry["title"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def write_report(cases, results, results_path=RESULTS_PATH, path=REPORT_PATH, previous=None):
+    """Rewrite ``path`` in TestSprite's raw report layout from the merged results.
+
+    ``previous`` is the last saved ``timings`` run, for the performance section.
+    """
+    with open(results_path, encoding="utf-8") as f:
+        entries = {entry["title"].split("-", 1)[0]: entry for entry in json.load(f)}
+    with open(PLAN_PATH, encoding="utf-8") as f:
+        categories = {entry["id"]: entry.get("category", "") for entry in json.load(f)}
+    project = os.path.basename(os.path.dirname(HERE))
+    try:
+        with open(path, encoding="utf-8") as f:
+            match = re.search(r"\*\*Project Name:\*\* (.+)", f.read())
+        project = match.group(1).strip() if match else project
+    except OSError:
+        pass
+    durations = {result["id"]: result["duration"] for result in results}
+    scripts = {case.id: os.path.basename(case.path) for case in cases}
+
+    lines = ["", "# TestSprite AI Testing Report(MCP)", "", "---", "",
+             "## 1️⃣ Document Metadata",
+             f"- **Project Name:** {project}",
+             f"- **Date:** {datetime.now().date().isoformat()}",
+             "- **Prepared by:** run_suite.py", "", "---", "",
+             "## 2️⃣ Requirement Validation Summary", ""]
+    for id_, entry in sorted(entries.items()):
+        passed = entry["testStatus"] == "PASSED"
+        script = scripts.get(id_) or f"{id_}.py"
+        if id_ in durations:
+            finding = f"Ran locally in {durations[id_]:.1f}s."
+        else:
+            finding = "Not run in this session; status from the previous run."
+        if entry["testError"]:
+            finding += f" {entry['testError'].splitlines()[0]}"
+        lines += [f"#### Test {id_}",
+                  f"- **Test Name:** {entry['title'].split('-', 1)[-1]}",
+                  f"- **Test Code:** [{script}](./{script})"]
+        if entry.get("projectId"):
+            lines.append(f"- **Test Visualization and Result:** {VISUALIZATION_URL.format(**entry)}")
+        lines += [f"- **Status:** {'✅ Passed' if passed else '❌ Failed'}",
+                  f"- **Analysis / Findings:** {finding}", "---", ""]
+
+    total = len(entries)
+    passed = sum(entry["testStatus"] == "PASSED" for entry in entries.values())
+    by_category = {}
+    for id_, entry in entries.items():
+        counts = by_category.setdefault(categories.get(id_) or "uncategorised", [0, 0])
+        counts[0 if entry["testStatus"] == "PASSED" else 1] += 1
+    lines += ["", "## 3️⃣ Coverage & Matching Metrics", "",
+              f"- **{100 * passed / total if total else 0:.2f}** of tests passed", "",
+              "| Requirement        | Total Tests | ✅ Passed | ❌ Failed  |",
+              "|--------------------|-------------|-----------|------------|"]
+    for category, (ok, failed) in sorted(by_category.items()):
+        lines.append(f"| {category.capitalize():<18} | {ok + failed:<11} | {ok:<9} | {failed:<10} |")
+    failures = [f"- {id_}: {entry['testError'].splitlines()[0] if entry['testError'] else 'failed'}"
+                for id_, entry in sorted(entries.items()) if entry["testStatus"] != "PASSED"]
+    lines += ["---", "", "", "## 4️⃣ Key Gaps / Risks"] + (failures or ["No failing tests."]) + ["---"]
+    lines += _performance_section({result["id"]: result.get("timings") for result in results}, previous)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def _performance_section(run, previous):
+    lines = ["", "", "## 5️⃣ Performance", ""]
+    if previous:
+        lines.append(f"Compared with the run of {previous['run']}. ⚠️ marks steps that got slower "
+                     f"by more than {timings.REGRESSION_RATIO - 1:.0%} and {timings.REGRESSION_SECONDS:g}s.")
+    else:
+        lines.append("No previous run to compare with.")
+    steps = timings.slowest_steps(run, previous)
+    lines += ["", "#### Slowest steps", "",
+              "| Test  | Kind       | Step | Line | Seconds | Previous | Change |",
+              "|-------|------------|------|------|---------|----------|--------|"]
+    for id_, step, before in steps:
+        label = step["label"].replace("|", "\\|")
+        mark = "" if step["ok"] else " ❌"
+        lines.append(f"| {id_} | {step['kind']} | {label}{mark} | {step['line']} | {step['seconds']:.2f} | "
+                     f"{'' if before is None else f'{before:.2f}'} | {timings.change(step['seconds'], before)} |")
+    requests = timings.slowest_requests(run, previous)
+    lines += ["", "#### Slowest page loads and API calls", ""]
+    if not requests:
+        lines.append("No requests were recorded.")
+    else:
+        lines += ["| Kind       | Request | Count | Mean s | Max s | Previous mean s | Change |",
+                  "|------------|---------|-------|--------|-------|-----------------|--------|"]
+        for kind, method, path_, count, mean, worst, before in requests:
+            lines.append(f"| {kind} | {method} {path_} | {count} | {mean:.3f} | {worst:.3f} | "
+                         f"{'' if before is None else f'{before:.3f}'} | {timings.change(mean, before)} |")
+    lines.append("---")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="select", action="append", help="only run cases whose file name contains this")
+    parser.add_argument("--concurrency", type=int, default=4, help="cases running at once (per worker)")
+    parser.add_argument("--browsers", type=int, default=1, help="browsers the cases are spread over (per worker)")
+    parser.add_argument("--workers", type=int, default=1, help="processes to shard the cases over, 0 for one per CPU")
+    parser.add_argument("--app-command", help="start an app per worker; may use {port} and {worker}")
+    parser.add_argument("--app-port", type=int, default=3100, help="port of worker 0's app")
+    parser.add_argument("--timeout", type=float, default=600.0, help="seconds per case")
+    parser.add_argument("--wait-budget", type=float, default=waits.BUDGET.seconds,
+                        help="seconds the whole suite may spend in waits (TESTSPRITE_WAIT_BUDGET)")
+    parser.add_argument("--base-url", default=_local_endpoint(), help="app to sign in to once for the run")
+    parser.add_argument("--no-shared-login", action="store_true",
+                        help="let every signed-in case log in on its own instead of once per run")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--results", default=RESULTS_PATH, help="where to write the results")
+    parser.add_argument("--report", default=REPORT_PATH, help="where to write the markdown report")
+    args = parser.parse_args()
+
+    try:
+        stale, rebuilt, _ = compile_plan.update()
+    except compile_plan.CompileError as e:
+        print(f"error: {e}")
+        return 1
+    if stale:
+        print(f"{os.path.basename(compile_plan.SUITE_PATH)} rebuilt: {' '.join(rebuilt) or 'header'}", flush=True)
+    cases = discover(args.select)
+    if not cases:
+        print("no test cases selected")
+        return 1
+    workers = args.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers > 1 or args.app_command:
+        results = run_sharded(cases, workers, {
+            "concurrency": args.concurrency,
+            "browsers": args.browsers,
+            "timeout": args.timeout,
+            "headless": not args.headed,
+            "base_url": args.base_url,
+            "shared_login": not args.no_shared_login,
+            "wait_budget": args.wait_budget,
+            "app_command": args.app_command,
+            "app_port": args.app_port,
+        })
+    else:
+        waits.BUDGET.start(args.wait_budget)
+        results = asyncio.run(run_cases(cases, args.concurrency, args.browsers, args.timeout, not args.headed,
+                                        args.base_url, not args.no_shared_login))
+    elapsed = time.perf_counter() - start
+    write_results(cases, results, args.results)
+    previous = timings.load_latest()
+    write_report(cases, results, args.results, args.report, previous)
+    save_durations(results)
+    timings.save({result["id"]: result.get("timings") for result in results})
+
+    passed = sum(result["status"] == "PASSED" for result in results)
+    serial = sum(result["duration"] for result in results)
+    print(f"\n{passed}/{len(results)} passed in {elapsed:.1f}s "
+          f"({serial:.1f}s of test time, {serial / elapsed if elapsed else 0:.1f}x concurrency)")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
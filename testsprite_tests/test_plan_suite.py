@@ -0,0 +1,1079 @@
+"""TestSprite frontend test plan as one parametrized suite.
+
+Generated by compile_plan.py from testsprite_frontend_test_plan.json and the
+TC0xx_*.py recordings; edit those and re-run it rather than editing this file.
+Fixtures are in conftest.py.
+"""
+import asyncio
+
+import pytest
+from playwright import async_api
+from playwright.async_api import expect
+
+import waits
+
+CASES = {}
+
+
+class Case:
+    def __init__(self, id_, title, start, signed_in, steps):
+        self.id = id_
+        self.title = title
+        self.start = start
+        self.signed_in = signed_in
+        self.steps = steps
+
+
+def case(id_, title, start="/", signed_in=False):
+    def register(steps):
+        CASES[id_] = Case(id_, title, start, signed_in, steps)
+        return steps
+    return register
+
+
+# --- TC001 34e738d29df89e61 ---
+@case('TC001', 'User Login with Correct Credentials', start='/')
+async def tc001(context, page):
+    """Verify that a user can successfully log in using valid username/password and lands on the dashboard page."""
+    # -> Input valid username and password into correct input fields
+    frame = context.pages[-1]
+    # Input valid username in Username field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('snehonpurpose')
+
+
+    frame = context.pages[-1]
+    # Input valid password in Password field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Sneh1000')
+
+
+    frame = context.pages[-1]
+    # Click Sign In button to submit login form
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Input demo/demo123 credentials and attempt login
+    frame = context.pages[-1]
+    # Input demo username in Username field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('demo')
+
+
+    frame = context.pages[-1]
+    # Input demo password in Password field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('demo123')
+
+
+    frame = context.pages[-1]
+    # Click Sign In button to submit login form with demo credentials
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=Dashboard').first).to_be_visible(timeout=30000)
+    await waits.settle(page)
+# --- end TC001 ---
+
+
+# --- TC002 d9dec0c9cf376204 ---
+@case('TC002', 'User Login with Incorrect Credentials', start='/')
+async def tc002(context, page):
+    """Verify login fails and appropriate error message is shown with invalid username or password input."""
+    # -> Input invalid username 'snehonpurpose' into username field (index 13) and password 'Sneh1000' into password field (index 14)
+    frame = context.pages[-1]
+    # Input invalid username in username input field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('snehonpurpose')
+
+
+    frame = context.pages[-1]
+    # Input invalid password in password input field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Sneh1000')
+
+
+    frame = context.pages[-1]
+    # Click Sign In button to attempt login with invalid credentials
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=Invalid credentials.').first).to_be_visible(timeout=30000)
+    await waits.settle(page)
+# --- end TC002 ---
+
+
+# --- TC003 41d39fad354d2d37 ---
+@case('TC003', 'OTP Email Authentication Success Flow', start='/')
+async def tc003(context, page):
+    """Verify the user can request OTP sent to email, input OTP, verify token, and login successfully with JWT issued."""
+    # -> Click on 'Login with Email OTP' button to navigate to OTP login page
+    frame = context.pages[-1]
+    # Click on 'Login with Email OTP' button to go to OTP login page
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=OTP Verification Successful').first).to_be_visible(timeout=30000)
+    except AssertionError:
+        raise AssertionError('Test case failed: OTP login process did not complete successfully. OTP email was not confirmed sent, OTP input or verification failed, or JWT token was not issued and user was not redirected to dashboard as expected.')
+    await waits.settle(page)
+# --- end TC003 ---
+
+
+# --- TC004 1514e1a9deb738e7 ---
+@case('TC004', 'Dashboard Displays Receipt and Delivery Statistics Correctly', start='/dashboard', signed_in=True)
+async def tc004(context, page):
+    """Verify dashboard shows accurate counts for receipts, deliveries, late, waiting, and operational statuses."""
+    # -> Navigate to Receipt page to extract backend data for receipts to verify dashboard counts
+    frame = context.pages[-1]
+    # Click on Receipt link in sidebar to view receipt details for backend data verification
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate back to Dashboard to verify receipt counts against extracted data
+    frame = context.pages[-1]
+    # Click Dashboard link in sidebar to return to dashboard page
+    elem = frame.locator('xpath=html/body/div/div/nav/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate to Delivery page to extract backend data for deliveries to verify dashboard counts
+    frame = context.pages[-1]
+    # Click on Delivery link in sidebar to view delivery details for backend data verification
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a[2]').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Scroll down or interact to load more delivery orders or statuses to verify dashboard counts for late, waiting, and operational deliveries
+    await page.mouse.wheel(0, 200)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Dashboard Data Verification Failed').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Dashboard statistics widgets do not show accurate counts for receipts, deliveries, late, waiting, and operational statuses as per backend data verification.")
+    await waits.settle(page)
+# --- end TC004 ---
+
+
+# --- TC005 7bfcc41b9d135062 ---
+@case('TC005', 'Create New Product with Valid Data', start='/dashboard', signed_in=True)
+async def tc005(context, page):
+    """Verify user can create a new product with all required fields and the product appears in the listing."""
+    # -> Click on the 'Products' tab to navigate to the product listing page.
+    frame = context.pages[-1]
+    # Click on the 'Products' tab to go to product listing page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Locate and click the button or link to create a new product.
+    frame = context.pages[-1]
+    # Click the Loading... button which might be the add new product button or look for other buttons if this is not correct
+    elem = frame.locator('xpath=html/body/header/div[2]/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Product Creation Failed').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The test plan execution has failed. User was unable to create a new product with all required fields and the product does not appear in the listing.")
+    await waits.settle(page)
+# --- end TC005 ---
+
+
+# --- TC006 c3e50c74d83ec77b ---
+@case('TC006', 'Fail to Create Product with Invalid Data', start='/dashboard', signed_in=True)
+async def tc006(context, page):
+    """Verify that form validation prevents product creation with missing or invalid inputs and displays errors."""
+    # -> Click on 'Products' link to navigate to the product creation page.
+    frame = context.pages[-1]
+    # Click on 'Products' link in the sidebar to go to product creation page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Locate and click the button or link to open the product creation form.
+    frame = context.pages[-1]
+    # Click the 'Loading...' button or any visible button that might open the product creation form
+    elem = frame.locator('xpath=html/body/header/div[2]/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Try to find another way to open the product creation form or report the issue and stop.
+    frame = context.pages[-1]
+    # Click the 'Settings' button to check if product creation form is accessible there
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Product Created Successfully').first).to_be_visible(timeout=3000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Form validation did not prevent product creation with missing or invalid inputs, or validation errors were not displayed as expected.")
+    await waits.settle(page)
+# --- end TC006 ---
+
+
+# --- TC007 5e120216953905fc ---
+@case('TC007', 'Edit Existing Product Details Successfully', start='/dashboard', signed_in=True)
+async def tc007(context, page):
+    """Verify user can edit an existing product’s details and the changes persist and reflect correctly."""
+    # -> Click on the 'Products' tab to navigate to the product list page.
+    frame = context.pages[-1]
+    # Click on the 'Products' tab to navigate to the product list page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the first product 'Steel Rod' to open its detail page.
+    frame = context.pages[-1]
+    # Click on the 'Steel Rod' product row to open its detail page
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Scroll down to reveal the product details and edit form on the product detail page.
+    await page.mouse.wheel(0, 200)
+
+
+    # -> Scroll down further or look for an 'Extend' button or link to reveal product details and edit form.
+    await page.mouse.wheel(0, 300)
+
+
+    # -> Navigate back to the product list page and check if there is an edit button or option for the product there.
+    frame = context.pages[-1]
+    # Click on the 'Products' tab to go back to the product list page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Try clicking on the product row 'Steel Rod' again to see if it opens an editable detail view or reveals edit options.
+    frame = context.pages[-1]
+    # Click on the 'Steel Rod' product row to attempt to open editable detail view
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Product Update Successful').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The test plan execution failed to verify that the user can edit an existing product's details and that the changes persist and reflect correctly.")
+    await waits.settle(page)
+# --- end TC007 ---
+
+
+# --- TC008 fea1c8fc1e75bc53 ---
+@case('TC008', 'Delete Product from Listing', start='/dashboard', signed_in=True)
+async def tc008(context, page):
+    """Verify user can delete a product and it no longer appears in the product list."""
+    # -> Click on the 'Products' tab (index 6) in the sidebar to navigate to the product list page.
+    frame = context.pages[-1]
+    # Click on 'Products' tab to navigate to product list page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the product row 'Steel Rod' (index 12) to select it and look for delete option.
+    frame = context.pages[-1]
+    # Select product 'Steel Rod' row to trigger delete action
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Product deletion successful').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The product was not deleted successfully as per the test plan. The product still appears in the product list, indicating the deletion did not occur or was not confirmed.")
+    await waits.settle(page)
+# --- end TC008 ---
+
+
+# --- TC009 7277dec9b2b31ea4 ---
+@case('TC009', 'Create New Warehouse with Location Assignments', start='/dashboard', signed_in=True)
+async def tc009(context, page):
+    """Verify that a user can create a warehouse and within it create multiple locations, which are available in dropdowns."""
+    # -> Navigate to warehouse creation page by clicking 'Warehouse' in the Settings menu.
+    frame = context.pages[-1]
+    # Click Warehouse link in Settings menu
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Input valid warehouse details and submit the form to create a warehouse.
+    frame = context.pages[-1]
+    # Input warehouse name
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Test Warehouse')
+
+
+    frame = context.pages[-1]
+    # Input warehouse short code
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('TW01')
+
+
+    frame = context.pages[-1]
+    # Input warehouse address
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[3]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('123 Test Address, Test City')
+
+
+    frame = context.pages[-1]
+    # Click Create Warehouse button
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate to Locations page within the warehouse to proceed with location creation.
+    frame = context.pages[-1]
+    # Click Locations link in Settings menu to navigate to locations page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a[2]').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Input valid location details and create multiple locations.
+    frame = context.pages[-1]
+    # Input location name
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Location A')
+
+
+    frame = context.pages[-1]
+    # Input location short code
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('LA01')
+
+
+    frame = context.pages[-1]
+    # Click Create Location button
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Correct the Short Code input to meet validation requirements and try creating the location again.
+    frame = context.pages[-1]
+    # Correct Short Code input to meet validation requirements
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('LA-01')
+
+
+    frame = context.pages[-1]
+    # Click Create Location button to submit corrected location data
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Warehouse Creation Successful').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Warehouse creation and location creation verification did not succeed as per the test plan. The expected success message 'Warehouse Creation Successful' was not found on the page.")
+    await waits.settle(page)
+# --- end TC009 ---
+
+
+# --- TC010 fcbfc3a64c17dbb6 ---
+@case('TC010', 'Warehouse and Location CRUD Validation Errors', start='/dashboard', signed_in=True)
+async def tc010(context, page):
+    """Ensure that attempts to create or update warehouses or locations with invalid data are blocked with user-friendly validation errors."""
+    # -> Click on Warehouse link to navigate to Warehouse page
+    frame = context.pages[-1]
+    # Click on Warehouse link in sidebar to go to Warehouse page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Attempt to submit the form with invalid data (empty required fields) to check validation errors
+    frame = context.pages[-1]
+    # Click Create Warehouse button to submit form with invalid data
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test other invalid data cases by entering invalid characters or incomplete data in the Warehouse form fields and attempt submission
+    frame = context.pages[-1]
+    # Input invalid characters into Name field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('!@#InvalidName')
+
+
+    frame = context.pages[-1]
+    # Input invalid short code (numeric only)
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('123')
+
+
+    frame = context.pages[-1]
+    # Leave Address field empty
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[3]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('')
+
+
+    frame = context.pages[-1]
+    # Click Create Warehouse button to submit form with invalid data
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate to Locations page to test invalid data submission on Location creation/edit form
+    frame = context.pages[-1]
+    # Click Locations link in sidebar to navigate to Locations page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a[2]').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Attempt to submit the Location form with missing required fields to check validation errors
+    frame = context.pages[-1]
+    # Click Create Location button to submit form with missing required fields
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Input invalid characters into Name and Short Code fields and attempt to submit Location form to check validation errors
+    frame = context.pages[-1]
+    # Input invalid characters into Name field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('!@#InvalidName')
+
+
+    frame = context.pages[-1]
+    # Input invalid short code (numeric only)
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('123')
+
+
+    frame = context.pages[-1]
+    # Click Create Location button to submit form with invalid data
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[4]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=Name').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Short Code').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=warehouse').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Create Location').first).to_be_visible(timeout=30000)
+    await waits.settle(page)
+# --- end TC010 ---
+
+
+# --- TC011 5d9b6f07d0a28297 ---
+@case('TC011', 'Create Receipt Document with Valid Product Lines', start='/dashboard', signed_in=True)
+async def tc011(context, page):
+    """Verify the receipt document can be created with multiple product lines, saved as Draft, and later advanced through statuses."""
+    # -> Click on the 'Receipt' link to navigate to the receipt creation page.
+    frame = context.pages[-1]
+    # Click on Receipt link to navigate to receipt creation page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the NEW button to start creating a new receipt document.
+    frame = context.pages[-1]
+    # Click NEW button to create a new receipt document
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Fill Supplier field, add multiple product lines with quantities, and save the receipt as Draft.
+    frame = context.pages[-1]
+    # Input Supplier name
+    elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Supplier A')
+
+
+    frame = context.pages[-1]
+    # Input Qty Expected for first product line
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('10')
+
+
+    frame = context.pages[-1]
+    # Input Qty Done for first product line
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[3]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('10')
+
+
+    frame = context.pages[-1]
+    # Click + Add Line to add second product line
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Input Qty Expected for second product line
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('5')
+
+
+    frame = context.pages[-1]
+    # Input Qty Done for second product line
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[3]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('5')
+
+
+    # -> Select 'To Location' for both product lines and then click 'Create Draft' button to save the receipt as Draft.
+    frame = context.pages[-1]
+    # Click 'Create Draft' button to save the receipt as Draft
+    elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Advance the draft receipt through statuses to confirm status transitions.
+    frame = context.pages[-1]
+    # Click on the draft receipt row WH/IN/001 to open it for status advancement
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Validate' button to move the receipt from Draft to Ready status.
+    frame = context.pages[-1]
+    # Click 'Validate' button to move receipt from Draft to Ready
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Input username 'demo' and password 'demo123', then click Sign In button to log in.
+    frame = context.pages[-1]
+    # Input username in login field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('demo')
+
+
+    frame = context.pages[-1]
+    # Input password in password field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('demo123')
+
+
+    frame = context.pages[-1]
+    # Click Sign In button to log in
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the 'Receipt' link to navigate to the receipt list page and locate the draft receipt.
+    frame = context.pages[-1]
+    # Click on Receipt link to navigate to receipt list page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the draft receipt REF67890 to open it and advance its status through the workflow.
+    frame = context.pages[-1]
+    # Click on the draft receipt REF67890 to open it
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=Receipt').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Draft').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=REF67890').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Desk').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=6').first).to_be_visible(timeout=30000)
+    await waits.settle(page)
+# --- end TC011 ---
+
+
+# --- TC012 fb6d95c4a56d5a43 ---
+@case('TC012', 'Advance Receipt Status Pipeline Successfully', start='/dashboard', signed_in=True)
+async def tc012(context, page):
+    """Confirm receipt document status transitions correctly from Draft to Ready and then Done with corresponding validations."""
+    # -> Click on the 'Receipt' tab (index 3) to navigate to the receipt list page and select a Draft receipt.
+    frame = context.pages[-1]
+    # Click on the 'Receipt' tab to view receipt list
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'NEW' button (index 11) to create a new receipt which will be in Draft status initially.
+    frame = context.pages[-1]
+    # Click the 'NEW' button to create a new Draft receipt
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Fill Reference No, Supplier, select a Product, enter Qty Expected, select To Location, then click 'Create Draft' button to create a Draft receipt.
+    frame = context.pages[-1]
+    # Input Reference No for the new receipt
+    elem = frame.locator('xpath=html/body/div/main/div/form/div/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('REF12345')
+
+
+    frame = context.pages[-1]
+    # Input Supplier name for the new receipt
+    elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Supplier A')
+
+
+    frame = context.pages[-1]
+    # Input Qty Expected as 10
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('10')
+
+
+    frame = context.pages[-1]
+    # Click 'Create Draft' button to create the receipt in Draft status
+    elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the Draft receipt REF12345 (index 15) to open it and trigger status transition to Ready.
+    frame = context.pages[-1]
+    # Click on the Draft receipt REF12345 to open it
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Validate' button (index 12) to transition the receipt status from Draft to Ready and verify the UI updates accordingly.
+    frame = context.pages[-1]
+    # Click 'Validate' button to transition status from Draft to Ready
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Input username 'demo' and password 'demo123' in the login fields and click Sign In button to log in again.
+    frame = context.pages[-1]
+    # Input username 'demo' in the username field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('demo')
+
+
+    frame = context.pages[-1]
+    # Input password 'demo123' in the password field
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('demo123')
+
+
+    frame = context.pages[-1]
+    # Click Sign In button to log in
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the 'Receipt' tab (index 3) to navigate to the receipt list and open the Draft receipt REF12345 to continue status transition testing.
+    frame = context.pages[-1]
+    # Click on the 'Receipt' tab to view receipt list
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'NEW' button (index 11) to create a new Draft receipt for testing status transitions.
+    frame = context.pages[-1]
+    # Click the 'NEW' button to create a new Draft receipt
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Input Reference No 'REF67890', Supplier 'Supplier B', select Product 'Copper Wire', input Qty Expected '5', select To Location 'Main Warehouse', then click 'Create Draft' button.
+    frame = context.pages[-1]
+    # Input Reference No for the new receipt
+    elem = frame.locator('xpath=html/body/div/main/div/form/div/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('REF67890')
+
+
+    frame = context.pages[-1]
+    # Input Supplier name for the new receipt
+    elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Supplier B')
+
+
+    frame = context.pages[-1]
+    # Input Qty Expected as 5
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('5')
+
+
+    frame = context.pages[-1]
+    # Click 'Create Draft' button to create the receipt in Draft status
+    elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the Draft receipt REF67890 (index 15) to open it and trigger status transition to Ready.
+    frame = context.pages[-1]
+    # Click on the Draft receipt REF67890 to open it
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click the 'Validate' button (index 12) to transition the receipt status from Draft to Ready and verify the UI updates accordingly.
+    frame = context.pages[-1]
+    # Click 'Validate' button to transition status from Draft to Ready
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div[2]/div[3]/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Receipt Status Transition Successful').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The receipt document status did not transition correctly from Draft to Ready and then Done with corresponding validations as per the test plan.")
+    await waits.settle(page)
+# --- end TC012 ---
+
+
+# --- TC013 e1fec43a32864167 ---
+@case('TC013', 'Create Delivery Document and Handle Insufficient Stock', start='/dashboard', signed_in=True)
+async def tc013(context, page):
+    """Verify delivery document creation with product lines and system blocks status advance when free-to-use stock is insufficient with Waiting state triggered."""
+    # -> Navigate to delivery creation page by clicking Delivery link
+    frame = context.pages[-1]
+    # Click Delivery link to navigate to delivery creation page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a[2]').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click NEW button to start creating a new delivery document
+    frame = context.pages[-1]
+    # Click NEW button to create new delivery document
+    elem = frame.locator('xpath=html/body/div/main/div/div/div/div[2]/div/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Add product line with quantity exceeding free-to-use stock
+    frame = context.pages[-1]
+    # Input Reference No for delivery document
+    elem = frame.locator('xpath=html/body/div/main/div/form/div/div/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('DEL-TEST-001')
+
+
+    frame = context.pages[-1]
+    # Input Customer name
+    elem = frame.locator('xpath=html/body/div/main/div/form/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('Test Customer')
+
+
+    frame = context.pages[-1]
+    # Select product from dropdown
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div/select').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Input Qty Expected exceeding free-to-use stock
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[2]/input').nth(0)
+    await waits.before_action(page, elem); await elem.fill('1000')
+
+
+    frame = context.pages[-1]
+    # Select From Location for product line
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[4]/select').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Select a From Location for the product line and save the delivery document as Draft
+    frame = context.pages[-1]
+    # Select From Location option for product line
+    elem = frame.locator('xpath=html/body/div/main/div/form/div[3]/div/div[4]/select').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Click Create Draft button to save delivery document as Draft
+    elem = frame.locator('xpath=html/body/div/main/div/form/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Delivery Completed Successfully').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test failed: Delivery document creation with product lines exceeding free-to-use stock did not advance status past Waiting. Warning about insufficient stock should be shown and status should remain Waiting.")
+    await waits.settle(page)
+# --- end TC013 ---
+
+
+# --- TC014 f988f7a2e3cc13be ---
+@case('TC014', 'Update Stock Quantities on Receipt and Delivery Completion', start='/dashboard', signed_in=True)
+async def tc014(context, page):
+    """Verify stock on-hand and free-to-use quantities update correctly when receipt or delivery documents reach Done status."""
+    # -> Click on '4 to receive' button to view receipt documents to complete one to Done status.
+    frame = context.pages[-1]
+    # Click '4 to receive' button to view receipt documents
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[2]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the first receipt document WH/IN/0001 to open and complete it to Done status.
+    frame = context.pages[-1]
+    # Click on receipt document WH/IN/0001 to open it
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Stock quantities updated successfully').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Stock on-hand and free-to-use quantities did not update correctly when receipt or delivery documents reached Done status as per the test plan.")
+    await waits.settle(page)
+# --- end TC014 ---
+
+
+# --- TC015 39bcfacdf2f8eb40 ---
+@case('TC015', 'Move History Automatically Generated and Color-Coded', start='/dashboard', signed_in=True)
+async def tc015(context, page):
+    """Verify that move history entries are automatically generated upon document completion and color-coded properly by inbound/outbound movement types."""
+    # -> Click on 'Receipt' link to view receipt documents and complete one to Done
+    frame = context.pages[-1]
+    # Click on Receipt link to view receipt documents
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the first receipt document (index 15) to open and complete it
+    frame = context.pages[-1]
+    # Click on first receipt document WH/IN/0001 to open it
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div[2]/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Move History Entry Verified').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: Move history entries were not automatically generated or color-coded properly upon document completion as per the test plan.")
+    await waits.settle(page)
+# --- end TC015 ---
+
+
+# --- TC016 2e13518262aff494 ---
+@case('TC016', 'Search and Filter Functionality on Listings', start='/dashboard', signed_in=True)
+async def tc016(context, page):
+    """Test search and filter features on products, warehouses, locations, receipts, and deliveries lists work accurately and responsively."""
+    # -> Click on 'Products' link to navigate to the Products list view.
+    frame = context.pages[-1]
+    # Click on 'Products' link to open Products list view
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Scroll down or explore the page to find any hidden or off-screen search or filter input fields for the Products list.
+    await page.mouse.wheel(0, 150)
+
+
+    # -> Click on 'Warehouse' link to navigate to the Warehouse list view and check for search and filter features there.
+    frame = context.pages[-1]
+    # Click on 'Warehouse' link to open Warehouse list view
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=No matching entries found for your search criteria').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test plan execution failed: The search and filter features on products, warehouses, locations, receipts, and deliveries lists did not update the list live to show only matching entries with no errors.")
+    await waits.settle(page)
+# --- end TC016 ---
+
+
+# --- TC017 723c11cce62930a9 ---
+@case('TC017', 'Print Document Available Only for Done Status', start='/dashboard', signed_in=True)
+async def tc017(context, page):
+    """Verify print button is enabled only for documents in Done status and the printout matches specifications for a clean layout."""
+    # -> Navigate to the 'Operations' section and then to 'Receipt' to find documents in Draft or Ready status.
+    frame = context.pages[-1]
+    # Click on Operations menu to expand options
+    elem = frame.locator('xpath=html/body/div/div/nav/div[2]/button').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    frame = context.pages[-1]
+    # Click on Receipt submenu to view documents
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Try to find and click the correct 'Receipt' link or submenu under 'Operations' or report website issue if not found.
+    await page.mouse.wheel(0, 200)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Print button enabled for Done status document')).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The print button should only be enabled for documents in Done status and the printout must match specifications for a clean layout. This assertion fails immediately to indicate the test plan execution failure.")
+    await waits.settle(page)
+# --- end TC017 ---
+
+
+# --- TC018 7d13e6484d51e061 ---
+@case('TC018', 'API Error Handling and User Feedback', start='/dashboard', signed_in=True)
+async def tc018(context, page):
+    """Confirm that API failures return appropriate error codes and messages and the UI displays user-friendly error notifications."""
+    # -> Simulate an API failure and trigger an API request via UI to check error handling.
+    frame = context.pages[-1]
+    # Click Products menu to navigate to Products page for API failure test
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Simulate an API failure scenario (e.g., server down or validation error) for the Products API.
+    frame = context.pages[-1]
+    # Click on Steel Rod product row to open edit or details for triggering API request
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=API request succeeded').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test failed: API failure did not return appropriate error codes and messages, or UI did not display user-friendly error notifications as expected.")
+    await waits.settle(page)
+# --- end TC018 ---
+
+
+# --- TC019 cd2749f66a5679f2 ---
+@case('TC019', 'Form Input Validation Using Zod Schemas', start='/dashboard', signed_in=True)
+async def tc019(context, page):
+    """Verify that all form inputs validate according to Zod schemas before submission, enforcing correct data types and required fields."""
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=Sign in to your account').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Manual Login').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=OTP Login').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Invalid credentials.').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Username').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Password').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Sign In').first).to_be_visible(timeout=30000)
+    await waits.settle(page)
+# --- end TC019 ---
+
+
+# --- TC020 966bffbc7f43e7af ---
+@case('TC020', 'Navigation and Routing Verify End-to-End Flow', start='/dashboard', signed_in=True)
+async def tc020(context, page):
+    """Ensure navbar, sidebar, and page routes open correct pages and detail views with no dead ends or broken UI components."""
+    # -> Navigate to the Products page using the sidebar link and verify the page loads correctly.
+    frame = context.pages[-1]
+    # Click Products link in sidebar to navigate to Products page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate to the Warehouses page under Settings and verify the page loads correctly.
+    frame = context.pages[-1]
+    # Click Warehouse link under Settings in sidebar to navigate to Warehouses page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate to the Locations page under Settings and verify the page loads correctly.
+    frame = context.pages[-1]
+    # Click Locations link under Settings in sidebar to navigate to Locations page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[5]/div/a[2]').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate to the Documents page and verify the page loads correctly.
+    frame = context.pages[-1]
+    # Click Move History link in sidebar to navigate to Documents page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[4]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Test detail and edit views from the Products listing by clicking on a product link to verify correct page loads without errors.
+    frame = context.pages[-1]
+    # Click Products link in sidebar to navigate to Products page
+    elem = frame.locator('xpath=html/body/div/div/nav/div[3]/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Click on the first product (Steel Rod) in the Products listing to open its detail or edit view and verify the page loads correctly without errors.
+    frame = context.pages[-1]
+    # Click on Steel Rod product row to open detail or edit view
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/table/tbody/tr').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # -> Navigate to the Dashboard page using the sidebar link to verify navigation back to main page works correctly.
+    frame = context.pages[-1]
+    # Click Dashboard link in sidebar to navigate back to Dashboard page
+    elem = frame.locator('xpath=html/body/div/div/nav/div/a').nth(0)
+    await waits.before_action(page, elem); await elem.click(timeout=5000)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=StockMaster').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Dashboard').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Operations').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Receipt').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Delivery').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Adjustment').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Products').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Move History').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Settings').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Warehouse').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Locations').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=4 to receive').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=1 Late').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=6 operations').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=4 to Deliver').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=1 Late').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=2 waiting').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=6 operations').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Late:').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=schedule date < today\'s date').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Operations:').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=schedule date > today\'s date').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Waiting:').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Waiting for the stocks').first).to_be_visible(timeout=30000)
+    await waits.settle(page)
+# --- end TC020 ---
+
+
+# --- TC021 c9509bbb83a737fe ---
+@case('TC021', 'Signup and Password Recovery Flow', start='/')
+async def tc021(context, page):
+    """Verify user registration and password recovery pages function end to end, including validations and success confirmations."""
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=User registration completed successfully!').first).to_be_visible(timeout=30000)
+    except AssertionError:
+        raise AssertionError("Test case failed: User registration and password recovery flow did not complete successfully as per the test plan.")
+    await waits.settle(page)
+# --- end TC021 ---
+
+
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES.keys())
+def test_plan(case, context, page, run):
+    run(case.steps(context, page))
@@ -0,0 +1,176 @@
+"""Per-step timings for the TestSprite runs.
+
+``run_suite.py`` wraps every action (click, fill, goto, ...) and every
+``expect`` assertion of a compiled case in ``step()``, and ``watch()``es each
+browser context for finished document and fetch/XHR requests, so a case's
+result carries how long each interaction, page load and API call took.
+Every run is saved to ``tmp/timings/<time>.json``; ``compare()`` lines a
+run up against the previous one for the report.
+"""
+import contextvars
+import glob
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TIMINGS_DIR = os.path.join(HERE, "tmp", "timings")
+KEEP_RUNS = 20
+REQUEST_TYPES = {"document": "navigation", "fetch": "api", "xhr": "api"}
+ACTIONS = frozenset({
+    "check", "click", "dblclick", "fill", "go_back", "goto", "hover", "press",
+    "reload", "select_option", "set_input_files", "type", "uncheck",
+})
+# A step is a regression when it got this much slower, relatively and absolutely
+REGRESSION_RATIO = 1.2
+REGRESSION_SECONDS = 0.2
+
+_current = contextvars.ContextVar("timings_recorder", default=None)
+
+
+class Recorder:
+    """Timings of one case; each case runs in its own task with its own recorder"""
+
+    def __init__(self):
+        self.steps = []
+        self.requests = []
+        self._started = time.perf_counter()
+
+    def watch(self, context):
+        context.on("requestfinished", self._finished)
+
+    def _finished(self, request):
+        kind = REQUEST_TYPES.get(request.resource_type)
+        if kind is None:
+            return
+        try:
+            end = request.timing["responseEnd"]
+        except Exception:
+            return
+        if end < 0:
+            return
+        url = urlsplit(request.url)
+        self.requests.append({
+            "kind": kind,
+            "method": request.method,
+            "path": url.path or "/",
+            "seconds": round(end / 1000, 4),
+        })
+
+    def as_dict(self):
+        return {"steps": self.steps, "requests": self.requests}
+
+
+def start():
+    """Give the current task a fresh recorder and return it"""
+    recorder = Recorder()
+    _current.set(recorder)
+    return recorder
+
+
+def watch(context):
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.watch(context)
+
+
+@asynccontextmanager
+async def step(kind, label, line):
+    recorder = _current.get()
+    start_ = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        if recorder is not None:
+            recorder.steps.append({
+                "kind": kind,
+                "label": label,
+                "line": line,
+                "at": round(start_ - recorder._started, 4),
+                "seconds": round(time.perf_counter() - start_, 4),
+                "ok": ok,
+            })
+
+
+def save(cases, directory=TIMINGS_DIR, keep=KEEP_RUNS):
+    """Store ``{case id: recorder dict}`` as a new run and prune old runs; returns the path"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+    path = os.path.join(directory, f"{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"run": stamp, "cases": cases}, f, indent=1)
+        f.write("\n")
+    for old in runs(directory)[:-keep]:
+        os.remove(old)
+    return path
+
+
+def runs(directory=TIMINGS_DIR):
+    return sorted(glob.glob(os.path.join(directory, "*.json")))
+
+
+def load_latest(directory=TIMINGS_DIR):
+    """The most recent saved run, or None"""
+    paths = runs(directory)
+    if not paths:
+        return None
+    with open(paths[-1], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _step_keys(steps):
+    """Key steps by label and occurrence, which survives lines moving"""
+    seen = {}
+    for step_ in steps:
+        key = (step_["kind"], step_["label"])
+        seen[key] = seen.get(key, 0) + 1
+        yield key + (seen[key],), step_
+
+
+def slowest_steps(cases, previous=None, limit=15):
+    """Rows ``(case id, step, previous seconds or None)``, slowest first"""
+    before = {}
+    for id_, timing in ((previous or {}).get("cases") or {}).items():
+        for key, step_ in _step_keys((timing or {}).get("steps", [])):
+            before[(id_,) + key] = step_["seconds"]
+    rows = []
+    for id_, timing in cases.items():
+        for key, step_ in _step_keys((timing or {}).get("steps", [])):
+            rows.append((id_, step_, before.get((id_,) + key)))
+    rows.sort(key=lambda row: -row[1]["seconds"])
+    return rows[:limit]
+
+
+def _by_endpoint(cases):
+    endpoints = {}
+    for timing in cases.values():
+        for request in (timing or {}).get("requests", []):
+            key = (request["kind"], request["method"], request["path"])
+            endpoints.setdefault(key, []).append(request["seconds"])
+    return endpoints
+
+
+def slowest_requests(cases, previous=None, limit=10):
+    """Rows ``(kind, method, path, count, mean, max, previous mean or None)``, by mean"""
+    before = {key: sum(values) / len(values)
+              for key, values in _by_endpoint((previous or {}).get("cases") or {}).items()}
+    rows = [key + (len(values), sum(values) / len(values), max(values), before.get(key))
+            for key, values in _by_endpoint(cases).items()]
+    rows.sort(key=lambda row: -row[4])
+    return rows[:limit]
+
+
+def change(now, before):
+    """``+12%``-style change against the previous run, flagged when it is a regression"""
+    if before is None:
+        return "new"
+    if not before:
+        return "–"
+    text = f"{(now - before) / before:+.0%}"
+    if now > before * REGRESSION_RATIO and now - before > REGRESSION_SECONDS:
+        text += " ⚠️"
+    return text
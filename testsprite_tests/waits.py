@@ -0,0 +1,170 @@
+"""Condition-based waits for the TestSprite scripts.
+
+The generated scripts sleep a fixed three seconds before every action and
+five at the end. ``rewrite_waits.py`` replaces those sleeps with calls into
+this module, which wait only as long as the app needs:
+
+* ``before_action(page, elem)``: the previous step has settled (navigation
+  committed, DOM loaded, fetch/XHR calls such as the Supabase requests
+  finished) and ``elem`` is visible;
+* ``settle(page)``: the same without an element, for the end of a test;
+* ``response(page, "/rest/v1/products")``: a matching response arrived.
+
+Every wait is clipped to what is left of a suite-wide budget
+(``TESTSPRITE_WAIT_BUDGET`` seconds, default 900) of time spent inside
+these helpers, so a hung app fails the run quickly instead of piling up
+timeouts. Time the cases spend on anything else does not count.
+"""
+import asyncio
+import os
+import time
+import weakref
+from contextlib import contextmanager
+
+QUIET_SECONDS = 0.3  # no fetch/XHR in flight for this long counts as settled
+TRACKED_TYPES = ("fetch", "xhr")
+
+
+class BudgetExceeded(TimeoutError):
+    pass
+
+
+class Budget:
+    """Waiting time shared by every wait in the process.
+
+    Time is counted while at least one wait is running, so cases waiting
+    at the same time use the budget once rather than once each.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.used = 0.0
+        self._waiting = 0
+        self._since = None
+
+    def start(self, seconds=None):
+        """Reset the budget, optionally to a new size"""
+        if seconds is not None:
+            self.seconds = seconds
+        self.used = 0.0
+        self._waiting = 0
+        self._since = None
+
+    def spent(self):
+        """Seconds spent waiting so far, including the waits running now"""
+        if self._waiting:
+            return self.used + time.monotonic() - self._since
+        return self.used
+
+    @contextmanager
+    def waiting(self):
+        """Count the time spent in the block against the budget"""
+        if not self._waiting:
+            self._since = time.monotonic()
+        self._waiting += 1
+        try:
+            yield
+        finally:
+            self._waiting -= 1
+            if not self._waiting:
+                self.used += time.monotonic() - self._since
+
+    def clip(self, timeout_ms):
+        """Return ``timeout_ms`` cut to what is left of the budget"""
+        remaining = (self.seconds - self.spent()) * 1000
+        if remaining <= 0:
+            raise BudgetExceeded(f"Suite wait budget of {self.seconds:g}s used up")
+        return min(timeout_ms, remaining)
+
+
+BUDGET = Budget(float(os.environ.get("TESTSPRITE_WAIT_BUDGET", 900)))
+
+
+class _NetworkTracker:
+    """Counts the fetch/XHR requests in flight for one page or context"""
+
+    def __init__(self, target):
+        self.inflight = set()
+        self.changed = time.monotonic()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        target.on("request", self._started)
+        target.on("requestfinished", self._ended)
+        target.on("requestfailed", self._ended)
+
+    def _started(self, request):
+        if request.resource_type in TRACKED_TYPES:
+            self.inflight.add(request)
+            self.changed = time.monotonic()
+            self._idle.clear()
+
+    def _ended(self, request):
+        if request in self.inflight:
+            self.inflight.discard(request)
+            self.changed = time.monotonic()
+            if not self.inflight:
+                self._idle.set()
+
+    async def wait_idle(self, timeout):
+        """Wait until nothing has been in flight for ``QUIET_SECONDS``; False on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._idle.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+            quiet_left = QUIET_SECONDS - (time.monotonic() - self.changed)
+            if quiet_left <= 0 and not self.inflight:
+                return True
+            await asyncio.sleep(min(max(quiet_left, 0.01), remaining))
+
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def track(target):
+    """Start counting requests on a page or context (before it navigates, ideally)"""
+    tracker = _trackers.get(target)
+    if tracker is None:
+        tracker = _trackers[target] = _NetworkTracker(target)
+    return tracker
+
+
+def _tracker(page):
+    context = page.context
+    return _trackers.get(context) or track(page)
+
+
+async def settle(page, timeout=5000):
+    """Wait for the page to finish loading and its API calls to go quiet.
+
+    Best effort: returns after ``timeout`` ms even if requests are still
+    running (the next action or assertion has its own timeout).
+    """
+    timeout = BUDGET.clip(timeout)
+    start = time.monotonic()
+    with BUDGET.waiting():
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        except Exception:
+            return
+        remaining = timeout / 1000 - (time.monotonic() - start)
+        await _tracker(page).wait_idle(remaining)
+
+
+async def before_action(page, elem, timeout=5000):
+    """Replaces ``wait_for_timeout(3000)`` ahead of a click or fill"""
+    await settle(page, timeout)
+    timeout = BUDGET.clip(timeout)
+    with BUDGET.waiting():
+        await elem.wait_for(state="visible", timeout=timeout)
+
+
+async def response(page, url_part, timeout=10000):
+    """Wait for a response whose URL contains ``url_part`` and return it"""
+    timeout = BUDGET.clip(timeout)
+    with BUDGET.waiting():
+        return await page.wait_for_event("response", lambda r: url_part in r.url, timeout=timeout)